@@ -2,7 +2,9 @@ from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import InMemorySaver
 from langchain_groq import ChatGroq
+from langchain_core.tools import StructuredTool
 import json
+import os
 
 ## Reducers
 from typing import Annotated, List, Dict, Any, Literal, Optional
@@ -10,8 +12,19 @@ from langgraph.graph.message import add_messages
 
 from langgraph.prebuilt import ToolNode
 from langgraph.prebuilt import tools_condition
-from Tools import get_doctor_schedule,find_available_doctors
-from Tools import get_current_date,get_patient_details,get_symptom_details,book_appointment,order_medicine
+from Tools import get_doctor_schedule,find_available_doctors,find_doctors_available_at,find_next_available_slots
+from Tools import get_current_date
+from AsyncTools import afind_available_doctors,afind_doctors_available_at,afind_next_available_slots,aget_doctor_schedule
+from AsyncTools import aget_patient_details,aget_relevant_history,abook_appointment,aorder_medicine
+from AsyncTools import afind_doctor_candidates
+from ResponseCache import CachedChatModel, SemanticIndex, make_backend
+from FastPathRouter import fast_path
+from Checkpointer import SQLiteCheckpointer
+from PromptBudget import fit_prompt
+from Notifications import get_dispatcher
+from LLMGateway import GatewayChatModel, get_gateway
+from StructuredOutput import StructuredOutputError, ainvoke_structured, parse_structured
+from Tracing import traced_node, traced_tool
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -39,6 +52,9 @@ class ClinicalWorkflowState(TypedDict):
     # Context Retrieval output
     context: Dict[str, Any]
 
+    # Doctor candidates output (runs in parallel with context retrieval)
+    doctor_candidates: List[Dict[str, Any]]
+
     # Triage output
     triage_confirmed: bool
     triage: Dict[str, Any]
@@ -60,24 +76,93 @@ class ClinicalWorkflowState(TypedDict):
 llm_conversation=ChatGroq(
     # model="llama-3.3-70b-versatile",
     model="openai/gpt-oss-120b",
-    timeout=60
+    timeout=60,
+    max_retries=0
 )
 
 llm_reason=ChatGroq(
     model="openai/gpt-oss-120b",
-    timeout=60
+    timeout=60,
+    max_retries=0
 )
 
 llm_validation=ChatGroq(
     # model="openai/gpt-oss-safeguard-20b",
     model="openai/gpt-oss-120b",
-    timeout=60
+    timeout=60,
+    max_retries=0
 )
 
-tools=[get_doctor_schedule,find_available_doctors]
+# Each tool carries a sync and an async implementation; the graph runs via ainvoke/astream
+tools=[
+    StructuredTool.from_function(
+        func=get_doctor_schedule, coroutine=traced_tool("get_doctor_schedule", aget_doctor_schedule)
+    ),
+    StructuredTool.from_function(
+        func=find_available_doctors, coroutine=traced_tool("find_available_doctors", afind_available_doctors)
+    ),
+    StructuredTool.from_function(
+        func=find_doctors_available_at, coroutine=traced_tool("find_doctors_available_at", afind_doctors_available_at)
+    ),
+    StructuredTool.from_function(
+        func=find_next_available_slots, coroutine=traced_tool("find_next_available_slots", afind_next_available_slots)
+    )
+]
 llm_tools = llm_reason.bind_tools(tools)
 
-def conversation_ai_agent(state:ClinicalWorkflowState):
+# Triage from prefetched candidates - one call, no tool round trip
+llm_triage = llm_reason
+TRIAGE_PREFETCH = os.getenv("TRIAGE_PREFETCH", "1") == "1"
+
+# All agents share one gateway per model: concurrency and rate limits, retries, hedging
+if os.getenv("LLM_GATEWAY", "1") == "1":
+    llm_conversation = GatewayChatModel(llm_conversation, "conversation", get_gateway(llm_conversation.model_name))
+    llm_tools = GatewayChatModel(llm_tools, "triage", get_gateway(llm_reason.model_name))
+    llm_triage = GatewayChatModel(llm_triage, "triage-prefetched", get_gateway(llm_reason.model_name))
+    llm_validation = GatewayChatModel(llm_validation, "validation", get_gateway(llm_validation.model_name))
+
+# Response cache - conversation and triage only. Validation is never cached,
+# and a turn that routes to booking/ordering is never stored
+def _conversation_json(response):
+    return parse_structured("conversation", response.content)[0]
+
+def _conversation_cacheable(messages, response):
+    parsed = _conversation_json(response)
+    return parsed is not None and not parsed.get("ready_for_routing")
+
+def _conversation_shareable(messages, response):
+    # Near-duplicate reuse only for generic advice without personal details
+    parsed = _conversation_json(response)
+    return parsed is not None and parsed.get("intent") == "general_advise" and not parsed.get("entities")
+
+_response_backend = make_backend()
+if _response_backend is not None:
+    llm_conversation = CachedChatModel(
+        llm_conversation, "conversation", _response_backend,
+        semantic=SemanticIndex() if os.getenv("RESPONSE_CACHE_SEMANTIC", "1") == "1" else None,
+        cacheable=_conversation_cacheable,
+        shareable=_conversation_shareable
+    )
+    llm_tools = CachedChatModel(llm_tools, "triage", _response_backend)
+    llm_triage = CachedChatModel(llm_triage, "triage-prefetched", _response_backend)
+
+# Local intent/slot classifier for confirmations and date/time replies
+FAST_PATH_ENABLED = os.getenv("FAST_PATH", "1") == "1"
+
+async def conversation_ai_agent(state:ClinicalWorkflowState):
+
+    # Trivially structured turn for an intent in progress - skip the LLM
+    fast_response = fast_path(state) if FAST_PATH_ENABLED else None
+    if fast_response is not None:
+        return {
+            "workflow_status": state.get("workflow_status", "WIP"),
+            "messages": [{"role": "assistant", "content": fast_response["reply"]}],
+            "intent": fast_response["intent"],
+            "extracted_entities": fast_response["entities"],
+            "ready_for_routing": fast_response["ready_for_routing"],
+            "triage_confirmed": False,
+            "appointment_confirmed": False
+        }
 
     system_prompt = f"""
     You are a clinical conversational AI assistant.
@@ -119,10 +204,17 @@ def conversation_ai_agent(state:ClinicalWorkflowState):
         "ready_for_routing": true/false
     """
 
-    llm_response = llm_conversation.invoke(
-        [{"role": "system", "content": system_prompt}] + state["messages"]
-    )
-    json_response = json.loads(llm_response.content)
+    try:
+        json_response = await ainvoke_structured("conversation", llm_conversation,
+                                                 fit_prompt("conversation", system_prompt, state))
+    except StructuredOutputError:
+        # Keep the turn alive - stay on the current intent and ask again
+        json_response = {
+            "reply": "Sorry, I could not process that. Could you please rephrase?",
+            "intent": state.get("intent") or "general_advise",
+            "entities": state.get("extracted_entities") or {},
+            "ready_for_routing": False
+        }
 
     return {
         "workflow_status": state.get("workflow_status", "WIP"),
@@ -147,7 +239,7 @@ def router_agent(state: ClinicalWorkflowState):
 
     return {"route": route}
 
-def intake_agent(state: ClinicalWorkflowState):
+async def intake_agent(state: ClinicalWorkflowState):
 
     from datetime import datetime
 
@@ -161,7 +253,7 @@ def intake_agent(state: ClinicalWorkflowState):
 
     # Get Patient ID from Patient Table
     patient_name = entities.get("patient_name")
-    patient_id = get_patient_details(patient_name)
+    patient_id = await aget_patient_details(patient_name)
 
     structured_data = {
         "patient_id": patient_id,
@@ -174,19 +266,23 @@ def intake_agent(state: ClinicalWorkflowState):
         "preferred_day": day
     }
 
-    reply_message = f"We are checking for doctor's availbility on {day}, {date} around {entities.get("preferred_time")}."
+    reply_message = f"We are checking for doctor's availbility on {day}, {date} around {entities.get('preferred_time')}."
     
     return {
             "messages": [{"role": "assistant", "content": reply_message}],
             "structured_data": structured_data
             }
 
-def context_retrieval_agent(state: ClinicalWorkflowState):
+async def context_retrieval_agent(state: ClinicalWorkflowState):
 
-    # Retrieve past medical history from DB
+    # Retrieve past medical history from DB - relevant to the current complaint and recent, bounded
     patient_id = state["structured_data"].get("patient_id")
     if not patient_id == 0:
-        symptom_details = get_symptom_details(patient_id)
+        complaint = state["structured_data"].get("symptoms") or ""
+        if isinstance(complaint, list):
+            complaint = " ".join(complaint)
+
+        symptom_details = await aget_relevant_history(patient_id, complaint)
 
         if len(symptom_details) > 0:
 
@@ -208,7 +304,48 @@ def context_retrieval_agent(state: ClinicalWorkflowState):
 
     return None
 
-def triage_reasoning_agent(state: ClinicalWorkflowState):
+async def doctor_candidates_agent(state: ClinicalWorkflowState):
+
+    # Look up doctors for the preferred doctor/speciality, date and time ahead of triage
+    structured_data = state["structured_data"]
+
+    candidates = await afind_doctor_candidates(
+        structured_data.get("preferred_doctor_name"),
+        structured_data.get("preferred_speciality"),
+        structured_data.get("preferred_date"),
+        structured_data.get("preferred_time"),
+        structured_data.get("symptoms")
+    )
+
+    return {"doctor_candidates": candidates}
+
+async def triage_reasoning_agent(state: ClinicalWorkflowState):
+
+    # First pass after intake with ranked candidates - answer without tools.
+    # Follow-up user replies (e.g. a different time) still use the tool loop
+    candidates = state.get("doctor_candidates")
+    if TRIAGE_PREFETCH and candidates and state["messages"][-1].type == "ai":
+
+        system_prompt = f"""
+        You are a triage reasoning agent. Consider today's date as {get_current_date()}.
+
+        The doctors below were already looked up for the patient's request and ranked by how
+        well their schedule fits the preferred date and time. "match" tells how well each fits;
+        "suggested_day" / "suggested_time" is the nearest alternative for that doctor.
+
+        Your tasks:
+        - Recommend the best matching doctor. If the user named a doctor who is listed, prefer that doctor.
+        - If nobody is available at the preferred time, offer the closest suggested alternative.
+        - Mention the doctor's name, speciality, date/day and time.
+        - Do not confirm the appointment immediately. Instead request user to confirm.
+
+        Candidates:
+        {json.dumps(candidates, default=str)}
+        """
+
+        llm_response = await llm_triage.ainvoke(fit_prompt("triage", system_prompt, state))
+
+        return {"messages": llm_response}
 
     # Infer speciality from symptom and the find doctor based on the derieved speciality
     system_prompt = f"""
@@ -219,7 +356,8 @@ def triage_reasoning_agent(state: ClinicalWorkflowState):
     - If schedule does NOT match, identify the doctor's specility and then find another doctor with the same specility matches best with preferred date and time.
     - If doctor name is NOT provided, but specility is provided in user message, then find a doctor based on the specility who matches best with preferred date and time.
     - If doctor name or specility is NOT provided in user message, Infer speciality based on the symptom. Then find a doctor based on the specility who matches best with preferred date and time.
-    - If NO match, suggest the doctor of the same specility based on earliest availble date and time.
+    - If NO match, suggest the doctor of the same specility based on earliest availble date and time. Use find_next_available_slots for the earliest free slots.
+    - When the specility and preferred date and time are known, use find_doctors_available_at to get doctors whose schedule already matches.
     - DO NOT call the same tool repeatedly. Call the tool ONLY ONCE.
     - After showing the result, do not confirm the appointment immediately. Instead request user to confirm.
 
@@ -240,13 +378,18 @@ def triage_reasoning_agent(state: ClinicalWorkflowState):
         - Nephrology
     """
 
-    llm_response = llm_tools.invoke(
-        [{"role": "system", "content": system_prompt}] + state["messages"]  
-    )
+    if state.get("doctor_candidates"):
+        system_prompt += f"""
+    Doctors already looked up for the preferred doctor/speciality, date and time
+    (use them instead of calling a tool when they fit):
+    {json.dumps(state["doctor_candidates"], default=str)}
+    """
+
+    llm_response = await llm_tools.ainvoke(fit_prompt("triage", system_prompt, state))
 
     return {"messages": llm_response}
 
-def appointment_validation_agent(state: ClinicalWorkflowState):
+async def appointment_validation_agent(state: ClinicalWorkflowState):
 
     structured_data = state["structured_data"]
 
@@ -269,9 +412,12 @@ def appointment_validation_agent(state: ClinicalWorkflowState):
         "confirmed_by_user": true/false,
         """
 
-    llm_response = llm_validation.invoke([{"role": "system", "content": system_prompt}] + state["messages"])
-
-    json_response = json.loads(llm_response.content)
+    try:
+        json_response = await ainvoke_structured("validation", llm_validation,
+                                                 fit_prompt("validation", system_prompt, state))
+    except StructuredOutputError:
+        # Unconfirmed - reported as missing fields below
+        json_response = {"confirmed_by_user": False}
 
     if json_response.get("confirmed_by_user"):
             state["appointment_details"] = {
@@ -305,12 +451,16 @@ def appointment_validation_agent(state: ClinicalWorkflowState):
             "appointment_details": state.get("appointment_details", {})
             }
 
-def scheduling_agent(state: ClinicalWorkflowState):
+async def scheduling_agent(state: ClinicalWorkflowState):
 
     if state.get("is_valid", True):
 
         # Update DB with appointment details
-        appointment = book_appointment(state)
+        appointment = await abook_appointment(state)
+    else:
+        appointment = {"status": "failed"}
+
+    if appointment["status"] == "confirmed":
         appointment_id = appointment["appointment_id"]
 
         reply = f"The appointment is booked. Appointment ID APT-00{appointment_id}"
@@ -319,6 +469,15 @@ def scheduling_agent(state: ClinicalWorkflowState):
         appointment_confirmed = True
 
     else:
+        # Not booked - go back to triage with the reason
+        if appointment["status"] == "conflict":
+            # Taken by a concurrent booking
+            reply = "Sorry, this slot is no longer available. Please choose another time."
+        elif appointment["status"] == "unavailable":
+            reply = f"Sorry, that time cannot be booked: {appointment['reason']}. Please choose another slot."
+        else:
+            reply = "Sorry, the appointment could not be booked because of a system error. Please try again shortly."
+
         workflow_status = "WIP"
         appointment_confirmed = False
 
@@ -360,13 +519,13 @@ def medicine_order_validation_agent(state: ClinicalWorkflowState):
 
     return {"is_valid": True, "validation_errors": None}
 
-def pharmacy_agent(state: ClinicalWorkflowState):
+async def pharmacy_agent(state: ClinicalWorkflowState):
     """
     Takes medicine Order and Store in Medicine Order Table.
     """
 
     # Update DB with medicine order details
-    order = order_medicine(state)
+    order = await aorder_medicine(state)
     order_id = order["order_id"]
 
     entities = state["extracted_entities"]
@@ -403,7 +562,7 @@ def reminder_validation_agent(state: ClinicalWorkflowState):
 
     return {"is_valid": True, "validation_errors": None}
 
-def reminder_agent(state: ClinicalWorkflowState):
+async def reminder_agent(state: ClinicalWorkflowState):
 
     entities = state["extracted_entities"]
     reminders = {
@@ -437,167 +596,189 @@ def reminder_agent(state: ClinicalWorkflowState):
 
         reminders["reminder_text"] = reminder_text
 
-    from twilio.rest import Client
-
-    TWILIO_SID = os.getenv("TWILIO_SID")
-    TWILIO_TOKEN = os.getenv("TWILIO_TOKEN")
-    client = Client(TWILIO_SID, TWILIO_TOKEN)
-
-    message = client.messages.create(
-                    from_='whatsapp:+14155238886',
-                    body=reminders["reminder_text"],
-                    to='whatsapp:+919163040468'
-                )
-    
-    print(message.sid)
+    # Delivered by the notification workers - the graph does not wait on Twilio
+    notification = get_dispatcher().dispatch(reminders["reminder_text"])
+    reminders["notification_id"] = notification["notification_id"]
 
     return {"reminders": reminders}
 
-# Checkpointer
-checkpointer = InMemorySaver()
-
-graph = StateGraph(ClinicalWorkflowState)
+# Checkpointer - durable and bounded; PATIENT_CARE_CHECKPOINTER=memory keeps state in process
+if os.getenv("PATIENT_CARE_CHECKPOINTER", "sqlite") == "memory":
+    checkpointer = InMemorySaver()
+else:
+    checkpointer = SQLiteCheckpointer()
 
-# Register agents
-graph.add_node("conversation", conversation_ai_agent)
-graph.add_node("router", router_agent)
-graph.add_node("appointment_intake", intake_agent)
-graph.add_node("context", context_retrieval_agent)
-graph.add_node("triage", triage_reasoning_agent)
-graph.add_node("appointment_validation", appointment_validation_agent)
-graph.add_node("medicine_validation", medicine_order_validation_agent)
-graph.add_node("reminder_validation", reminder_validation_agent)
-graph.add_node("scheduling", scheduling_agent)
-graph.add_node("pharmacy", pharmacy_agent)
-graph.add_node("reminder", reminder_agent)
+def build_graph(fan_out: bool = True) -> StateGraph:
+    """
+    Assemble the workflow. fan_out=False runs context retrieval and the
+    doctor candidate lookup one after the other (baseline for benchmarks).
+    """
+    graph = StateGraph(ClinicalWorkflowState)
+
+    # Register agents
+    graph.add_node("conversation", traced_node("conversation", conversation_ai_agent))
+    graph.add_node("router", traced_node("router", router_agent))
+    graph.add_node("appointment_intake", traced_node("appointment_intake", intake_agent))
+    graph.add_node("context", traced_node("context", context_retrieval_agent))
+    graph.add_node("doctor_candidates", traced_node("doctor_candidates", doctor_candidates_agent))
+    graph.add_node("triage", traced_node("triage", triage_reasoning_agent))
+    graph.add_node("appointment_validation", traced_node("appointment_validation", appointment_validation_agent))
+    graph.add_node("medicine_validation", traced_node("medicine_validation", medicine_order_validation_agent))
+    graph.add_node("reminder_validation", traced_node("reminder_validation", reminder_validation_agent))
+    graph.add_node("scheduling", traced_node("scheduling", scheduling_agent))
+    graph.add_node("pharmacy", traced_node("pharmacy", pharmacy_agent))
+    graph.add_node("reminder", traced_node("reminder", reminder_agent))
+
+    # Register Tools
+    graph.add_node("tools", traced_node("tools", ToolNode(tools).ainvoke))
+
+    # Conditional Routing Logic
+    def route_from_start(state: ClinicalWorkflowState):
+
+        workflow_status = state.get("workflow_status", "STARTED")
+
+        if state.get("ready_for_routing") and workflow_status=="WIP":
+            return "triage"
+
+        return "conversation"
+
+    graph.add_conditional_edges(
+        START,
+        route_from_start,
+        {
+            "conversation": "conversation",
+            "triage": "triage"
+        }
+    )
 
-# Register Tools
-graph.add_node("tools", ToolNode(tools))
+    # Conditional Routing Logic
+    def route_from_conversation(state: ClinicalWorkflowState):
+        if state["ready_for_routing"]:
+            return "router"
+        else:
+            return END
+
+    graph.add_conditional_edges(
+        "conversation",
+        route_from_conversation,
+        {
+            "router": "router",
+            END: END
+        }
+    )
 
-# Conditional Routing Logic
-def route_from_start(state: ClinicalWorkflowState):
+    def route_from_router(state: ClinicalWorkflowState):
+        if state["route"] == "appointment":
+            if state["triage_confirmed"]:
+                return "appointment_validation"
+            else:
+                return "appointment_intake"
+        elif state["route"] == "order_medicine":
+            return "medicine_validation"
+        elif state["route"] == "reminder":
+            return "reminder_validation"
+        return END
 
-    workflow_status = state.get("workflow_status", "STARTED")
+    graph.add_conditional_edges(
+        "router",
+        route_from_router,
+        {
+            "appointment_intake": "appointment_intake",
+            "appointment_validation": "appointment_validation",
+            "medicine_validation": "medicine_validation",
+            "reminder_validation": "reminder_validation",
+            END: END
+        }
+    )
 
-    if state.get("ready_for_routing") and workflow_status=="WIP":
-        return "triage"
+    if fan_out:
+        # Context retrieval and doctor lookup are independent - run both, join at triage
+        graph.add_edge("appointment_intake", "context")
+        graph.add_edge("appointment_intake", "doctor_candidates")
+        graph.add_edge(["context", "doctor_candidates"], "triage")
+    else:
+        # Define Sequential Dependencies
+        graph.add_edge("appointment_intake", "context")
+        graph.add_edge("context", "doctor_candidates")
+        graph.add_edge("doctor_candidates", "triage")
+
+    graph.add_conditional_edges(
+        "triage",
+        # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
+        # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to appointment_validation
+        tools_condition,
+        {
+            "tools": "tools",                      # assistant produced a tool call
+            "__end__": "appointment_validation"    # assistant produced a normal message
 
-    return "conversation"
+        }
+    )
 
-graph.add_conditional_edges(
-    START,
-    route_from_start,
-    {
-        "conversation": "conversation",
-        "triage": "triage"
-    }
-)
+    graph.add_edge("tools","triage")
 
-# Conditional Routing Logic
-def route_from_conversation(state: ClinicalWorkflowState):
-    if state["ready_for_routing"]:
-        return "router"
-    else:
+    # Validation Gate (Critical for Clinical Safety)
+    def validation_gate(state: ClinicalWorkflowState):
+        if state["triage_confirmed"] and state["is_valid"]:
+            return "scheduling"
         return END
 
-graph.add_conditional_edges(
-    "conversation",
-    route_from_conversation,
-    {
-        "router": "router",
-        END: END
-    }
-)
-
-def route_from_router(state: ClinicalWorkflowState):
-    if state["route"] == "appointment":
-        if state["triage_confirmed"]:
-            return "appointment_validation"
-        else:
-            return "appointment_intake"
-    elif state["route"] == "order_medicine":
-        return "medicine_validation"
-    elif state["route"] == "reminder":
-        return "reminder_validation"
-    return END
-
-graph.add_conditional_edges(
-    "router",
-    route_from_router,
-    {
-        "appointment_intake": "appointment_intake",
-        "appointment_validation": "appointment_validation",
-        "medicine_validation": "medicine_validation",
-        "reminder_validation": "reminder_validation",
-        END: END
-    }
-)
-
-# Define Sequential Dependencies
-graph.add_edge("appointment_intake", "context")
-graph.add_edge("context", "triage")
+    graph.add_conditional_edges(
+        "appointment_validation",
+        validation_gate,
+        {
+            "scheduling": "scheduling",
+            END: END
+        }
+    )
 
-graph.add_conditional_edges(
-    "triage",
-    # If the latest message (result) from assistant is a tool call -> tools_condition routes to tools
-    # If the latest message (result) from assistant is a not a tool call -> tools_condition routes to appointment_validation
-    tools_condition,
-    {
-        "tools": "tools",                      # assistant produced a tool call
-        "__end__": "appointment_validation"    # assistant produced a normal message
+    # Validation Gate (Critical for Clinical Safety)
+    def validation_gate(state: ClinicalWorkflowState):
+        if state["is_valid"]:
+            return "pharmacy"
+        return END
 
-    }
-)
+    graph.add_conditional_edges(
+        "medicine_validation",
+        validation_gate,
+        {
+            "pharmacy": "pharmacy",
+            END: END
+        }
+    )
 
-graph.add_edge("tools","triage")
+    # Validation Gate (Critical for Clinical Safety)
+    def validation_gate(state: ClinicalWorkflowState):
+        if state["is_valid"]:
+            return "reminder"
+        return END
 
-# Validation Gate (Critical for Clinical Safety)
-def validation_gate(state: ClinicalWorkflowState):
-    if state["triage_confirmed"] and state["is_valid"]:
-        return "scheduling"
-    return END
+    graph.add_conditional_edges(
+        "reminder_validation",
+        validation_gate,
+        {
+            "reminder": "reminder",
+            END: END
+        }
+    )
 
-graph.add_conditional_edges(
-    "appointment_validation",
-    validation_gate,
-    {
-        "scheduling": "scheduling",
-        END: END
-    }
-)
+    # Remind only when the slot was actually booked
+    def route_from_scheduling(state: ClinicalWorkflowState):
+        if state["appointment_confirmed"]:
+            return "reminder"
+        return END
 
-# Validation Gate (Critical for Clinical Safety)
-def validation_gate(state: ClinicalWorkflowState):
-    if state["is_valid"]:
-        return "pharmacy"
-    return END
-
-graph.add_conditional_edges(
-    "medicine_validation",
-    validation_gate,
-    {
-        "pharmacy": "pharmacy",
-        END: END
-    }
-)
+    graph.add_conditional_edges(
+        "scheduling",
+        route_from_scheduling,
+        {
+            "reminder": "reminder",
+            END: END
+        }
+    )
 
-# Validation Gate (Critical for Clinical Safety)
-def validation_gate(state: ClinicalWorkflowState):
-    if state["is_valid"]:
-        return "reminder"
-    return END
-
-graph.add_conditional_edges(
-    "reminder_validation",
-    validation_gate,
-    {
-        "reminder": "reminder",
-        END: END
-    }
-)
+    graph.add_edge("pharmacy", "reminder")
+    graph.add_edge("reminder", END)
 
-graph.add_edge("scheduling", "reminder")
-graph.add_edge("pharmacy", "reminder")
-graph.add_edge("reminder", END)
+    return graph
 
-graph_builder=graph.compile(checkpointer=checkpointer)
\ No newline at end of file
+graph_builder=build_graph().compile(checkpointer=checkpointer)
\ No newline at end of file
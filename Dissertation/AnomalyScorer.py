@@ -0,0 +1,183 @@
+import os
+import queue
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from Features import to_row
+
+# Batch bounds - whichever is hit first
+MAX_BATCH = int(os.getenv("ANOMALY_MAX_BATCH", "512"))
+MAX_DELAY = float(os.getenv("ANOMALY_MAX_DELAY_MS", "5")) / 1000.0
+
+# Scorer workers; a device always maps to the same one
+SCORER_SHARDS = int(os.getenv("ANOMALY_SHARDS", "4"))
+
+_STOP = object()
+
+def score_batch(model: Any, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One ensemble pass for the whole batch. IsolationForest's predict() and
+    decision_function() both call score_samples(); decision = score - offset_
+    and a negative decision is what predict() reports as -1.
+    """
+    decision = model.score_samples(X) - model.offset_
+    return decision, decision < 0
+
+class MicroBatchScorer:
+    """
+    Scores readings off the MQTT network thread. submit() only enqueues; a worker
+    drains the queue into batches of up to max_batch rows or max_delay seconds,
+    scores them in one vectorized pass and hands each device its own results:
+    on_results(device_id, [(reading, anomaly_score, is_anomaly), ...]).
+    anomaly_score is -decision_function (higher is more anomalous).
+    """
+
+    def __init__(self, model: Any, on_results: Callable[[str, List[Tuple[Dict[str, Any], float, bool]]], None],
+                 max_batch: int = MAX_BATCH, max_delay: float = MAX_DELAY, name: str = "anomaly-scorer"):
+        self.model = model
+        self.on_results = on_results
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.SimpleQueue()
+        self._stopped = False
+
+        self.batches = 0
+        self.rows = 0
+        self.invalid = 0
+        self.scoring_seconds = 0.0
+        self.max_latency = 0.0
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, device_id: str, reading: Dict[str, Any]) -> None:
+        self._queue.put((device_id, reading, time.perf_counter()))
+
+    def _next_batch(self) -> Optional[list]:
+
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                self._stopped = True
+                break
+            batch.append(item)
+
+        return batch
+
+    def _score(self, batch: list) -> None:
+
+        start = time.perf_counter()
+        X = np.array([to_row(reading) for _, reading, _ in batch], dtype=np.float64)
+        valid = ~np.isnan(X).any(axis=1)
+
+        decision = np.zeros(len(batch))
+        anomalous = np.zeros(len(batch), dtype=bool)
+        if valid.any():
+            # One model per batch, even if it is swapped mid-way
+            model = self.model
+            decision[valid], anomalous[valid] = score_batch(model, X[valid])
+        self.scoring_seconds += time.perf_counter() - start
+
+        # Fan back out per device, arrival order kept
+        per_device = defaultdict(list)
+        for i, (device_id, reading, _) in enumerate(batch):
+            if valid[i]:
+                per_device[device_id].append((reading, float(-decision[i]), bool(anomalous[i])))
+
+        for device_id, results in per_device.items():
+            try:
+                self.on_results(device_id, results)
+            except Exception as e:
+                print(f"Error handling results for {device_id}:", e)
+
+        oldest = min(item[2] for item in batch)
+        self.max_latency = max(self.max_latency, time.perf_counter() - oldest)
+        self.batches += 1
+        self.rows += len(batch)
+        self.invalid += int((~valid).sum())
+
+    def _run(self) -> None:
+        while not self._stopped:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._score(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Score what is queued, then stop the worker.
+        """
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "invalid": self.invalid,
+            "avg_batch": self.rows / self.batches if self.batches else 0.0,
+            "scoring_us_per_row": 1e6 * self.scoring_seconds / self.rows if self.rows else 0.0,
+            "max_latency_ms": 1000 * self.max_latency
+        }
+
+class ShardedScorer:
+    """
+    MicroBatchScorer per shard, device_id -> shard by a stable hash. Each device
+    is handled by one worker, so its readings stay ordered and its state has
+    a single writer.
+    """
+
+    def __init__(self, model: Any, on_results, shards: int = SCORER_SHARDS, **kwargs):
+        self.shards = [MicroBatchScorer(model, on_results, name=f"anomaly-scorer-{i}", **kwargs)
+                       for i in range(max(1, shards))]
+
+    def shard_for(self, device_id: str) -> MicroBatchScorer:
+        return self.shards[zlib.crc32(device_id.encode()) % len(self.shards)]
+
+    def submit(self, device_id: str, reading: Dict[str, Any]) -> None:
+        self.shard_for(device_id).submit(device_id, reading)
+
+    def set_model(self, model: Any) -> None:
+        """
+        Hot-swap: each shard picks the new model up at its next batch.
+        """
+        for shard in self.shards:
+            shard.model = model
+
+    def close(self, timeout: float = 5.0) -> None:
+        for shard in self.shards:
+            shard.close(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        per_shard = [shard.stats() for shard in self.shards]
+        rows = sum(s["rows"] for s in per_shard)
+        batches = sum(s["batches"] for s in per_shard)
+        return {
+            "shards": len(self.shards),
+            "batches": batches,
+            "rows": rows,
+            "invalid": sum(s["invalid"] for s in per_shard),
+            "avg_batch": rows / batches if batches else 0.0,
+            "scoring_us_per_row": max(s["scoring_us_per_row"] for s in per_shard),
+            "max_latency_ms": max(s["max_latency_ms"] for s in per_shard)
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Iterator, List
+
+import Tools
+from Tools import State
+from Tracing import span
+
+# Dedicated DB threads - each keeps its own pooled connection, so the
+# event loop never blocks on SQLite and concurrency is not one thread per user
+DB_WORKERS = int(os.getenv("PATIENT_CARE_DB_WORKERS", "4"))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="patient-care-db")
+
+# One event loop for the process on its own thread. The async LLM clients keep
+# HTTP connection pools bound to the loop they first ran on, so every turn runs
+# on this loop instead of a fresh asyncio.run() per Streamlit rerun
+_loop = None
+_loop_lock = threading.Lock()
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="patient-care-loop", daemon=True).start()
+
+    return _loop
+
+def run_sync(coro: Awaitable) -> Any:
+    """
+    Run a coroutine on the shared loop from synchronous code and wait for its result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+_DONE = object()
+
+def iterate_sync(agen: AsyncIterator) -> Iterator:
+    """
+    Drive an async generator on the shared loop and yield its items in the
+    calling thread (e.g. a Streamlit script thread that renders them).
+    The generator runs as one task, so context variables behave as under asyncio.run().
+    """
+    items = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put((item, None))
+        except BaseException as e:
+            items.put((_DONE, e))
+        else:
+            items.put((_DONE, None))
+
+    asyncio.run_coroutine_threadsafe(pump(), get_event_loop())
+
+    while True:
+        item, error = items.get()
+        if item is _DONE:
+            if error is not None:
+                raise error
+            return
+        yield item
+
+async def run_in_db_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    with span(f"db.{func.__name__}", {"db.queries": 1}) as current:
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(_db_executor, partial(func, *args))
+        finally:
+            # Includes the wait for a free DB thread
+            if current is not None:
+                current.set_attribute("db.time_ms", (time.perf_counter() - start) * 1000)
+
+async def afind_available_doctors (speciality: str) -> str:
+    """
+    Tool: Find doctors by speciality.
+    """
+    return await run_in_db_executor(Tools.find_available_doctors, speciality)
+
+async def afind_doctors_available_at (speciality: str, preferred_day: str, preferred_time: str) -> str:
+    """
+    Tool: Find doctors of a speciality whose schedule covers the preferred day and time.
+    """
+    return await run_in_db_executor(Tools.find_doctors_available_at, speciality, preferred_day, preferred_time)
+
+async def afind_next_available_slots (speciality: str, after_date: str, after_time: str) -> str:
+    """
+    Tool: Find the earliest free appointment slots for a speciality.
+    """
+    return await run_in_db_executor(Tools.find_next_available_slots, speciality, after_date, after_time)
+
+async def aget_doctor_schedule (name: str) -> str:
+    """
+    Tool: Retrieve doctor's schedule by name.
+    """
+    return await run_in_db_executor(Tools.get_doctor_schedule, name)
+
+async def afind_doctor_candidates (doctor_name: str, speciality: str, preferred_date: str, preferred_time: str,
+                                   symptoms: str = None) -> List[dict]:
+    """
+    Doctors fitting the request, ranked by schedule match, looked up before triage.
+    """
+    return await run_in_db_executor(Tools.find_doctor_candidates, doctor_name, speciality, preferred_date,
+                                    preferred_time, symptoms)
+
+async def aget_patient_details (name: str) -> str:
+    """
+    Tool: Get Patient's details by name.
+    """
+    return await run_in_db_executor(Tools.get_patient_details, name)
+
+async def aget_symptom_details (patient_id: str) -> List[str]:
+    """
+    Tool: Fetch all symptoms recorded for a given patient_id.
+    """
+    return await run_in_db_executor(Tools.get_symptom_details, patient_id)
+
+async def asearch_symptom_history (patient_id: str, complaint: str) -> List[str]:
+    """
+    Tool: Fetch the past symptoms of a patient most relevant to the current complaint.
+    """
+    return await run_in_db_executor(Tools.search_symptom_history, patient_id, complaint)
+
+async def aget_recent_symptoms (patient_id: str) -> List[str]:
+    """
+    Tool: Fetch symptoms recorded for a patient recently, newest first.
+    """
+    return await run_in_db_executor(Tools.get_recent_symptoms, patient_id)
+
+async def aget_relevant_history (patient_id: str, complaint: str) -> List[str]:
+    """
+    Relevant and recent past symptoms, bounded.
+    """
+    return await run_in_db_executor(Tools.get_relevant_history, patient_id, complaint)
+
+async def abook_appointment(state: State) -> str:
+    """
+    Tool: Insert appointment and symptoms into database
+    """
+    return await run_in_db_executor(Tools.book_appointment, state)
+
+async def aorder_medicine(state: State) -> str:
+    """
+    Tool: Insert medicine order details into database
+    """
+    return await run_in_db_executor(Tools.order_medicine, state)
+
+def shutdown() -> None:
+    _db_executor.shutdown(wait=True)
@@ -0,0 +1,102 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import List, Dict, Optional, Any, Iterator, Tuple
+
+from DoctorDirectory import get_directory
+from Repository import get_repository
+from Schedule import SLOT_MINUTES, parse_days, parse_time, normalize_time
+
+# How far ahead slots are materialized
+HORIZON_DAYS = 14
+
+def _booked_times(doctor_id: int, from_date: str, to_date: str) -> Dict[str, List[int]]:
+    """
+    DATE -> booked start minutes, including times that are off the slot grid.
+    """
+    rows = get_repository().booked_times(doctor_id, from_date, to_date)
+
+    booked = defaultdict(list)
+    for date, time in rows:
+        try:
+            booked[date].append(parse_time(time))
+        except (ValueError, AttributeError):
+            continue
+
+    return booked
+
+def doctor_free_slots(doctor: Dict[str, Any], after: datetime,
+                      horizon_days: int = HORIZON_DAYS) -> Iterator[Tuple[datetime, int, Dict[str, Any]]]:
+    """
+    Yield (slot_start, doctor_id, doctor) for every unbooked slot in
+    the doctor's schedule, in chronological order. A slot counts as taken
+    when any booking starts less than SLOT_MINUTES away from it.
+    """
+    try:
+        start = parse_time(doctor["available_from"])
+        end = parse_time(doctor["available_to"])
+    except (ValueError, AttributeError):
+        return
+
+    days = parse_days(doctor["available_days"])
+
+    first_day = after.date()
+    last_day = first_day + timedelta(days=horizon_days)
+    booked = _booked_times(doctor["doctor_id"], first_day.isoformat(), last_day.isoformat())
+
+    day = first_day
+    while day <= last_day:
+        if day.weekday() in days:
+            taken = booked.get(day.isoformat(), ())
+            for minute in range(start, end - SLOT_MINUTES + 1, SLOT_MINUTES):
+                slot = datetime(day.year, day.month, day.day, minute // 60, minute % 60)
+                if slot < after:
+                    continue
+                if any(abs(b - minute) < SLOT_MINUTES for b in taken):
+                    continue
+                yield slot, doctor["doctor_id"], doctor
+        day += timedelta(days=1)
+
+def _format_slot(slot: datetime, doctor: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "doctor_id": doctor["doctor_id"],
+        "name": doctor["name"],
+        "speciality": doctor["speciality"],
+        "date": slot.strftime("%d-%b-%y"),
+        "day": slot.strftime("%A"),
+        "time": slot.strftime("%H:%M")
+    }
+
+def next_free_slots(speciality: str, after: datetime, n: int = 5,
+                    horizon_days: int = HORIZON_DAYS) -> List[Dict[str, Any]]:
+    """
+    Earliest n free slots across all doctors of a speciality (k-way heap merge).
+    """
+    doctors = get_directory().by_speciality(speciality, limit=None)
+    streams = [doctor_free_slots(d, after, horizon_days) for d in doctors]
+
+    merged = heapq.merge(*streams, key=lambda s: (s[0], s[1]))
+
+    return [_format_slot(slot, doctor) for slot, _, doctor in islice(merged, n)]
+
+def book_slot(patient_id: int, patient_name: str, doctor_id: int, db_date: str,
+              time: str, symptoms: Optional[str]) -> Dict[str, Any]:
+    """
+    Atomically book a slot. The repository checks the time against the
+    doctor's days, hours and slot grid and against overlapping bookings,
+    and inserts, in one transaction (BEGIN IMMEDIATE on SQLite, a per-doctor
+    advisory lock on Postgres), so concurrent bookings of the same slot
+    serialize and only the first one succeeds.
+
+    status is "confirmed", "conflict" (overlaps a booking) or "unavailable"
+    (not a slot in the doctor's schedule, with a "reason").
+    """
+    try:
+        slot_time = normalize_time(time)
+    except (ValueError, AttributeError):
+        return {"status": "unavailable", "reason": f"unrecognised time {time!r}"}
+
+    return get_repository().book_appointment(
+        patient_id, patient_name, doctor_id, db_date, slot_time, symptoms
+    )
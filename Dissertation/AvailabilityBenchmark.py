@@ -0,0 +1,74 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import Database
+from Availability import book_slot, doctor_free_slots
+from Database import get_connection
+from Repository import get_repository
+
+# Contention benchmark - many threads racing for a small pool of slots
+def run_benchmark(threads: int = 64, attempts: int = 5000, doctors: int = 5, slots_per_doctor: int = 16):
+
+    day = datetime(2030, 1, 7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        shutil.copy(Database.DEFAULT_DB_PATH, path)
+        Database.configure(path)
+
+        # Real slots of the first doctors working that day
+        targets = []
+        picked = 0
+        for r in get_repository().load_active_doctors():
+            doctor = {"doctor_id": r[0], "available_from": r[4], "available_to": r[5], "available_days": r[6]}
+            slots = [s for s, _, _ in doctor_free_slots(doctor, day, horizon_days=0)][:slots_per_doctor]
+            if slots:
+                targets.extend((r[0], day.strftime("%Y-%m-%d"), s.strftime("%H:%M")) for s in slots)
+                picked += 1
+            if picked == doctors:
+                break
+
+        def attempt(i):
+            doctor_id, db_date, slot_time = random.choice(targets)
+            return book_slot(1, "Benchmark", doctor_id, db_date, slot_time, None)["status"]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(attempt, range(attempts)))
+        elapsed = time.perf_counter() - start
+
+        duplicates = get_connection().execute("""
+            SELECT COUNT(*) FROM (
+                SELECT DOCTOR_ID, DATE, TIME
+                FROM APPOINTMENT
+                WHERE DATE = ?
+                GROUP BY DOCTOR_ID, DATE, TIME
+                HAVING COUNT(*) > 1
+            )
+        """, (day.strftime("%Y-%m-%d"),)).fetchone()[0]
+
+        Database.close_all()
+
+    confirmed = results.count("confirmed")
+    print(f"Benchmark: {attempts} booking attempts from {threads} threads on {len(targets)} slots")
+    print(f"  elapsed:     {elapsed:.2f}s ({attempts / elapsed:.0f} attempts/sec)")
+    print(f"  confirmed:   {confirmed}")
+    print(f"  conflicts:   {results.count('conflict')}")
+    print(f"  unavailable: {results.count('unavailable')}")
+    print(f"  double-booked slots: {duplicates}")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Appointment booking under contention")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--attempts", type=int, default=5000)
+    args = parser.parse_args()
+
+    run_benchmark(args.threads, args.attempts)
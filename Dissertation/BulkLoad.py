@@ -0,0 +1,103 @@
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Repository import get_repository
+from Schedule import normalize_time
+from Tools import to_db_date
+import PatientCache
+
+# Rows per transaction
+CHUNK_SIZE = 5000
+
+# Imports repeat the same handful of dates/times - parse each once
+_db_date = lru_cache(maxsize=4096)(to_db_date)
+_db_time = lru_cache(maxsize=4096)(normalize_time)
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _invalidate_patients(names: List[str], patient_ids: List[int]) -> None:
+    """
+    Drop cache entries made stale by a committed chunk.
+    """
+    for name in names:
+        if name:
+            PatientCache.patient_ids.invalidate(PatientCache.normalize_name(name))
+    for patient_id in set(patient_ids):
+        PatientCache.symptom_history.invalidate(int(patient_id))
+
+def bulk_book_appointments(appointments: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE,
+                           validate: bool = True) -> Tuple[List[Optional[int]], List[Dict[str, Any]]]:
+    """
+    Insert appointments (same dict shape as appointment_details), one
+    transaction per chunk. Each row gets book_appointment's checks - doctor's
+    schedule, slot grid, no overlap with booked or earlier rows - unless
+    validate is False, for imports already agreed with the clinic. Patients with
+    patient_id 0 are found by name or created once, and symptoms are recorded
+    like book_appointment does.
+    Returns the APPOINTMENT_IDs in input order (None where refused) and the
+    refused rows as book_appointment results with their input "index".
+    """
+    appointment_ids = []
+    rejected = []
+
+    for chunk in _chunks(appointments, chunk_size):
+
+        rows = [
+            (
+                a.get("patient_id", 0),
+                a.get("patient_name"),
+                a["doctor_id"],
+                _db_date(a["date"]),
+                _db_time(a["time"]),
+                a.get("symptoms")
+            )
+            for a in chunk
+        ]
+
+        ids, resolved, rejections = get_repository().bulk_book_appointments(rows, validate=validate)
+
+        for i, result in enumerate(rejections):
+            if result is not None:
+                rejected.append({"index": len(appointment_ids) + i, **result})
+        appointment_ids.extend(ids)
+
+        booked = [i for i, appointment_id in enumerate(ids) if appointment_id is not None]
+        _invalidate_patients([rows[i][1] for i in booked if rows[i][0] == 0], [resolved[i] for i in booked])
+
+    return appointment_ids, rejected
+
+def bulk_insert_symptoms(symptoms: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """
+    Insert {"patient_id", "symptoms"} records. Returns the generated SYMPTOM_IDs.
+    """
+    symptom_ids = []
+
+    for chunk in _chunks(symptoms, chunk_size):
+        symptom_ids.extend(get_repository().bulk_insert_symptoms(
+            [(s["patient_id"], s.get("symptoms")) for s in chunk]
+        ))
+
+        _invalidate_patients([], [s["patient_id"] for s in chunk])
+
+    return symptom_ids
+
+def bulk_order_medicines(orders: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """
+    Insert medicine orders (same keys as order_medicine's extracted_entities).
+    Returns the generated ORDER_IDs.
+    """
+    order_ids = []
+
+    for chunk in _chunks(orders, chunk_size):
+        order_ids.extend(get_repository().bulk_insert_medicine_orders(
+            [(o["medicine"], o["dosage"], o.get("quantity"), o.get("shipping_address")) for o in chunk]
+        ))
+
+    return order_ids
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+
+import Database
+from BulkLoad import bulk_book_appointments, bulk_insert_symptoms, bulk_order_medicines
+
+# Rows/sec into each table on a scratch copy of the DB
+def run_benchmark(rows: int = 200_000):
+
+    # Every row a distinct doctor/day/slot, so refusals come only from schedules
+    start_day = date(2030, 1, 7)
+    appointments = (
+        {
+            "patient_id": 1 + i % 20,
+            "patient_name": None,
+            "doctor_id": 1 + i % 70,
+            "symptoms": "fever",
+            "date": (start_day + timedelta(days=i // (70 * 16))).strftime("%d-%b-%y"),
+            "time": f"{9 + i // 70 % 16 // 2:02d}:{i // 70 % 2 * 30:02d}"
+        }
+        for i in range(rows)
+    )
+    symptoms = ({"patient_id": 1 + i % 20, "symptoms": "cough"} for i in range(rows))
+    orders = (
+        {"medicine": "Paracetamol", "dosage": "650 mg", "quantity": "10", "shipping_address": "Kolkata"}
+        for _ in range(rows)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        shutil.copy(Database.DEFAULT_DB_PATH, path)
+        Database.configure(path)
+
+        for name, loader, data in [
+            ("APPOINTMENT (+SYMPTOMS)", bulk_book_appointments, appointments),
+            ("SYMPTOMS", lambda data: (bulk_insert_symptoms(data), []), symptoms),
+            ("MEDICINE_ORDER", lambda data: (bulk_order_medicines(data), []), orders),
+        ]:
+            start = time.perf_counter()
+            ids, rejected = loader(data)
+            elapsed = time.perf_counter() - start
+            print(f"Benchmark: {name:24s} {len(ids)} rows in {elapsed:.2f}s "
+                  f"({len(ids) / elapsed:,.0f} rows/sec, {len(rejected)} refused)")
+
+        Database.close_all()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk ingestion for PatientCareDB")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows)
@@ -0,0 +1,388 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+# Checkpoint store location - separate from the clinic database
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Checkpoints.db")
+
+# Bounded storage
+KEEP_CHECKPOINTS = int(os.getenv("CHECKPOINT_KEEP", "5"))
+IDLE_THREAD_TTL = float(os.getenv("CHECKPOINT_IDLE_TTL", str(7 * 24 * 3600)))
+EXPIRE_EVERY_PUTS = 500
+
+# Message history compaction
+MAX_MESSAGES = int(os.getenv("CHECKPOINT_MAX_MESSAGES", "40"))
+KEEP_RECENT_MESSAGES = 20
+SUMMARY_ID = "conversation-summary"
+MAX_SUMMARY_CHARS = 4000
+MAX_SUMMARY_LINE_CHARS = 200
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS CHECKPOINTS (
+        THREAD_ID       TEXT NOT NULL,
+        CHECKPOINT_NS   TEXT NOT NULL DEFAULT '',
+        CHECKPOINT_ID   TEXT NOT NULL,
+        PARENT_ID       TEXT,
+        CHECKPOINT_TYPE TEXT NOT NULL,
+        CHECKPOINT      BLOB NOT NULL,
+        METADATA_TYPE   TEXT NOT NULL,
+        METADATA        BLOB NOT NULL,
+        PRIMARY KEY (THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS WRITES (
+        THREAD_ID       TEXT NOT NULL,
+        CHECKPOINT_NS   TEXT NOT NULL DEFAULT '',
+        CHECKPOINT_ID   TEXT NOT NULL,
+        TASK_ID         TEXT NOT NULL,
+        IDX             INTEGER NOT NULL,
+        CHANNEL         TEXT NOT NULL,
+        VALUE_TYPE      TEXT NOT NULL,
+        VALUE           BLOB NOT NULL,
+        TASK_PATH       TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID, TASK_ID, IDX)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS THREADS (
+        THREAD_ID       TEXT PRIMARY KEY,
+        LAST_ACTIVE     REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS IDX_THREADS_LAST_ACTIVE ON THREADS (LAST_ACTIVE)"
+]
+
+def _message_line(message: Any) -> Optional[str]:
+
+    content = message.content if isinstance(message.content, str) else ""
+    content = " ".join(content.split())
+    if not content or message.type in ("tool", "system"):
+        return None
+    if len(content) > MAX_SUMMARY_LINE_CHARS:
+        content = content[:MAX_SUMMARY_LINE_CHARS - 3] + "..."
+
+    return f"{'User' if message.type == 'human' else 'Assistant'}: {content}"
+
+def compact_messages(messages: List[Any], max_messages: int = MAX_MESSAGES,
+                     keep_recent: int = KEEP_RECENT_MESSAGES) -> List[Any]:
+    """
+    Fold everything but the most recent messages into one summary message.
+    The cut never separates a tool result from the AI message that called it.
+    """
+    if len(messages) <= max_messages:
+        return messages
+
+    previous = ""
+    if messages and messages[0].id == SUMMARY_ID:
+        previous = messages[0].content
+        messages = messages[1:]
+
+    cut = max(len(messages) - keep_recent, 0)
+    while cut < len(messages) and isinstance(messages[cut], ToolMessage):
+        cut += 1
+
+    lines = [line for line in (_message_line(m) for m in messages[:cut]) if line]
+    summary = "\n".join(([previous] if previous else []) + lines)
+
+    # Keep the newest part of the summary when it outgrows its budget
+    if len(summary) > MAX_SUMMARY_CHARS:
+        summary = summary[-MAX_SUMMARY_CHARS:]
+        summary = summary[summary.find("\n") + 1:]
+
+    header = "Summary of the earlier conversation:\n"
+    if not summary.startswith(header):
+        summary = header + summary
+
+    return [SystemMessage(content=summary, id=SUMMARY_ID)] + messages[cut:]
+
+class SQLiteCheckpointer(BaseCheckpointSaver):
+    """
+    Durable LangGraph checkpointer with bounded storage:
+      - only the latest KEEP_CHECKPOINTS checkpoints are kept per thread
+      - message history beyond MAX_MESSAGES is compacted into a summary
+      - threads idle for longer than IDLE_THREAD_TTL are expired
+    """
+
+    def __init__(self, path: str = os.getenv("PATIENT_CARE_CHECKPOINT_DB", DEFAULT_CHECKPOINT_PATH),
+                 keep_checkpoints: int = KEEP_CHECKPOINTS, idle_ttl: float = IDLE_THREAD_TTL,
+                 max_messages: int = MAX_MESSAGES, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_checkpoints = keep_checkpoints
+        self.idle_ttl = idle_ttl
+        self.max_messages = max_messages
+        # A small max_messages must still leave room for the summary
+        self.keep_recent = min(KEEP_RECENT_MESSAGES, max_messages // 2)
+        self._lock = threading.Lock()
+        self._puts = 0
+
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+        self.expire_idle_threads()
+
+    # Reads
+
+    def _pending_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = self._conn.execute("""
+            SELECT TASK_ID, CHANNEL, VALUE_TYPE, VALUE
+            FROM WRITES
+            WHERE THREAD_ID = ? AND CHECKPOINT_NS = ? AND CHECKPOINT_ID = ?
+            ORDER BY TASK_ID, IDX
+        """, (thread_id, checkpoint_ns, checkpoint_id)).fetchall()
+
+        return [(task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in rows]
+
+    def _to_tuple(self, row) -> CheckpointTuple:
+
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, c_type, c_blob, m_type, m_blob = row
+
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id
+            }},
+            checkpoint=self.serde.loads_typed((c_type, c_blob)),
+            metadata=self.serde.loads_typed((m_type, m_blob)),
+            parent_config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id
+            }} if parent_id else None,
+            pending_writes=self._pending_writes(thread_id, checkpoint_ns, checkpoint_id)
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        columns = "THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID, PARENT_ID, CHECKPOINT_TYPE, CHECKPOINT, METADATA_TYPE, METADATA"
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM CHECKPOINTS WHERE THREAD_ID = ? AND CHECKPOINT_NS = ? AND CHECKPOINT_ID = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM CHECKPOINTS WHERE THREAD_ID = ? AND CHECKPOINT_NS = ? "
+                    f"ORDER BY CHECKPOINT_ID DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+
+            return self._to_tuple(row) if row else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("THREAD_ID = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("CHECKPOINT_NS = ?")
+                params.append(checkpoint_ns)
+        if before is not None:
+            clauses.append("CHECKPOINT_ID < ?")
+            params.append(before["configurable"]["checkpoint_id"])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID, PARENT_ID,
+                       CHECKPOINT_TYPE, CHECKPOINT, METADATA_TYPE, METADATA
+                FROM CHECKPOINTS {where}
+                ORDER BY CHECKPOINT_ID DESC
+            """, params).fetchall()
+            tuples = [self._to_tuple(row) for row in rows]
+
+        returned = 0
+        for checkpoint_tuple in tuples:
+            if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            if limit is not None and returned >= limit:
+                break
+            returned += 1
+            yield checkpoint_tuple
+
+    # Writes
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+
+        # Compact the stored copy; the running graph keeps its own channels
+        messages = checkpoint.get("channel_values", {}).get("messages")
+        if isinstance(messages, list) and len(messages) > self.max_messages:
+            checkpoint = {
+                **checkpoint,
+                "channel_values": {**checkpoint["channel_values"],
+                                   "messages": compact_messages(messages, self.max_messages, self.keep_recent)}
+            }
+
+        c_type, c_blob = self.serde.dumps_typed(checkpoint)
+        m_type, m_blob = self.serde.dumps_typed(dict(metadata))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO CHECKPOINTS
+                    (THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID, PARENT_ID, CHECKPOINT_TYPE, CHECKPOINT, METADATA_TYPE, METADATA)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"),
+                      c_type, c_blob, m_type, m_blob))
+
+                # Keep only the newest checkpoints (and their writes) for the thread
+                stale = [r[0] for r in self._conn.execute("""
+                    SELECT CHECKPOINT_ID FROM CHECKPOINTS
+                    WHERE THREAD_ID = ? AND CHECKPOINT_NS = ?
+                    ORDER BY CHECKPOINT_ID DESC LIMIT -1 OFFSET ?
+                """, (thread_id, checkpoint_ns, self.keep_checkpoints))]
+                if stale:
+                    marks = ",".join("?" * len(stale))
+                    params = [thread_id, checkpoint_ns] + stale
+                    self._conn.execute(
+                        f"DELETE FROM CHECKPOINTS WHERE THREAD_ID = ? AND CHECKPOINT_NS = ? AND CHECKPOINT_ID IN ({marks})",
+                        params
+                    )
+                    self._conn.execute(
+                        f"DELETE FROM WRITES WHERE THREAD_ID = ? AND CHECKPOINT_NS = ? AND CHECKPOINT_ID IN ({marks})",
+                        params
+                    )
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO THREADS (THREAD_ID, LAST_ACTIVE) VALUES (?, ?)", (thread_id, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._puts += 1
+            expire = self._puts % EXPIRE_EVERY_PUTS == 0
+
+        if expire:
+            self.expire_idle_threads()
+
+        return {"configurable": {
+            "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]
+        }}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                   task_id: str, task_path: str = "") -> None:
+
+        configurable = config["configurable"]
+
+        # Special channels (errors, interrupts) replace; regular writes are write-once
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, blob = self.serde.dumps_typed(value)
+            rows.append((
+                configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"],
+                task_id, WRITES_IDX_MAP.get(channel, idx), channel, value_type, blob, task_path
+            ))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(f"""
+                    {verb} INTO WRITES
+                    (THREAD_ID, CHECKPOINT_NS, CHECKPOINT_ID, TASK_ID, IDX, CHANNEL, VALUE_TYPE, VALUE, TASK_PATH)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete_threads([thread_id])
+
+    def _delete_threads(self, thread_ids: List[str]) -> None:
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("CHECKPOINTS", "WRITES", "THREADS"):
+                self._conn.executemany(f"DELETE FROM {table} WHERE THREAD_ID = ?", [(t,) for t in thread_ids])
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def expire_idle_threads(self) -> int:
+        """
+        Drop every thread with no checkpoint for longer than idle_ttl.
+        """
+        with self._lock:
+            expired = [r[0] for r in self._conn.execute(
+                "SELECT THREAD_ID FROM THREADS WHERE LAST_ACTIVE < ?", (time.time() - self.idle_ttl,)
+            )]
+            if expired:
+                self._delete_threads(expired)
+
+        return len(expired)
+
+    # Async variants - SQLite calls run off the event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                          task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite LangGraph checkpointer")
+    parser.add_argument("command", choices=["expire"])
+    parser.parse_args()
+
+    print(f"Expired {SQLiteCheckpointer().expire_idle_threads()} idle threads")
@@ -0,0 +1,72 @@
+import os
+import statistics
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+from Checkpointer import KEEP_CHECKPOINTS, SQLiteCheckpointer
+
+# Simulated conversations, one checkpoint per super-step
+def run_benchmark(threads: int = 20, turns: int = 50, steps_per_turn: int = 4):
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saver = SQLiteCheckpointer(os.path.join(tmp, "bench.db"))
+
+        put_times, get_times, sizes = [], [], []
+        for turn in range(turns):
+            for t in range(threads):
+                config = {"configurable": {"thread_id": f"thread-{t}", "checkpoint_ns": ""}}
+
+                start = time.perf_counter()
+                latest = saver.get_tuple(config)
+                get_times.append(time.perf_counter() - start)
+
+                messages = list(latest.checkpoint["channel_values"]["messages"]) if latest else []
+                messages.append(HumanMessage(content=f"Turn {turn}: I have had a headache for {turn} days."))
+
+                for step in range(steps_per_turn):
+                    if step == steps_per_turn - 1:
+                        messages.append(AIMessage(content=f"Reply {turn}: please share a preferred date and time."))
+
+                    checkpoint = empty_checkpoint()
+                    checkpoint["id"] = str(uuid6(clock_seq=step))
+                    checkpoint["channel_values"] = {"messages": messages, "workflow_status": "WIP"}
+                    checkpoint["channel_versions"] = {"messages": turn * steps_per_turn + step + 1}
+
+                    start = time.perf_counter()
+                    config = saver.put(config, checkpoint, {"source": "loop", "step": step}, {})
+                    put_times.append(time.perf_counter() - start)
+
+                    saver.put_writes(config, [("messages", messages[-1])], task_id=f"task-{step}")
+
+            sizes.append(os.path.getsize(saver.path) + os.path.getsize(saver.path + "-wal"))
+
+        stored = saver._conn.execute("SELECT COUNT(*) FROM CHECKPOINTS").fetchone()[0]
+        latest = saver.get_tuple({"configurable": {"thread_id": "thread-0"}})
+        saver.close()
+
+    def pct(values, p):
+        return sorted(values)[int(len(values) * p) - 1] * 1000
+
+    print(f"Benchmark: {threads} threads x {turns} turns x {steps_per_turn} super-steps")
+    print(f"  put  p50 {pct(put_times, 0.5):.2f}ms  p95 {pct(put_times, 0.95):.2f}ms")
+    print(f"  get  p50 {pct(get_times, 0.5):.2f}ms  p95 {pct(get_times, 0.95):.2f}ms")
+    print(f"  checkpoints stored: {stored} (limit {KEEP_CHECKPOINTS} per thread)")
+    print(f"  messages in latest checkpoint: {len(latest.checkpoint['channel_values']['messages'])} "
+          f"(after {turns * 2} exchanged)")
+    print(f"  store size: {sizes[len(sizes) // 4] / 1024:.0f}KB at turn {len(sizes) // 4}, "
+          f"{sizes[-1] / 1024:.0f}KB at turn {turns}, median {statistics.median(sizes) / 1024:.0f}KB")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite LangGraph checkpointer benchmark")
+    parser.add_argument("--threads", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    run_benchmark(args.threads, args.turns)
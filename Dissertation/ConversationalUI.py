@@ -3,6 +3,8 @@ from langchain_core.messages import HumanMessage, AIMessage
 
 # from ConversationalAIAgent import graph_builder
 from AgenticWorkflow import graph_builder
+from WorkflowStream import stream_turn
+from AsyncTools import iterate_sync
 
 st.set_page_config(page_title="Sanjeevani — Virtual Care Assistant", layout="centered")
 
@@ -23,28 +25,64 @@ Please describe your health concern.
 
 CONFIG = {'configurable': {'thread_id': 'thread-1'}}
 
-# User input
-user_input = st.chat_input("Type Here...")
+def render_message(role, content):
+    with st.chat_message(role):
+        clean_text = content.replace("\\n", "\n")
+        st.markdown(clean_text, unsafe_allow_html=False)
 
-if user_input:
+def stream_response(user_input):
+
+    with st.chat_message("assistant"):
+        status = st.status("Working on it...", expanded=False)
+
+    # One chat bubble per node message, filled token by token
+    bubbles = {}
+
+    # The turn runs on the process-wide event loop; events are rendered here
+    for event in iterate_sync(stream_turn(graph_builder, user_input, CONFIG)):
+
+        if event["type"] in ("token", "replace"):
+            if event["node"] not in bubbles:
+                with st.chat_message("assistant"):
+                    bubbles[event["node"]] = [st.empty(), ""]
+            bubble = bubbles[event["node"]]
+            bubble[1] = event["text"] if event["type"] == "replace" else bubble[1] + event["text"]
+            bubble[0].markdown(bubble[1].replace("\\n", "\n") + "▌")
+
+        elif event["type"] == "message":
+            render_message("assistant", event["text"])
+
+        elif event["type"] == "progress":
+            status.write(f"✓ {event['label']}")
+            bubble = bubbles.pop(event["node"], None)
+            if bubble is not None:
+                bubble[0].markdown(bubble[1].replace("\\n", "\n"))
 
-    response = graph_builder.invoke({'messages': user_input}, config=CONFIG, debug=True)
-    print(response)
+    for placeholder, text in bubbles.values():
+        placeholder.markdown(text.replace("\\n", "\n"))
 
-    # Render full conversation
-    for msg in response["messages"]:
+    status.update(label="Done", state="complete")
 
-        if isinstance(msg, HumanMessage):
-            with st.chat_message("user"):
-                clean_text = msg.content.replace("\\n", "\n")
-                st.markdown(clean_text, unsafe_allow_html=False)
+# Render conversation so far
+for msg in graph_builder.get_state(CONFIG).values.get("messages", []):
 
-        elif isinstance(msg, AIMessage):
+    if isinstance(msg, HumanMessage):
+        render_message("user", msg.content)
+
+    elif isinstance(msg, AIMessage):
+
+        # Skip empty messages
+        if not msg.content or msg.content.strip() == "":
+            continue
+
+        render_message("assistant", msg.content)
+
+# User input
+user_input = st.chat_input("Type Here...")
+
+if user_input:
 
-            # Skip empty messages
-            if not msg.content or msg.content.strip() == "":
-                continue
+    render_message("user", user_input)
 
-            with st.chat_message("assistant"):
-                clean_text = msg.content.replace("\\n", "\n")
-                st.markdown(clean_text, unsafe_allow_html=False)
\ No newline at end of file
+    # Tokens and per-node progress are rendered as they arrive
+    stream_response(user_input)
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from Migrations import MIGRATIONS, get_version, migrate
+
+# DB Location - override with PATIENT_CARE_DB or configure()
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PatientCareDB.db")
+
+_db_path = os.getenv("PATIENT_CARE_DB", DEFAULT_DB_PATH)
+_generation = 0
+
+# One connection per thread, reused across tool calls
+_local = threading.local()
+_connections = []
+_migrated = set()
+_commit_listeners = []
+_lock = threading.Lock()
+
+# Apply pending migrations on first connect - off by default so opening the
+# checked-in DB never rewrites it; run `python Migrations.py migrate` instead
+AUTO_MIGRATE = os.getenv("PATIENT_CARE_AUTO_MIGRATE", "0") == "1"
+
+# Connection tuning
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+
+def configure(db_path: str) -> None:
+    """
+    Point the connection layer at a different database file.
+    Connections opened for the previous path are closed.
+    """
+    global _db_path
+
+    with _lock:
+        _db_path = db_path
+
+    close_all()
+
+def get_db_path() -> str:
+    return _db_path
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+
+    # isolation_level=None -> autocommit, transactions are explicit via transaction()
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+
+    # WAL lets readers and the writer work concurrently
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+    # Check the schema once per process and file
+    with _lock:
+        if db_path not in _migrated:
+            if AUTO_MIGRATE:
+                migrate(conn)
+            elif get_version(conn) < MIGRATIONS[-1][0]:
+                print(f"Database: {db_path} is at schema version {get_version(conn)} of "
+                      f"{MIGRATIONS[-1][0]} - run `python Migrations.py migrate`")
+            _migrated.add(db_path)
+
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return the calling thread's connection, opening it on first use.
+    """
+    conn = getattr(_local, "conn", None)
+
+    if conn is not None and _local.generation == _generation:
+        return conn
+
+    if conn is not None:
+        conn.close()
+
+    conn = _open_connection(_db_path)
+    _local.conn = conn
+    _local.generation = _generation
+
+    with _lock:
+        # Close connections left behind by finished threads
+        alive = []
+        for thread, other in _connections:
+            if thread.is_alive():
+                alive.append((thread, other))
+            else:
+                other.close()
+        alive.append((threading.current_thread(), conn))
+        _connections[:] = alive
+
+    return conn
+
+@contextmanager
+def transaction(immediate: bool = True):
+    """
+    Run a block inside a single transaction on the thread's connection.
+    BEGIN IMMEDIATE takes the write lock up front so concurrent writers
+    queue on busy_timeout instead of failing mid-transaction.
+    """
+    conn = get_connection()
+
+    # Nested use joins the outer transaction
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+        for listener in _commit_listeners:
+            listener()
+
+def add_commit_listener(listener) -> None:
+    """
+    Register a callable run after every successful transaction() commit.
+    """
+    with _lock:
+        _commit_listeners.append(listener)
+
+def close_all() -> None:
+    """
+    Close every pooled connection (e.g. on shutdown or reconfigure).
+    """
+    global _generation
+
+    # Other threads notice the new generation and reopen lazily
+    with _lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+
+    for _, conn in connections:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass
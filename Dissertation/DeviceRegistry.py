@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from Features import FEATURES, to_row
+from VitalsBuffer import VitalsBuffer
+
+# Readings kept per device, and devices kept per process (least recently seen evicted)
+HISTORY_SIZE = int(os.getenv("DEVICE_HISTORY_SIZE", "100"))
+MAX_DEVICES = int(os.getenv("MAX_DEVICES", "50000"))
+
+# Alert recipients: JSON {"<device_id or patient_id>": "whatsapp:+91..."}. Devices with no
+# entry alert the default recipient (Notifications.TO_NUMBER, the care team's number)
+ALERT_RECIPIENTS_FILE = os.getenv("ALERT_RECIPIENTS_FILE", "")
+
+def load_recipients(path: str = ALERT_RECIPIENTS_FILE) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def patient_of(device_id: str) -> str:
+    """
+    Patient a device belongs to - the simulator names extra watches <patient_id>-<n>.
+    """
+    patient_id, _, suffix = device_id.rpartition("-")
+    return patient_id if patient_id and suffix.isdigit() else device_id
+
+class DeviceState:
+    """
+    One wearable: latest reading, risk status and a VitalsBuffer of past readings
+    (~6 KB per device at 100 readings - VitalsBuffer.nbytes - independent of how
+    long it has run).
+    Written only by the scorer shard that owns the device; readers on other
+    threads take snapshot().
+    """
+
+    __slots__ = ("device_id", "recipient", "vitals", "latest", "status", "score", "last_seen", "last_alert",
+                 "readings", "anomalies", "_lock")
+
+    def __init__(self, device_id: str, capacity: int = HISTORY_SIZE, recipient: Optional[str] = None):
+        self.device_id = device_id
+        self.recipient = recipient
+        self.vitals = VitalsBuffer(capacity)
+        self.latest = {}
+        self.status = "Waiting for data..."
+        self.score = 0.0
+        self.last_seen = 0.0
+        self.last_alert = None
+        self.readings = 0
+        self.anomalies = 0
+        self._lock = threading.Lock()
+
+    def append(self, reading: Dict[str, Any], score: float, anomalous: bool, timestamp: Optional[float] = None) -> None:
+        row = to_row(reading)
+        with self._lock:
+            self.vitals.append(row, time.time() if timestamp is None else timestamp)
+
+            self.latest = reading
+            self.score = score
+            self.status = "⚠️ Health Risk Detected" if anomalous else "✅ Normal"
+            self.last_seen = time.monotonic()
+            self.readings += 1
+            self.anomalies += int(anomalous)
+
+    def history(self) -> Dict[str, np.ndarray]:
+        """
+        Oldest-first views of the ring, one per feature plus "timestamp".
+        Only for the owning shard - the views change under concurrent appends.
+        """
+        timestamps, values = self.vitals.window()
+        columns = {feature: values[:, i] for i, feature in enumerate(FEATURES)}
+        columns["timestamp"] = timestamps
+        return columns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Consistent copy for another thread (the dashboard): latest reading,
+        status, rolling summary and history, all taken under one lock.
+        """
+        with self._lock:
+            history = {key: column.copy() for key, column in self.history().items()}
+            return {
+                "device_id": self.device_id,
+                "latest": dict(self.latest),
+                "status": self.status,
+                "score": self.score,
+                "readings": self.readings,
+                "anomalies": self.anomalies,
+                "window": len(self.vitals),
+                "summary": self.vitals.summary(),
+                "history": history
+            }
+
+    def nbytes(self) -> int:
+        return self.vitals.nbytes
+
+class DeviceRegistry:
+    """
+    device_id -> DeviceState with a bound on the number of devices.
+    """
+
+    def __init__(self, capacity: int = HISTORY_SIZE, max_devices: int = MAX_DEVICES,
+                 recipients: Optional[Dict[str, str]] = None, default_recipient: Optional[str] = None):
+        self.capacity = capacity
+        self.max_devices = max_devices
+        self.recipients = load_recipients() if recipients is None else recipients
+        self.default_recipient = default_recipient
+        self._devices = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def get(self, device_id: str) -> DeviceState:
+        """
+        State for a device, created on first sight; marks it recently seen.
+        """
+        with self._lock:
+            state = self._devices.get(device_id)
+            if state is None:
+                state = self._devices[device_id] = DeviceState(device_id, self.capacity,
+                                                               self.recipient_for(device_id))
+                if len(self._devices) > self.max_devices:
+                    # Counted, not logged - a full registry evicts on every new device
+                    self._devices.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._devices.move_to_end(device_id)
+            return state
+
+    def recipient_for(self, device_id: str) -> Optional[str]:
+        """
+        The device's own entry, else its patient's, else the default recipient.
+        """
+        return (self.recipients.get(device_id) or self.recipients.get(patient_of(device_id))
+                or self.default_recipient)
+
+    def find(self, device_id: str) -> Optional[DeviceState]:
+        with self._lock:
+            return self._devices.get(device_id)
+
+    def device_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._devices)
+
+    def at_risk(self) -> List[str]:
+        with self._lock:
+            return [d for d, state in self._devices.items() if state.status.startswith("⚠️")]
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(state.nbytes() for state in self._devices.values())
@@ -0,0 +1,216 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import List, Dict, Optional, Any
+
+from Repository import get_repository
+from Schedule import parse_day, parse_time
+
+# Seconds between checks of DOCTOR.UPDATED_AT
+REFRESH_INTERVAL = 5.0
+
+# Trigram similarity below this is not considered a match
+MIN_NAME_SIMILARITY = 0.3
+
+def _normalize_name(name: str) -> str:
+    name = name.lower().strip()
+    if name.startswith("dr."):
+        name = name[3:]
+    elif name.startswith("dr "):
+        name = name[3:]
+    return " ".join(name.split())
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _Slice:
+    """
+    Doctors working on one day (optionally one speciality), sorted by start time.
+    """
+
+    def __init__(self, entries):
+        entries.sort()
+        self.starts = [e[0] for e in entries]
+        self.entries = entries
+        self.max_duration = max((e[1] - e[0] for e in entries), default=0)
+
+    def covering(self, minute: int) -> List[int]:
+
+        # Nobody starting before minute - max_duration can still be working at minute
+        lo = bisect_left(self.starts, minute - self.max_duration + 1)
+        hi = bisect_right(self.starts, minute)
+
+        return [e[2] for e in self.entries[lo:hi] if e[1] > minute]
+
+class DoctorDirectory:
+    """
+    Process-resident view of the DOCTOR table.
+    Reloaded when the table's UPDATED_AT / row count changes.
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._index = None
+
+    def _current_version(self):
+        return get_repository().doctor_version()
+
+    def _build(self) -> Dict[str, Any]:
+
+        rows = get_repository().load_active_doctors()
+
+        doctors = {}
+        by_speciality = defaultdict(list)
+        day_entries = defaultdict(list)
+        trigrams = defaultdict(set)
+
+        for r in rows:
+            doctor = {
+                "doctor_id": r[0],
+                "speciality": r[1],
+                "name": r[2],
+                "qualification": r[3],
+                "available_from": r[4],
+                "available_to": r[5],
+                "available_days": r[6]
+            }
+            doctor_id = r[0]
+            doctor["_name_key"] = _normalize_name(r[2])
+            doctors[doctor_id] = doctor
+            by_speciality[r[1].lower()].append(doctor_id)
+
+            for gram in _trigrams(doctor["_name_key"]):
+                trigrams[gram].add(doctor_id)
+
+            try:
+                start, end = parse_time(r[4]), parse_time(r[5])
+            except (ValueError, AttributeError):
+                continue
+
+            for day in (r[6] or "").split(","):
+                try:
+                    day_idx = parse_day(day)
+                except ValueError:
+                    continue
+                entry = (start, end, doctor_id)
+                day_entries[(day_idx, None)].append(entry)
+                day_entries[(day_idx, r[1].lower())].append(entry)
+
+        return {
+            "doctors": doctors,
+            "by_speciality": dict(by_speciality),
+            "by_day": {key: _Slice(entries) for key, entries in day_entries.items()},
+            "trigrams": dict(trigrams)
+        }
+
+    def _get_index(self) -> Dict[str, Any]:
+
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.refresh_interval:
+            return self._index
+
+        with self._lock:
+            if self._index is not None and now - self._checked_at < self.refresh_interval:
+                return self._index
+
+            version = self._current_version()
+            if self._index is None or version != self._version:
+                self._index = self._build()
+                self._version = version
+
+            self._checked_at = now
+
+        return self._index
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._index = None
+
+    @staticmethod
+    def _public(doctor: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in doctor.items() if not k.startswith("_")}
+
+    def by_speciality(self, speciality: str, limit: int = 5) -> List[Dict[str, Any]]:
+        index = self._get_index()
+        ids = index["by_speciality"].get(speciality.strip().lower(), [])
+        return [self._public(index["doctors"][i]) for i in ids[:limit]]
+
+    def available_at(self, day: str, at_time: str, speciality: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Doctors whose schedule covers the given day and time, earliest start first.
+        """
+        index = self._get_index()
+        key = (parse_day(day), speciality.strip().lower() if speciality else None)
+
+        day_slice = index["by_day"].get(key)
+        if day_slice is None:
+            return []
+
+        ids = day_slice.covering(parse_time(at_time))
+        if limit is not None:
+            ids = ids[:limit]
+
+        return [self._public(index["doctors"][i]) for i in ids]
+
+    def search_by_name(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Substring match on doctor name, falling back to trigram similarity.
+        """
+        index = self._get_index()
+        doctors = index["doctors"]
+        query = _normalize_name(name)
+
+        if not query:
+            return []
+
+        # Substring candidates must contain every inner trigram of the query
+        inner = {query[i:i + 3] for i in range(len(query) - 2)}
+        if inner:
+            postings = sorted((index["trigrams"].get(g, set()) for g in inner), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            candidates = doctors.keys()
+
+        matches = [i for i in candidates if query in doctors[i]["_name_key"]]
+
+        if not matches:
+            grams = _trigrams(query)
+            scores = defaultdict(int)
+            for gram in grams:
+                for i in index["trigrams"].get(gram, ()):
+                    scores[i] += 1
+
+            ranked = []
+            for i, shared in scores.items():
+                similarity = shared / len(grams | _trigrams(doctors[i]["_name_key"]))
+                if similarity >= MIN_NAME_SIMILARITY:
+                    ranked.append((-similarity, i))
+
+            matches = [i for _, i in sorted(ranked)]
+        else:
+            # Doctors without a start time sort last
+            matches.sort(key=lambda i: (doctors[i]["available_from"] is None, doctors[i]["available_from"] or "", i))
+
+        return [self._public(doctors[i]) for i in matches[:limit]]
+
+_directory = None
+_directory_lock = threading.Lock()
+
+def get_directory() -> DoctorDirectory:
+    """
+    Shared directory instance for the process.
+    """
+    global _directory
+
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = DoctorDirectory()
+
+    return _directory
@@ -0,0 +1,61 @@
+import time
+from datetime import date
+
+from FastPathRouter import EVALUATION_CORPUS, TRAINING_CORPUS, NaiveBayes, _rule_label, fast_path
+
+def _state(intent, entities, previous, text):
+    return {
+        "intent": intent,
+        "extracted_entities": entities,
+        "messages": [{"role": "assistant", "content": previous}, {"role": "user", "content": text}]
+    }
+
+def run_benchmark(repeat: int = 200, llm_latency: float = 1.5):
+
+    correct = 0
+    bypassed = 0
+    wrong_bypass = 0
+    for intent, entities, previous, text, expected in EVALUATION_CORPUS:
+        result = fast_path(_state(intent, entities, previous, text), today=date(2026, 10, 17))
+
+        if result is None:
+            outcome = "llm"
+        elif result["ready_for_routing"]:
+            outcome = "route"
+        else:
+            outcome = "slots"
+
+        correct += outcome == expected
+        if outcome != "llm":
+            bypassed += 1
+            wrong_bypass += outcome != expected
+
+    held_out = [(text, label) for text, label in TRAINING_CORPUS[::4]]
+    model = NaiveBayes().fit([e for i, e in enumerate(TRAINING_CORPUS) if i % 4])
+    model_accuracy = sum(model.predict(t)[0] == l for t, l in held_out) / len(held_out)
+    combined_accuracy = sum((_rule_label(t) or model.predict(t)[0]) == l for t, l in held_out) / len(held_out)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for intent, entities, previous, text, _ in EVALUATION_CORPUS:
+            fast_path(_state(intent, entities, previous, text))
+    per_turn = (time.perf_counter() - start) / (repeat * len(EVALUATION_CORPUS))
+
+    turns = len(EVALUATION_CORPUS)
+    print(f"Benchmark: {turns} labeled turns")
+    print(f"  routing accuracy:      {correct / turns:.1%}")
+    print(f"  classifier accuracy:   {combined_accuracy:.1%} rules+model, {model_accuracy:.1%} model only "
+          f"(every 4th training example held out)")
+    print(f"  LLM calls skipped:     {bypassed}/{turns} ({wrong_bypass} wrongly)")
+    print(f"  fast path latency:     {per_turn * 1e6:.0f} us/turn")
+    print(f"  est. time saved:       {bypassed * llm_latency:.1f}s at {llm_latency}s per LLM call")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local intent/slot fast path benchmark")
+    parser.add_argument("--llm-latency", type=float, default=1.5)
+    args = parser.parse_args()
+
+    run_benchmark(llm_latency=args.llm_latency)
@@ -0,0 +1,18 @@
+import math
+from typing import Any, Dict, List
+
+# Vitals a smartwatch reading carries, in model (training) order. The simulator,
+# generator, history buffers, scorer and model manifests all share this list
+FEATURES = ["heart_rate", "spo2", "temperature_f", "stress"]
+
+def to_row(reading: Dict[str, Any]) -> List[float]:
+    """
+    Reading -> feature vector in FEATURES order; missing or non-numeric values become NaN.
+    """
+    row = []
+    for feature in FEATURES:
+        try:
+            row.append(float(reading[feature]))
+        except (KeyError, TypeError, ValueError):
+            row.append(math.nan)
+    return row
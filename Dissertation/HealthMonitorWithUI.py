@@ -1,85 +1,79 @@
 import paho.mqtt.client as mqtt
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import IsolationForest
 import json
-from collections import deque
 import threading
+import time
 import gradio as gr
 import plotly.graph_objects as go
-from twilio.rest import Client
 import os
 from dotenv import load_dotenv
 
-# Twilio Credentials
+from AnomalyScorer import ShardedScorer
+from Features import FEATURES
+from DeviceRegistry import DeviceRegistry
+from ModelRegistry import ModelWatcher, load_or_train
+from Notifications import TO_NUMBER, get_dispatcher
+
 load_dotenv()
-TWILIO_SID = os.getenv("TWILIO_SID")
-TWILIO_TOKEN = os.getenv("TWILIO_TOKEN")
-client = Client(TWILIO_SID, TWILIO_TOKEN)
 
-# MQTT Settings
+# MQTT Settings - one topic per device, smartwatch/<patient_id>/healthdata
 BROKER = "broker.emqx.io"
-TOPIC = "smartwatch/healthdata"
-
-# Global State
-latest_data = {}
-anomaly_status = "Waiting for data..."
-history = deque(maxlen=100)
-
-# Generate baseline data to train the model
-def simulate_data():
-    import numpy as np
-    return {
-        'heart_rate': np.clip(np.random.normal(72, 10), 60,100),     # normal HR 60-100 bpm
-        'spo2': np.clip(np.random.normal(97, 2), 95,100),            # normal SpO2 ~98%
-        'temperature_f': np.clip(np.random.normal(98, 1), 97,99),    # Fahrenheit
-        'stress': np.clip(np.random.normal(3, 2), 1,6)               # scale 1–10
-    }
-
-# Generate baseline dataset to train the model
-def generate_baseline_data(n=50000):
-    return pd.DataFrame([simulate_data() for _ in range(n)])
-
-# Model training using baseline dataset
-baseline_df = generate_baseline_data()
-model = IsolationForest(contamination=0.01)
-model.fit(baseline_df)
-
-# Risk detection & alerting
-def detect_anomalies(data):
-    df = pd.DataFrame([data])
-    pred = model.predict(df)
-    scores = -model.decision_function(df)
-
-    if pred[0] == -1:
-        print("Warning: Health Risk Detected! Anomaly in readings:", data)
-
-        client.messages.create(
-                        from_='whatsapp:+14155238886',
-                        body=f"Health Risk Detected! Reading: {data} and Score: {scores}. Please discuss with Sanjeevani Virtual Care Assistant.",
-                        to='whatsapp:+919163040468')
-
-        print("Warning: Alert sent to user.\n")
-    else:
-        print("INFO: No Health Risk Detected. Readings are normal:", data)
-        print("INFO: Continuing to monitor...\n")
-
-    return "⚠️ Health Risk Detected" if pred[0] == -1 else "✅ Normal"
+TOPIC = "smartwatch/+/healthdata"
+LEGACY_TOPIC = "smartwatch/healthdata"
+DEFAULT_DEVICE = "smartwatch"
+
+# One WhatsApp alert per device per cooldown, however many anomalous readings arrive
+ALERT_COOLDOWN = float(os.getenv("ALERT_COOLDOWN_SECONDS", "60"))
+
+# Devices listed in the dashboard selector (at-risk first)
+MAX_LISTED_DEVICES = 200
+
+# Per-device state: latest reading, status and a bounded history ring. Alerts go to the
+# number mapped for the device or its patient (ALERT_RECIPIENTS_FILE), else to TO_NUMBER
+devices = DeviceRegistry(default_recipient=TO_NUMBER)
+
+# Versioned model from the registry - trained offline with `python ModelRegistry.py train`
+model, model_manifest = load_or_train()
+
+# Risk detection & alerting - runs on the device's scorer shard, once per device per batch
+def detect_anomalies(device_id, results):
+
+    state = devices.get(device_id)
+    for data, score, anomalous in results:
+        state.append(data, score, anomalous)
+        if not anomalous:
+            continue
+
+        print(f"Warning: Health Risk Detected for {device_id}! Anomaly in readings:", data)
+
+        now = time.monotonic()
+        if state.last_alert is None or now - state.last_alert >= ALERT_COOLDOWN:
+            state.last_alert = now
+            get_dispatcher().dispatch(
+                f"Health Risk Detected for {device_id}! Reading: {data} and Score: {score:.3f}. "
+                f"Please discuss with Sanjeevani Virtual Care Assistant.", to=state.recipient)
+            print("Warning: Alert queued for user.\n")
+
+scorer = ShardedScorer(model, detect_anomalies)
+
+# Promoting a new model swaps it in without restarting the MQTT loop
+model_watcher = ModelWatcher(lambda new_model, manifest: scorer.set_model(new_model), model_manifest["version"])
 
 # MQTT Callbacks
 def on_connect(client, userdata, flags, rc):
     print("Connection: Starting Sanjeevani monitoring service")
     print("Connection: Connected to MQTT broker")
-    client.subscribe(TOPIC)
-    print("Connection: Subscribing to health data stream")
+    client.subscribe([(TOPIC, 0), (LEGACY_TOPIC, 0)])
+    print("Connection: Subscribing to health data streams")
+
+def device_from_topic(topic):
+    parts = topic.split("/")
+    return parts[1] if len(parts) == 3 and parts[1] else DEFAULT_DEVICE
 
+# Network thread only parses and enqueues; scoring happens in batches on the scorer shards
 def on_message(client, userdata, msg):
-    global latest_data, anomaly_status
     try:
         data = json.loads(msg.payload.decode())
-        latest_data = data
-        anomaly_status = detect_anomalies(data)
-        history.append(data)
+        scorer.submit(device_from_topic(msg.topic), data)
     except Exception as e:
         print("Error processing message:", e)
 
@@ -95,42 +89,66 @@ mqtt_thread.daemon = True
 mqtt_thread.start()
 
 # Web Interface - Gradio Dashboard
-def refresh_dashboard():
-    if not latest_data:
-        return "Waiting for data...", "Waiting...", go.Figure()
+def refresh_dashboard(device_id):
+
+    device_ids = devices.device_ids()
+    at_risk = devices.at_risk()
+    flagged = set(at_risk)
+    choices = (at_risk + [d for d in reversed(device_ids) if d not in flagged])[:MAX_LISTED_DEVICES]
+    overview = f"{len(device_ids)} devices monitored, {len(at_risk)} at risk"
+    if devices.evicted:
+        overview += f", {devices.evicted} least recently seen dropped"
+
+    state = devices.find(device_id) if device_id else None
+    if state is None and choices:
+        state = devices.find(choices[0])
+    selector = gr.update(choices=choices, value=state.device_id if state else None)
+
+    # The scorer shard keeps appending - read one consistent copy
+    snapshot = state.snapshot() if state is not None else None
+    if snapshot is None or not snapshot["latest"]:
+        return "Waiting for data...", "Waiting...", go.Figure(), selector, overview
 
     display = ""
-    for key in latest_data:
-        value = round(latest_data[key],2)
-        display += key + " : " + str(value) + "\n"
+    for key in FEATURES:
+        if key in snapshot["latest"]:
+            display += key + " : " + str(round(snapshot["latest"][key], 2)) + "\n"
 
-    df = pd.DataFrame(history)
+    # Rolling aggregates are kept up on append - constant cost whatever the history length
+    display += f"\nlast {snapshot['window']} readings (mean / min / max / EWMA):\n"
+    for key, stats in snapshot["summary"].items():
+        display += f"{key} : {stats['mean']:.1f} / {stats['min']:.1f} / {stats['max']:.1f} / {stats['ewma']:.1f}\n"
+
+    history = snapshot["history"]
     fig = go.Figure()
-    for metric, color in zip(["heart_rate", "spo2", "body_temp", 'stress_level'], ["red", "green", "blue", "black"]):
-        if metric in df:
-            fig.add_trace(go.Scatter(
-                y=df[metric],
-                mode="lines+markers",
-                name=metric,
-                line=dict(color=color)
-            ))
-
-    fig.update_layout(title="📊 Real-time Health Metrics", height=400, margin=dict(t=30), 
-                      plot_bgcolor="white", font=dict(family="Source Sans Pro", size=10.5))
-    return display, anomaly_status, fig
+    for metric, color in zip(FEATURES, ["red", "green", "blue", "black"]):
+        fig.add_trace(go.Scatter(
+            y=history[metric],
+            mode="lines+markers",
+            name=metric,
+            line=dict(color=color)
+        ))
+
+    fig.update_layout(title=f"📊 Real-time Health Metrics - {snapshot['device_id']}", height=400,
+                      margin=dict(t=30), plot_bgcolor="white", font=dict(family="Source Sans Pro", size=10.5))
+    return display, snapshot["status"], fig, selector, overview
 
 # Live Gradio App
 with gr.Blocks() as demo:
     gr.Markdown("## 🧠 Sanjeevani - Health Monitoring Dashboard")
 
     with gr.Row():
-        data_text = gr.Textbox(label="📋 Latest Health Data", lines=6)
+        device_select = gr.Dropdown(label="⌚ Device", choices=[], allow_custom_value=True)
+        overview_text = gr.Textbox(label="🩺 Overview")
+
+    with gr.Row():
+        data_text = gr.Textbox(label="📋 Latest Health Data", lines=11)
         status_text = gr.Textbox(label="🚨 Risk Status")
 
     chart = gr.Plot(label="📈 Vitals (Live Graph)")
 
     # Auto-refresh every 3 seconds
     timer = gr.Timer(value=3.0, active=True)
-    timer.tick(refresh_dashboard, [], [data_text, status_text, chart])
+    timer.tick(refresh_dashboard, [device_select], [data_text, status_text, chart, device_select, overview_text])
 
 demo.launch()
\ No newline at end of file
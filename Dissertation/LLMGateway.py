@@ -0,0 +1,378 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional
+
+from PromptBudget import message_tokens
+from Tracing import record_llm_usage, span
+
+# Limits per model (Groq free tier is 30 requests/min)
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+REQUESTS_PER_MINUTE = float(os.getenv("LLM_RPM", "30"))
+TOKENS_PER_MINUTE = float(os.getenv("LLM_TPM", "60000"))
+
+# Retries on 429 / 5xx / timeouts
+MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+
+# Hedging: a second request once the first has run past the agent's HEDGE_PERCENTILE latency
+HEDGE_AGENTS = set(filter(None, os.getenv("LLM_HEDGE_AGENTS", "validation").split(",")))
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MAX_RATIO = 0.1
+
+# Latency histogram bucket bounds (ms)
+HISTOGRAM_BOUNDS = [50, 100, 250, 500, 1000, 2000, 5000, 10000, 30000, 60000]
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in ("APITimeoutError", "APIConnectionError", "TimeoutException", "ConnectError"):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS
+
+def backoff_delay(attempt: int, error: Exception) -> float:
+    """
+    Full-jitter exponential backoff; a server Retry-After is honoured as the floor.
+    """
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+class ConcurrencyLimiter:
+    """
+    Counting semaphore usable from threads and from any event loop
+    (asyncio.Semaphore is bound to one loop; the UI runs a loop per turn).
+    """
+
+    def __init__(self, limit: int):
+        self._lock = threading.Lock()
+        self._available = limit
+        self._waiters = deque()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._available > 0:
+                self._available -= 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._available > 0:
+                self._available -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(("sync", event))
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        with self._lock:
+            if self._available > 0:
+                self._available -= 1
+                return
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            waiter = ("async", loop, future)
+            self._waiters.append(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # release() picked us. If the future was cancelled first, the
+            # scheduled _grant passes the slot on; if _grant already ran, we hold it.
+            if not future.cancelled():
+                self.release()
+            raise
+
+    def _grant(self, future) -> None:
+        """
+        Runs on the waiter's loop; the only place a slot handed to a cancelled waiter is passed on.
+        """
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._available += 1
+                return
+            waiter = self._waiters.popleft()
+
+        if waiter[0] == "sync":
+            waiter[1].set()
+            return
+
+        try:
+            waiter[1].call_soon_threadsafe(self._grant, waiter[2])
+        except RuntimeError:
+            # The waiter's loop is closed - nobody will take the slot
+            self.release()
+
+class TokenBucket:
+    """
+    Rate limiter: `rate` units per second, bursts up to `capacity`.
+    reserve() books the units and returns how long the caller must wait.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+class LatencyStats:
+    """
+    Per-agent latency histogram plus a window of recent samples for percentiles.
+    """
+
+    def __init__(self, window: int = 500):
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.recent = deque(maxlen=window)
+        self.recent_hedged = deque(maxlen=window)
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, hedged: bool = False) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self.buckets[bisect_left(HISTOGRAM_BOUNDS, ms)] += 1
+            self.recent.append(seconds)
+            self.recent_hedged.append(hedged)
+
+    def hedged_share(self) -> float:
+        """
+        Share of the recent window's calls that sent a hedge.
+        """
+        with self._lock:
+            return sum(self.recent_hedged) / len(self.recent_hedged) if self.recent_hedged else 0.0
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if not self.recent:
+                return None
+            ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        histogram = {f"<={b}ms": n for b, n in zip(HISTOGRAM_BOUNDS, self.buckets)}
+        histogram[f">{HISTOGRAM_BOUNDS[-1]}ms"] = self.buckets[-1]
+        return {
+            "samples": len(self.recent),
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "histogram": histogram,
+            **dict(self.counters)
+        }
+
+class LLMGateway:
+    """
+    Shared admission control for one model: concurrency limit, request and
+    token rate limits, retries, hedging and per-agent latency stats.
+    """
+
+    def __init__(self, model: str, max_concurrency: int = MAX_CONCURRENCY,
+                 requests_per_minute: float = REQUESTS_PER_MINUTE, tokens_per_minute: float = TOKENS_PER_MINUTE,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.model = model
+        self.limiter = ConcurrencyLimiter(max_concurrency)
+        self.requests = TokenBucket(requests_per_minute / 60.0, max(1.0, requests_per_minute / 6))
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, max(1.0, tokens_per_minute / 6))
+        self.max_attempts = max_attempts
+        self.stats = defaultdict(LatencyStats)
+
+    def _admission_delay(self, messages) -> float:
+        prompt_tokens = sum(message_tokens(m) for m in messages) if isinstance(messages, list) else 0
+        return max(self.requests.reserve(1), self.tokens.reserve(prompt_tokens))
+
+    # Sync path - used by invoke()
+
+    def call(self, agent: str, fn, messages) -> Any:
+
+        stats = self.stats[agent]
+        for attempt in range(1, self.max_attempts + 1):
+            time.sleep(self._admission_delay(messages))
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result = fn()
+                stats.observe(time.perf_counter() - start)
+                return result
+            except Exception as e:
+                stats.count("errors")
+                if attempt == self.max_attempts or not is_retryable(e):
+                    raise
+                stats.count("retries")
+                delay = backoff_delay(attempt, e)
+            finally:
+                self.limiter.release()
+            time.sleep(delay)
+
+    # Async path - used by ainvoke()
+
+    async def _attempt(self, agent: str, make_call, messages, hedge: bool) -> Any:
+
+        stats = self.stats[agent]
+        await asyncio.sleep(self._admission_delay(messages))
+        await self.limiter.acquire_async()
+        start = time.perf_counter()
+
+        try:
+            primary = asyncio.ensure_future(make_call(True))
+            deadline = stats.percentile(HEDGE_PERCENTILE) if hedge and len(stats.recent) >= HEDGE_MIN_SAMPLES else None
+            hedged = False
+
+            # Hedges are capped against the same window the deadline comes from
+            if deadline is None or stats.hedged_share() >= HEDGE_MAX_RATIO:
+                result = await primary
+            else:
+                done, _ = await asyncio.wait({primary}, timeout=deadline)
+                if done or not self.limiter.try_acquire():
+                    result = await primary
+                else:
+                    hedged = True
+                    stats.count("hedges")
+                    backup = asyncio.ensure_future(make_call(False))
+                    try:
+                        result = await self._first_success(primary, backup, stats)
+                    finally:
+                        self.limiter.release()
+
+            stats.observe(time.perf_counter() - start, hedged)
+            return result
+        finally:
+            self.limiter.release()
+
+    @staticmethod
+    async def _first_success(primary, backup, stats) -> Any:
+
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if task is backup:
+                        stats.count("hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    async def acall(self, agent: str, make_call, messages, hedge: bool = False) -> Any:
+        """
+        make_call(primary: bool) -> awaitable. The hedge copy is made with primary=False.
+        """
+        stats = self.stats[agent]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await self._attempt(agent, make_call, messages, hedge)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.count("errors")
+                if attempt == self.max_attempts or not is_retryable(e):
+                    raise
+                stats.count("retries")
+                await asyncio.sleep(backoff_delay(attempt, e))
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {agent: stats.snapshot() for agent, stats in self.stats.items()}
+
+class GatewayChatModel:
+    """
+    Routes a chat model's (or tool-bound runnable's) calls through a gateway.
+    """
+
+    def __init__(self, llm: Any, agent: str, gateway: LLMGateway, hedge: Optional[bool] = None):
+        self.llm = llm
+        self.agent = agent
+        self.gateway = gateway
+        self.hedge = agent in HEDGE_AGENTS if hedge is None else hedge
+
+    def _span(self):
+        return span(f"llm.{self.agent}", {"llm.model": self.gateway.model, "llm.agent": self.agent}, kind="CLIENT")
+
+    def invoke(self, messages, config=None, **kwargs):
+        with self._span() as current:
+            response = self.gateway.call(self.agent, lambda: self.llm.invoke(messages, config, **kwargs), messages)
+            record_llm_usage(current, response)
+        return response
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+
+        def make_call(primary: bool):
+            if primary:
+                return self.llm.ainvoke(messages, config, **kwargs)
+            # The hedge copy runs without callbacks so it never streams duplicate tokens
+            return self.llm.ainvoke(messages, {**(config or {}), "callbacks": []}, **kwargs)
+
+        with self._span() as current:
+            response = await self.gateway.acall(self.agent, make_call, messages, self.hedge)
+            record_llm_usage(current, response)
+        return response
+
+_gateways: Dict[str, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+def get_gateway(model: str) -> LLMGateway:
+    """
+    One gateway per model name, shared by every agent using that model.
+    """
+    with _gateways_lock:
+        if model not in _gateways:
+            _gateways[model] = LLMGateway(model)
+        return _gateways[model]
+
+def gateway_report() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    with _gateways_lock:
+        gateways = dict(_gateways)
+    return {model: gateway.report() for model, gateway in gateways.items()}
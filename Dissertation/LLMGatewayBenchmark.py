@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+# Spans of thousands of benchmark calls do not belong in the trace file
+os.environ["TRACING"] = "0"
+
+from LLMGateway import GatewayChatModel, LLMGateway
+
+# Fake chat-completions server: rate limits, 5xx and a slow tail
+class HTTPStatusError(Exception):
+
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers
+
+def _start_fake_server(rate_limit: float, error_rate: float, slow_rate: float):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            roll = random.random()
+            if roll < rate_limit:
+                self.send_response(429)
+                self.send_header("Retry-After", "0.2")
+                self.end_headers()
+                return
+            if roll < rate_limit + error_rate:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            time.sleep(random.uniform(1.0, 2.0) if random.random() < slow_rate else random.uniform(0.05, 0.15))
+            body = json.dumps({"choices": [{"message": {"role": "assistant", "content": "ok"}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class _HTTPChatClient:
+    """
+    Minimal chat client for the fake server (stdlib only).
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def invoke(self, messages, config=None, **kwargs):
+        request = urllib.request.Request(self.url, data=json.dumps({"messages": messages}).encode(),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return json.loads(response.read())["choices"][0]["message"]["content"]
+        except urllib.error.HTTPError as e:
+            raise HTTPStatusError(e.code, dict(e.headers)) from None
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return await asyncio.to_thread(self.invoke, messages, config)
+
+def run_benchmark(requests: int = 200, concurrency: int = 8, rate_limit: float = 0.1,
+                  error_rate: float = 0.03, slow_rate: float = 0.05, trials: int = 5):
+
+    server = _start_fake_server(rate_limit, error_rate, slow_rate)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    client = _HTTPChatClient(url)
+    messages = [{"role": "user", "content": "hello"}]
+
+    async def drive(call):
+        # The client blocks a thread per request (and per hedge) - the default
+        # executor (cpu_count + 4 threads) would queue them and distort the tail
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4 * concurrency))
+
+        latencies, failures = [], 0
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one():
+            nonlocal failures
+            async with gate:
+                start = time.perf_counter()
+                try:
+                    await call()
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    failures += 1
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return sorted(latencies), failures
+
+    def pct(values, p):
+        return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+    runs = [("direct", None)]
+    for hedge in (False, True):
+        gateway = LLMGateway("fake", max_concurrency=16, requests_per_minute=6000, tokens_per_minute=1e7)
+        runs.append((f"gateway{' + hedging' if hedge else ''}", GatewayChatModel(client, "bench", gateway, hedge=hedge)))
+
+    print(f"Benchmark: {requests} requests x {trials} trials, {concurrency} in flight, "
+          f"{rate_limit:.0%} 429s, {error_rate:.0%} 503s, {slow_rate:.0%} slow (1-2s); median over trials")
+    for label, model in runs:
+        if model is None:
+            call = lambda: client.ainvoke(messages)
+        else:
+            # Warm up the latency window so the hedge deadline is known
+            asyncio.run(drive(lambda: model.ainvoke(messages)))
+            call = lambda: model.ainvoke(messages)
+
+        rows = []
+        for _ in range(trials):
+            latencies, failures = asyncio.run(drive(call))
+            rows.append((len(latencies), failures, pct(latencies, 0.5), pct(latencies, 0.95), pct(latencies, 0.99)))
+        ok, failed, p50, p95, p99 = (statistics.median(column) for column in zip(*rows))
+
+        line = (f"  {label:<18} ok {ok:5.0f}  failed {failed:3.0f}  "
+                f"p50 {p50:6.0f}ms  p95 {p95:6.0f}ms  p99 {p99:6.0f}ms")
+        if model is not None:
+            counters = model.gateway.stats["bench"].counters
+            line += f"  retries {counters['retries']}  hedges {counters['hedges']} (won {counters['hedge_wins']})"
+        print(line)
+
+    server.shutdown()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM gateway against a local fake server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rate-limit", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--slow", type=float, default=0.05)
+    parser.add_argument("--trials", type=int, default=5)
+    args = parser.parse_args()
+
+    run_benchmark(args.requests, args.concurrency, rate_limit=args.rate_limit, slow_rate=args.slow,
+                  trials=args.trials)
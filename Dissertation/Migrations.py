@@ -0,0 +1,203 @@
+import sqlite3
+from typing import List, Tuple
+
+# Versioned schema migrations for PatientCareDB.
+# PRAGMA user_version records the last applied version; each migration
+# runs in its own transaction together with the version bump.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (
+        1,
+        "Covering index for speciality lookups",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS IDX_DOCTOR_SPECIALITY
+            ON DOCTOR (SPECIALITY, IS_ACTIVE, AVAILABLE_FROM, NAME, QUALIFICATION, AVAILABLE_TO, AVAILABLE_DAYS)
+            """
+        ]
+    ),
+    (
+        2,
+        "Expression index for case-insensitive patient lookup",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS IDX_PATIENT_NAME_LOWER
+            ON PATIENT (LOWER(NAME))
+            """
+        ]
+    ),
+    (
+        3,
+        "Index symptoms by patient",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS IDX_SYMPTOMS_PATIENT
+            ON SYMPTOMS (PATIENT_ID, CREATED_AT)
+            """
+        ]
+    ),
+    (
+        4,
+        "Integer affinity for APPOINTMENT keys",
+        [
+            """
+            CREATE TABLE APPOINTMENT_NEW (
+                "APPOINTMENT_ID"	INTEGER NOT NULL,
+                "PATIENT_ID"		INTEGER NULL,
+                "DOCTOR_ID"			INTEGER NULL,
+                "DATE"				DATE NULL,
+                "TIME"				TIME NULL,
+                "CREATED_AT"	DATETIME DEFAULT CURRENT_TIMESTAMP,
+                "UPDATED_AT"	DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY("APPOINTMENT_ID" AUTOINCREMENT)
+            )
+            """,
+            """
+            INSERT INTO APPOINTMENT_NEW (APPOINTMENT_ID, PATIENT_ID, DOCTOR_ID, DATE, TIME, CREATED_AT, UPDATED_AT)
+            SELECT APPOINTMENT_ID, CAST(PATIENT_ID AS INTEGER), CAST(DOCTOR_ID AS INTEGER), DATE, TIME, CREATED_AT, UPDATED_AT
+            FROM APPOINTMENT
+            """,
+            # Keep the AUTOINCREMENT high-water mark so IDs are never reused. The copy
+            # only creates a sequence row for APPOINTMENT_NEW when APPOINTMENT had rows
+            """
+            UPDATE sqlite_sequence
+            SET seq = (SELECT seq FROM sqlite_sequence WHERE name = 'APPOINTMENT')
+            WHERE name = 'APPOINTMENT_NEW'
+            AND EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'APPOINTMENT')
+            """,
+            """
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT 'APPOINTMENT_NEW', seq FROM sqlite_sequence
+            WHERE name = 'APPOINTMENT'
+            AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'APPOINTMENT_NEW')
+            """,
+            "DROP TABLE APPOINTMENT",
+            "ALTER TABLE APPOINTMENT_NEW RENAME TO APPOINTMENT",
+            """
+            CREATE INDEX IF NOT EXISTS IDX_APPOINTMENT_DOCTOR_SLOT
+            ON APPOINTMENT (DOCTOR_ID, DATE, TIME)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS IDX_APPOINTMENT_PATIENT
+            ON APPOINTMENT (PATIENT_ID)
+            """
+        ]
+    ),
+    (
+        5,
+        "Track DOCTOR changes through UPDATED_AT",
+        [
+            """
+            CREATE INDEX IF NOT EXISTS IDX_DOCTOR_UPDATED_AT
+            ON DOCTOR (UPDATED_AT)
+            """,
+            # Millisecond timestamps so back-to-back edits still change MAX(UPDATED_AT)
+            """
+            CREATE TRIGGER IF NOT EXISTS TRG_DOCTOR_UPDATED_AT
+            AFTER UPDATE ON DOCTOR
+            WHEN NEW.UPDATED_AT IS OLD.UPDATED_AT
+            BEGIN
+                UPDATE DOCTOR
+                SET UPDATED_AT = STRFTIME('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE DOCTOR_ID = NEW.DOCTOR_ID;
+            END
+            """
+        ]
+    ),
+    (
+        6,
+        "Full-text index over symptom history",
+        [
+            # Contentless: text stays in SYMPTOMS, the index carries a patient token
+            # so MATCH intersects one patient's postings instead of filtering afterwards
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS SYMPTOMS_FTS
+            USING fts5(PATIENT_KEY, SYMPTOMS, content='', tokenize='porter unicode61')
+            """,
+            """
+            INSERT INTO SYMPTOMS_FTS (rowid, PATIENT_KEY, SYMPTOMS)
+            SELECT SYMPTOM_ID, 'p' || PATIENT_ID, SYMPTOMS
+            FROM SYMPTOMS
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TRG_SYMPTOMS_FTS_INSERT
+            AFTER INSERT ON SYMPTOMS
+            BEGIN
+                INSERT INTO SYMPTOMS_FTS (rowid, PATIENT_KEY, SYMPTOMS)
+                VALUES (NEW.SYMPTOM_ID, 'p' || NEW.PATIENT_ID, NEW.SYMPTOMS);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TRG_SYMPTOMS_FTS_DELETE
+            AFTER DELETE ON SYMPTOMS
+            BEGIN
+                INSERT INTO SYMPTOMS_FTS (SYMPTOMS_FTS, rowid, PATIENT_KEY, SYMPTOMS)
+                VALUES ('delete', OLD.SYMPTOM_ID, 'p' || OLD.PATIENT_ID, OLD.SYMPTOMS);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS TRG_SYMPTOMS_FTS_UPDATE
+            AFTER UPDATE ON SYMPTOMS
+            BEGIN
+                INSERT INTO SYMPTOMS_FTS (SYMPTOMS_FTS, rowid, PATIENT_KEY, SYMPTOMS)
+                VALUES ('delete', OLD.SYMPTOM_ID, 'p' || OLD.PATIENT_ID, OLD.SYMPTOMS);
+                INSERT INTO SYMPTOMS_FTS (rowid, PATIENT_KEY, SYMPTOMS)
+                VALUES (NEW.SYMPTOM_ID, 'p' || NEW.PATIENT_ID, NEW.SYMPTOMS);
+            END
+            """
+        ]
+    ),
+]
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply all pending migrations and return the resulting schema version.
+    Expects an autocommit connection (isolation_level=None).
+    """
+    applied = 0
+
+    for version, description, statements in MIGRATIONS:
+
+        # Re-read inside the write lock so concurrent processes apply each step once
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            for statement in statements:
+                conn.execute(statement)
+
+            conn.execute(f"PRAGMA user_version={version}")
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+            applied += 1
+            print(f"Migration: applied {version} - {description}")
+
+    # Refresh planner statistics for the new indexes
+    if applied:
+        conn.execute("ANALYZE")
+
+    return get_version(conn)
+
+if __name__ == "__main__":
+
+    import argparse
+
+    from Database import get_db_path
+
+    parser = argparse.ArgumentParser(description="PatientCareDB migrations")
+    parser.add_argument("command", choices=["migrate", "status"])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(get_db_path(), isolation_level=None)
+    if args.command == "migrate":
+        migrate(conn)
+        # Same journal mode the connection layer sets, so opening the file later leaves it as is
+        conn.execute("PRAGMA journal_mode=WAL")
+    print(f"Schema version: {get_version(conn)} of {MIGRATIONS[-1][0]}")
@@ -0,0 +1,169 @@
+import os
+import sqlite3
+import tempfile
+import time
+
+from Migrations import migrate
+
+# Query plans and latency before/after migration on a generated DB
+BENCHMARK_QUERIES = {
+    "find_available_doctors": (
+        """
+        SELECT DOCTOR_ID, NAME, QUALIFICATION, AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS
+        FROM DOCTOR
+        WHERE SPECIALITY = ? AND IS_ACTIVE = 1
+        ORDER BY AVAILABLE_FROM LIMIT 5
+        """,
+        ("Cardiology",)
+    ),
+    "get_patient_details": (
+        "SELECT PATIENT_ID FROM PATIENT WHERE LOWER(NAME)=LOWER(?)",
+        ("Patient 4242",)
+    ),
+    "get_symptom_details": (
+        "SELECT SYMPTOMS FROM SYMPTOMS WHERE PATIENT_ID = ?",
+        (4242,)
+    ),
+    "doctor_slot_lookup": (
+        "SELECT APPOINTMENT_ID FROM APPOINTMENT WHERE DOCTOR_ID = ? AND DATE = ? AND TIME = ?",
+        (42, "2026-02-16", "10:00")
+    ),
+}
+
+# Tables as first shipped, before any migration - the shipped PatientCareDB.db is migrated
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE DOCTOR (
+        DOCTOR_ID INTEGER, SPECIALITY TEXT NOT NULL, NAME TEXT NOT NULL,
+        GENDER TEXT CHECK (GENDER IN ('M', 'F', 'O')), QUALIFICATION TEXT,
+        AVAILABLE_FROM TIME, AVAILABLE_TO TIME, AVAILABLE_DAYS TEXT, IS_ACTIVE INTEGER DEFAULT 1,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(DOCTOR_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE PATIENT (
+        PATIENT_ID INTEGER, NAME TEXT NOT NULL, AGE INTEGER, GENDER TEXT, MOBILE INTEGER, ADDRESS TEXT,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(PATIENT_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE SYMPTOMS (
+        SYMPTOM_ID INTEGER NOT NULL, PATIENT_ID INTEGER NOT NULL, SYMPTOMS TEXT NULL,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(SYMPTOM_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE APPOINTMENT (
+        APPOINTMENT_ID INTEGER NOT NULL, PATIENT_ID TEXT NULL, DOCTOR_ID TEXT NULL, DATE DATE NULL, TIME TIME NULL,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(APPOINTMENT_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE MEDICINE_ORDER (
+        ORDER_ID INTEGER NOT NULL, MEDICINE TEXT NULL, DOSAGE INTEGER NOT NULL, QUANTITY TEXT NULL,
+        SHIPPING_ADDRESS TEXT NULL,
+        PRIMARY KEY(ORDER_ID AUTOINCREMENT)
+    )
+    """
+]
+
+SPECIALITIES = [
+    "General Medicine", "Cardiology", "Orthopedics", "Gynecology", "Pediatrics",
+    "Dermatology", "Neurology", "Psychiatry", "ENT", "Ophthalmology",
+    "Pulmonology", "Gastroenterology", "Endocrinology", "Nephrology"
+]
+
+def _build_benchmark_db(path: str, n_doctors: int, n_patients: int, n_symptoms: int):
+
+    import random
+
+    rng = random.Random(42)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    for ddl in BASELINE_SCHEMA:
+        conn.execute(ddl)
+
+    conn.execute("BEGIN")
+    conn.executemany(
+        """
+        INSERT INTO DOCTOR (SPECIALITY, NAME, QUALIFICATION, AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS)
+        VALUES (?, ?, 'MBBS, MD', ?, ?, 'Mon,Wed,Fri')
+        """,
+        (
+            (rng.choice(SPECIALITIES), f"Dr. Doctor {i}", f"{9 + i % 5:02d}:00", f"{14 + i % 5:02d}:00")
+            for i in range(n_doctors)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO PATIENT (NAME) VALUES (?)",
+        ((f"Patient {i}",) for i in range(n_patients))
+    )
+    conn.executemany(
+        "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (?, ?)",
+        ((rng.randint(1, n_patients), "fever") for _ in range(n_symptoms))
+    )
+    conn.executemany(
+        "INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (?, ?, '2026-02-16', '10:00')",
+        ((str(rng.randint(1, n_patients)), str(rng.randint(1, n_doctors))) for _ in range(n_doctors))
+    )
+    conn.execute("COMMIT")
+
+    return conn
+
+def _measure(conn: sqlite3.Connection, repeat: int):
+
+    results = {}
+    for name, (query, params) in BENCHMARK_QUERIES.items():
+        plan = [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(query, params).fetchall()
+        elapsed = (time.perf_counter() - start) / repeat
+
+        results[name] = (elapsed, plan)
+
+    return results
+
+def run_benchmark(n_doctors=100_000, n_patients=1_000_000, n_symptoms=10_000_000, repeat=20):
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+
+        start = time.perf_counter()
+        conn = _build_benchmark_db(path, n_doctors, n_patients, n_symptoms)
+        print(f"Benchmark: built {n_doctors} doctors, {n_patients} patients, "
+              f"{n_symptoms} symptoms in {time.perf_counter() - start:.1f}s")
+
+        before = _measure(conn, repeat)
+
+        start = time.perf_counter()
+        migrate(conn)
+        print(f"Benchmark: migrations applied in {time.perf_counter() - start:.1f}s")
+
+        after = _measure(conn, repeat)
+        conn.close()
+
+    for name in BENCHMARK_QUERIES:
+        print(f"\n{name}")
+        print(f"  before: {before[name][0] * 1000:10.3f} ms  plan: {'; '.join(before[name][1])}")
+        print(f"  after:  {after[name][0] * 1000:10.3f} ms  plan: {'; '.join(after[name][1])}")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PatientCareDB query plans and latency before/after migration")
+    parser.add_argument("--doctors", type=int, default=100_000)
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--symptoms", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.doctors, args.patients, args.symptoms)
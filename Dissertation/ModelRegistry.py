@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Features import FEATURES
+from VitalsGenerator import generate
+
+# Artifacts: anomaly-<version>.joblib + anomaly-<version>.json, LATEST names the live one
+MODEL_DIR = os.getenv("ANOMALY_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+LATEST_FILE = "LATEST"
+PREFIX = "anomaly"
+
+# Training defaults
+BASELINE_ROWS = 50000
+CONTAMINATION = 0.01
+N_ESTIMATORS = 100
+
+VERIFY_HASH = os.getenv("MODEL_VERIFY", "1") == "1"
+WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_SECONDS", "10"))
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _write_atomic(path: str, text: str) -> None:
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+def train_model(rows: int = BASELINE_ROWS, seed: int = 0, contamination: float = CONTAMINATION,
+                n_estimators: int = N_ESTIMATORS) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Fit the IsolationForest on a vectorized, seeded baseline - same seed, same model.
+    """
+    from sklearn.ensemble import IsolationForest
+
+    model = IsolationForest(n_estimators=n_estimators, contamination=contamination, random_state=seed)
+    model.fit(generate(rows, "baseline", seed=seed))
+
+    params = {"rows": rows, "seed": seed, "contamination": contamination, "n_estimators": n_estimators}
+
+    return model, params
+
+def save_model(model: Any, params: Dict[str, Any], model_dir: str = MODEL_DIR, promote: bool = True) -> Dict[str, Any]:
+    """
+    Write the artifact under its content hash with a manifest; optionally make it LATEST.
+    """
+    import joblib
+    import sklearn
+
+    os.makedirs(model_dir, exist_ok=True)
+
+    # Uncompressed, so the tree arrays can be memory-mapped on load
+    tmp = os.path.join(model_dir, f".{PREFIX}-{os.getpid()}.joblib")
+    joblib.dump(model, tmp)
+    sha256 = _sha256(tmp)
+    version = sha256[:12]
+
+    artifact = os.path.join(model_dir, f"{PREFIX}-{version}.joblib")
+    if os.path.exists(artifact):
+        os.remove(tmp)
+    else:
+        os.replace(tmp, artifact)
+
+    manifest = {
+        "version": version,
+        "sha256": sha256,
+        "artifact": os.path.basename(artifact),
+        "features": FEATURES,
+        "model": type(model).__name__,
+        "params": params,
+        "sklearn_version": sklearn.__version__,
+        "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+    }
+    _write_atomic(os.path.join(model_dir, f"{PREFIX}-{version}.json"), json.dumps(manifest, indent=2))
+
+    if promote:
+        promote_model(version, model_dir)
+
+    return manifest
+
+def promote_model(version: str, model_dir: str = MODEL_DIR) -> None:
+    if not os.path.exists(os.path.join(model_dir, f"{PREFIX}-{version}.json")):
+        raise FileNotFoundError(f"No model {version} in {model_dir}")
+    _write_atomic(os.path.join(model_dir, LATEST_FILE), version + "\n")
+
+def latest_version(model_dir: str = MODEL_DIR) -> Optional[str]:
+    try:
+        with open(os.path.join(model_dir, LATEST_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def list_models(model_dir: str = MODEL_DIR) -> List[Dict[str, Any]]:
+    manifests = []
+    if os.path.isdir(model_dir):
+        for name in os.listdir(model_dir):
+            if name.startswith(PREFIX) and name.endswith(".json"):
+                with open(os.path.join(model_dir, name), encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+    return sorted(manifests, key=lambda m: m["trained_at"])
+
+def load_model(version: Optional[str] = None, model_dir: str = MODEL_DIR, mmap: bool = True,
+               verify: bool = VERIFY_HASH) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Load an artifact (LATEST by default), checking its hash and feature schema.
+    """
+    import joblib
+
+    version = version or latest_version(model_dir)
+    if version is None:
+        raise FileNotFoundError(f"No model promoted in {model_dir}")
+
+    with open(os.path.join(model_dir, f"{PREFIX}-{version}.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest["features"] != FEATURES:
+        raise ValueError(f"Model {version} expects features {manifest['features']}, monitor sends {FEATURES}")
+
+    artifact = os.path.join(model_dir, manifest["artifact"])
+    if verify and _sha256(artifact) != manifest["sha256"]:
+        raise ValueError(f"Model {version} artifact does not match its content hash")
+
+    try:
+        model = joblib.load(artifact, mmap_mode="r" if mmap else None)
+    except (ValueError, TypeError):
+        # Some estimators refuse read-only arrays - load into memory instead
+        model = joblib.load(artifact)
+
+    return model, manifest
+
+def load_or_train(model_dir: str = MODEL_DIR) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Startup: load the promoted model; train and promote one only if there is none.
+    """
+    if latest_version(model_dir) is None:
+        print(f"Model: none in {model_dir}, training one (run `python ModelRegistry.py train` offline)")
+        model, params = train_model()
+        save_model(model, params, model_dir)
+
+    model, manifest = load_model(model_dir=model_dir)
+    print(f"Model: loaded {manifest['model']} {manifest['version']} trained {manifest['trained_at']}")
+
+    return model, manifest
+
+class ModelWatcher:
+    """
+    Polls LATEST and hands a newly promoted model to on_swap(model, manifest),
+    so the MQTT loop keeps running through a model update.
+    """
+
+    def __init__(self, on_swap: Callable[[Any, Dict[str, Any]], None], current: Optional[str] = None,
+                 model_dir: str = MODEL_DIR, interval: float = WATCH_INTERVAL):
+        self.on_swap = on_swap
+        self.current = current or latest_version(model_dir)
+        self.model_dir = model_dir
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            version = latest_version(self.model_dir)
+            if version is None or version == self.current:
+                continue
+            try:
+                model, manifest = load_model(version, self.model_dir)
+            except (OSError, ValueError) as e:
+                print(f"Model: not swapping to {version}: {e}")
+                self.current = version
+                continue
+            self.on_swap(model, manifest)
+            self.current = version
+            print(f"Model: swapped to {version}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Anomaly model registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train = sub.add_parser("train", help="train, save and promote a model")
+    train.add_argument("--rows", type=int, default=BASELINE_ROWS)
+    train.add_argument("--seed", type=int, default=0)
+    train.add_argument("--contamination", type=float, default=CONTAMINATION)
+    train.add_argument("--estimators", type=int, default=N_ESTIMATORS)
+    train.add_argument("--no-promote", action="store_true")
+
+    sub.add_parser("list", help="list saved models")
+    promote = sub.add_parser("promote", help="make a saved model the live one")
+    promote.add_argument("version")
+
+    args = parser.parse_args()
+
+    if args.command == "train":
+        model, params = train_model(args.rows, args.seed, args.contamination, args.estimators)
+        manifest = save_model(model, params, promote=not args.no_promote)
+        print(f"Saved model {manifest['version']}{'' if args.no_promote else ' (promoted)'}")
+    elif args.command == "list":
+        live = latest_version()
+        for m in list_models():
+            print(f"{'*' if m['version'] == live else ' '} {m['version']}  {m['trained_at']}  {m['params']}")
+    else:
+        promote_model(args.version)
+        print(f"Promoted {args.version}")
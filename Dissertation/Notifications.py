@@ -0,0 +1,201 @@
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from Tracing import current_span, span
+
+# WhatsApp sandbox sender and default recipient
+FROM_NUMBER = os.getenv("TWILIO_FROM", "whatsapp:+14155238886")
+TO_NUMBER = os.getenv("TWILIO_TO", "whatsapp:+919163040468")
+
+# Delivery settings
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "2"))
+MAX_ATTEMPTS = 4
+BACKOFF_SECONDS = 1.0
+MAX_QUEUE = 10000
+
+# Twilio refused the request, so no message was created and a retry cannot double-send
+RETRY_STATUSES = {429, 503}
+
+# Longest wait at interpreter exit for queued notifications
+SHUTDOWN_TIMEOUT = 10.0
+
+_twilio_client = None
+_twilio_lock = threading.Lock()
+
+def twilio_send(body: str, to: str) -> str:
+    """
+    Send one WhatsApp message through Twilio, returns the message SID.
+    """
+    global _twilio_client
+
+    if _twilio_client is None:
+        with _twilio_lock:
+            if _twilio_client is None:
+                from twilio.rest import Client
+                _twilio_client = Client(os.getenv("TWILIO_SID"), os.getenv("TWILIO_TOKEN"))
+
+    message = _twilio_client.messages.create(from_=FROM_NUMBER, body=body, to=to)
+
+    return message.sid
+
+def is_safe_to_retry(error: Exception) -> bool:
+    """
+    True only when the message cannot have been created: Twilio answered
+    429/503, or the connection was never made. A read timeout or a dropped
+    connection may follow a successful send, so those are not retried.
+    """
+    if getattr(error, "status", None) in RETRY_STATUSES:
+        return True
+
+    try:
+        from requests.exceptions import ConnectTimeout
+    except ImportError:
+        return False
+
+    return isinstance(error, ConnectTimeout)
+
+class NotificationDispatcher:
+    """
+    Background queue for side-effecting notifications. Graph nodes enqueue
+    and return; worker threads deliver with jittered backoff, retrying only
+    errors `retryable` accepts. inline=True sends on the caller's thread
+    (the old behaviour). Each delivery is a notification.deliver span.
+    """
+
+    def __init__(self, send: Callable[[str, str], Any] = twilio_send, workers: int = NOTIFICATION_WORKERS,
+                 inline: bool = False, retryable: Callable[[Exception], bool] = is_safe_to_retry):
+        self.send = send
+        self.inline = inline
+        self.retryable = retryable
+        self._queue = queue.Queue(maxsize=MAX_QUEUE)
+        self._workers = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+        if not inline:
+            for i in range(workers):
+                worker = threading.Thread(target=self._run, name=f"notification-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+            # Daemon workers would be killed at exit with notifications still queued
+            atexit.register(self.shutdown, timeout=SHUTDOWN_TIMEOUT)
+
+    def dispatch(self, body: str, to: str = TO_NUMBER) -> Dict[str, Any]:
+
+        with self._lock:
+            self._next_id += 1
+            notification_id = self._next_id
+
+        if self.inline:
+            delivered = self._deliver(notification_id, body, to)
+            return {"notification_id": notification_id, "status": "sent" if delivered else "failed"}
+
+        # Full queue, or the workers are shutting down
+        try:
+            if not self._closed:
+                self._queue.put_nowait((notification_id, body, to))
+                return {"notification_id": notification_id, "status": "queued"}
+        except queue.Full:
+            pass
+
+        with self._lock:
+            self.failed += 1
+        current = current_span()
+        if current is not None:
+            current.add("notification.dropped")
+
+        return {"notification_id": notification_id, "status": "dropped"}
+
+    def _deliver(self, notification_id: int, body: str, to: str) -> bool:
+
+        with span("notification.deliver", {"notification.id": notification_id}, kind="CLIENT") as current:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    result = self.send(body, to)
+                except Exception as e:
+                    retry = attempt < MAX_ATTEMPTS and self.retryable(e)
+                    if current is not None:
+                        current.set_attribute("notification.attempts", attempt)
+                        current.set_attribute("notification.error", f"{type(e).__name__}: {e}")
+                    if not retry:
+                        break
+                    with self._lock:
+                        self.retries += 1
+                    time.sleep(BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+                    continue
+
+                with self._lock:
+                    self.sent += 1
+                if current is not None:
+                    current.set_attribute("notification.attempts", attempt)
+                    current.set_attribute("notification.status", "sent")
+                    current.set_attribute("notification.result", str(result))
+                return True
+
+            with self._lock:
+                self.failed += 1
+            if current is not None:
+                current.set_attribute("notification.status", "failed")
+
+        return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(*item)
+            finally:
+                self._queue.task_done()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after the queued notifications are delivered.
+        Later dispatches are dropped; calling it again is a no-op.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        for _ in self._workers:
+            self._queue.put(None)
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for worker in self._workers:
+                worker.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> NotificationDispatcher:
+    """
+    Shared dispatcher for the process.
+    """
+    global _dispatcher
+
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher()
+
+    return _dispatcher
+
+def set_dispatcher(dispatcher: NotificationDispatcher) -> None:
+    global _dispatcher
+    with _dispatcher_lock:
+        _dispatcher = dispatcher
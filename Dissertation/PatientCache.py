@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Cache sizing - entries per cache and seconds before an entry expires
+MAX_ENTRIES = 10000
+TTL_SECONDS = 600.0
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters.
+    on_evict(key, value) runs, outside the lock, for entries dropped by
+    capacity or expiry.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _notify(self, dropped) -> None:
+        if self.on_evict is not None:
+            for key, (value, _) in dropped:
+                self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at >= time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+
+        self._notify([(key, entry)])
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        dropped = []
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                dropped.append(self._data.popitem(last=False))
+                self.evictions += 1
+
+        self._notify(dropped)
+
+    def update(self, key: Hashable, func: Callable[[Any], Any]) -> None:
+        """
+        Replace a cached value with func(value); no-op when the key is not cached.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                self._data[key] = (func(entry[0]), entry[1])
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+# normalized patient name -> PATIENT_ID of known patients
+patient_ids = LRUCache()
+
+# PATIENT_ID -> list of recorded symptoms
+symptom_history = LRUCache()
+
+def normalize_name(name: Optional[str]) -> str:
+    return " ".join((name or "").split()).lower()
+
+def record_new_patient(name: str, patient_id: int) -> None:
+    """
+    Write-through after a PATIENT insert.
+    """
+    patient_ids.put(normalize_name(name), patient_id)
+
+def record_symptoms(patient_id: int, symptoms: str) -> None:
+    """
+    Write-through after a SYMPTOMS insert.
+    """
+    if symptoms is None:
+        return
+    symptom_history.update(patient_id, lambda current: current + [symptoms])
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        "patient_ids": patient_ids.stats(),
+        "symptom_history": symptom_history.stats()
+    }
@@ -0,0 +1,259 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from Tracing import current_span
+
+# Token budget per agent for system prompt + pinned details + history
+AGENT_BUDGETS = {
+    "conversation": int(os.getenv("PROMPT_BUDGET_CONVERSATION", "3000")),
+    "triage": int(os.getenv("PROMPT_BUDGET_TRIAGE", "4000")),
+    "validation": int(os.getenv("PROMPT_BUDGET_VALIDATION", "2500"))
+}
+DEFAULT_BUDGET = 3000
+
+# Older tool results are cut down to this many tokens
+MAX_OLD_TOOL_TOKENS = 300
+
+# Share of the budget the summary of dropped turns may use
+SUMMARY_SHARE = 0.15
+
+# Per-message overhead (role, separators) in chat formats
+MESSAGE_OVERHEAD = 4
+
+# Print tokens before/after for every call (debugging; spans always get the counts)
+LOG_TURNS = os.getenv("PROMPT_BUDGET_LOG", "0") == "1"
+
+# Checkpointer summary message id and first line (see Checkpointer.compact_messages)
+SUMMARY_ID = "conversation-summary"
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+
+# Local tokenizer - tiktoken if installed, otherwise a word-piece estimate
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _encoding = None
+
+_WORD = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# History is re-counted on every call, so counts are memoized per text
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+
+    # ~4 characters per sub-word piece, punctuation on its own
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _WORD.findall(text))
+
+def _fields(message: Any) -> Tuple[str, Any, List[Dict[str, Any]]]:
+    if isinstance(message, dict):
+        return message.get("role"), message.get("content"), message.get("tool_calls") or []
+    return message.type, message.content, getattr(message, "tool_calls", None) or []
+
+def _text(content: Any) -> str:
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+def message_tokens(message: Any) -> int:
+    _, content, tool_calls = _fields(message)
+    tokens = MESSAGE_OVERHEAD + count_tokens(_text(content))
+    if tool_calls:
+        tokens += count_tokens(json.dumps([{"name": c["name"], "args": c["args"]} for c in tool_calls], default=str))
+    return tokens
+
+def _is_tool_result(message: Any) -> bool:
+    return _fields(message)[0] in ("tool",)
+
+def _groups(messages: List[Any]) -> List[List[Any]]:
+    """
+    Split history into units that are kept or dropped together:
+    an AI message with tool calls stays with the tool results that answer it.
+    """
+    groups = []
+    for message in messages:
+        if _is_tool_result(message) and groups:
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+def _shorten_tool_result(message: Any, max_tokens: int) -> Any:
+
+    _, content, _ = _fields(message)
+    text = _text(content)
+    if count_tokens(text) <= max_tokens:
+        return message
+
+    # Rough character cut, then tighten
+    keep = len(text) * max_tokens // max(count_tokens(text), 1)
+    while keep > 0 and count_tokens(text[:keep]) > max_tokens:
+        keep = keep * 9 // 10
+    shortened = text[:keep] + " ... [truncated]"
+
+    if isinstance(message, dict):
+        return {**message, "content": shortened}
+    return message.model_copy(update={"content": shortened})
+
+def _summary_line(message: Any) -> Optional[str]:
+    role, content, _ = _fields(message)
+    if role not in ("human", "user", "ai", "assistant"):
+        return None
+    text = " ".join(_text(content).split())
+    if not text:
+        return None
+    if len(text) > 160:
+        text = text[:157] + "..."
+    return f"{'User' if role in ('human', 'user') else 'Assistant'}: {text}"
+
+def _lines_tokens(lines: List[str]) -> int:
+    return sum(count_tokens(line) + 1 for line in lines)
+
+def _newest_lines(lines: List[str], budget: int) -> List[str]:
+    """
+    The newest lines that fit in budget tokens, oldest first.
+    """
+    selected, used = [], 0
+    for line in reversed(lines):
+        used += count_tokens(line) + 1
+        if used > budget:
+            break
+        selected.append(line)
+    return selected[::-1]
+
+def pinned_details(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Items the agents need regardless of how much history is dropped.
+    """
+    pinned = {}
+
+    if state.get("extracted_entities"):
+        pinned["entities"] = state["extracted_entities"]
+
+    structured = state.get("structured_data") or {}
+    doctor = {k: structured.get(k) for k in ("preferred_doctor_name", "preferred_speciality") if structured.get(k)}
+
+    details = state.get("appointment_details") or {}
+    doctor.update({k: details.get(k) for k in ("doctor_id", "doctor_name", "date", "time") if details.get(k)})
+    if doctor:
+        pinned["doctor"] = doctor
+
+    previous = (state.get("context") or {}).get("previous_conditions")
+    if previous:
+        pinned["previous_conditions"] = previous
+
+    return pinned
+
+# Per-turn metrics: tokens that would have been sent vs tokens sent
+_metrics = defaultdict(lambda: deque(maxlen=1000))
+_metrics_lock = threading.Lock()
+
+def _record(agent: str, before: int, after: int, dropped: int) -> None:
+    with _metrics_lock:
+        _metrics[agent].append((before, after, dropped))
+
+    # Summed on the node span, like the llm.* counters
+    current = current_span()
+    if current is not None:
+        current.set_attribute("prompt.agent", agent)
+        current.add("prompt.tokens_before", before)
+        current.add("prompt.tokens_after", after)
+        current.add("prompt.messages_summarized", dropped)
+
+    if LOG_TURNS:
+        print(f"Prompt tokens [{agent}]: {before} -> {after} ({dropped} messages summarized)")
+
+def metrics_summary() -> Dict[str, Dict[str, float]]:
+    summary = {}
+    with _metrics_lock:
+        for agent, rows in _metrics.items():
+            if not rows:
+                continue
+            before = sum(r[0] for r in rows)
+            after = sum(r[1] for r in rows)
+            summary[agent] = {
+                "calls": len(rows),
+                "avg_tokens_before": before / len(rows),
+                "avg_tokens_after": after / len(rows),
+                "max_tokens_after": max(r[1] for r in rows),
+                "saved_pct": 100.0 * (before - after) / before if before else 0.0,
+                "messages_dropped": sum(r[2] for r in rows)
+            }
+    return summary
+
+def fit_prompt(agent: str, system_prompt: str, state: Dict[str, Any],
+               budget: Optional[int] = None) -> List[Any]:
+    """
+    [system prompt + pinned details (+ summary of dropped turns)] + the most
+    recent history that fits the agent's token budget.
+    """
+    budget = budget or AGENT_BUDGETS.get(agent, DEFAULT_BUDGET)
+    messages = list(state.get("messages") or [])
+
+    pinned = pinned_details(state)
+    system_text = system_prompt
+    if pinned:
+        system_text += "\n\nKnown details (authoritative): " + json.dumps(pinned, default=str)
+
+    # A checkpointer summary is folded into the prompt summary, not kept as history
+    earlier = []
+    if messages and not isinstance(messages[0], dict) and messages[0].id == SUMMARY_ID:
+        earlier = [line for line in _text(messages[0].content).splitlines() if line.strip() and line != SUMMARY_HEADER]
+        messages = messages[1:]
+
+    before = count_tokens(system_prompt) + MESSAGE_OVERHEAD + sum(message_tokens(m) for m in messages)
+
+    groups = _groups(messages)
+
+    # Only the latest tool round keeps its full output, even after a plain reply
+    tool_rounds = [i for i, group in enumerate(groups) if any(_is_tool_result(m) for m in group)]
+    for group in groups[:tool_rounds[-1] if tool_rounds else 0]:
+        for i, message in enumerate(group):
+            if _is_tool_result(message):
+                group[i] = _shorten_tool_result(message, MAX_OLD_TOOL_TOKENS)
+
+    summary_budget = int(budget * SUMMARY_SHARE)
+    available = budget - count_tokens(system_text) - MESSAGE_OVERHEAD - summary_budget
+
+    # Newest groups first; the latest group is always kept
+    kept = []
+    used = 0
+    for index in range(len(groups) - 1, -1, -1):
+        size = sum(message_tokens(m) for m in groups[index])
+        if kept and used + size > available and tool_rounds and index == tool_rounds[-1]:
+            # Latest tool round shortened rather than dropped when it does not fit whole
+            groups[index] = [_shorten_tool_result(m, MAX_OLD_TOOL_TOKENS) if _is_tool_result(m) else m
+                             for m in groups[index]]
+            size = sum(message_tokens(m) for m in groups[index])
+        if kept and used + size > available:
+            break
+        kept.insert(0, groups[index])
+        used += size
+
+    dropped = [m for group in groups[:len(groups) - len(kept)] for m in group]
+
+    if dropped or earlier:
+        recent = [line for line in (_summary_line(m) for m in dropped) if line]
+
+        # The checkpointer summary is all the compacted history: up to half the share is
+        # kept for it, so newer dropped turns cannot crowd it out; newest lines win in each
+        reserved = min(_lines_tokens(earlier), summary_budget // 2)
+        recent = _newest_lines(recent, summary_budget - reserved)
+        earlier = _newest_lines(earlier, summary_budget - _lines_tokens(recent))
+
+        summary = "\n".join(earlier + recent)
+        if summary:
+            system_text += "\n\nEarlier conversation (summarized):\n" + summary
+
+    prompt = [{"role": "system", "content": system_text}] + [m for group in kept for m in group]
+
+    after = count_tokens(system_text) + MESSAGE_OVERHEAD + used
+    _record(agent, before, after, len(dropped))
+
+    return prompt
@@ -0,0 +1,53 @@
+import json
+import os
+import time
+
+os.environ["TRACING"] = "0"
+
+from PromptBudget import AGENT_BUDGETS, _encoding, fit_prompt, metrics_summary
+
+# A long synthetic booking conversation with tool rounds
+def run_benchmark(turns: int = 60):
+
+    system_prompt = "You are a clinical conversational AI assistant. " * 40
+    tool_output = json.dumps([
+        {"doctor_id": i, "name": f"Dr. Doctor {i}", "speciality": "Cardiology",
+         "available_from": "09:00", "available_to": "17:00", "available_days": "Mon,Tue,Wed,Thu,Fri"}
+        for i in range(25)
+    ])
+
+    state = {
+        "messages": [],
+        "extracted_entities": {"patient_name": "Ravi", "symptoms": ["chest pain"], "preferred_date": "20-Oct-26"},
+        "appointment_details": {"doctor_id": 7, "doctor_name": "Dr. Doctor 7"}
+    }
+
+    elapsed = 0.0
+    for turn in range(turns):
+        state["messages"].append({"role": "user", "content": f"Turn {turn}: I still have chest pain, can we find a slot?"})
+        if turn % 3 == 0:
+            state["messages"].append({"role": "assistant", "content": "",
+                                      "tool_calls": [{"name": "find_available_doctors", "args": {"speciality": "Cardiology"}, "id": f"c{turn}"}]})
+            state["messages"].append({"role": "tool", "content": tool_output, "tool_call_id": f"c{turn}"})
+        state["messages"].append({"role": "assistant", "content": "Here are the cardiologists available. " * 5})
+
+        for agent in AGENT_BUDGETS:
+            start = time.perf_counter()
+            fit_prompt(agent, system_prompt, state)
+            elapsed += time.perf_counter() - start
+
+    print(f"Benchmark: {turns} turns, tokenizer={'tiktoken' if _encoding else 'local estimate'}")
+    for agent, row in metrics_summary().items():
+        print(f"  {agent:<13} avg {row['avg_tokens_before']:8.0f} -> {row['avg_tokens_after']:6.0f} tokens/turn "
+              f"(max {row['max_tokens_after']}, budget {AGENT_BUDGETS[agent]}, saved {row['saved_pct']:.0f}%)")
+    print(f"  windowing overhead: {elapsed / (turns * len(AGENT_BUDGETS)) * 1000:.2f}ms per call")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prompt token budgeting benchmark")
+    parser.add_argument("--turns", type=int, default=60)
+    args = parser.parse_args()
+
+    run_benchmark(args.turns)
@@ -0,0 +1,716 @@
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Database import transaction
+from Snapshot import get_read_connection
+from Schedule import overlaps_booking, slot_problem
+
+# Storage backend: "sqlite" (PatientCareDB.db) or "postgres"
+BACKEND = os.getenv("PATIENT_CARE_DB_BACKEND", "sqlite")
+
+# Postgres connection settings
+PG_DSN = os.getenv("PATIENT_CARE_PG_DSN", "postgresql://localhost/patientcare")
+PG_POOL_MIN = int(os.getenv("PATIENT_CARE_PG_POOL_MIN", "2"))
+PG_POOL_MAX = int(os.getenv("PATIENT_CARE_PG_POOL_MAX", "20"))
+
+def _check_slot(doctor: Optional[tuple], taken: List[Tuple[str]], db_date: str,
+                slot_time: str) -> Optional[Dict[str, Any]]:
+    """
+    Booking result when the slot cannot be booked, else None. doctor is
+    (AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS); taken the doctor's booked TIMEs that day.
+    """
+    if doctor is None:
+        return {"status": "unavailable", "reason": "no active doctor with this ID"}
+
+    problem = slot_problem(doctor[0], doctor[1], doctor[2], db_date, slot_time)
+    if problem:
+        return {"status": "unavailable", "reason": problem}
+
+    if overlaps_booking(taken, slot_time):
+        return {"status": "conflict"}
+
+    return None
+
+def _screen_bookings(rows: List[tuple], load_doctor: Callable[[Any], Optional[tuple]],
+                     load_taken: Callable[[Any, str], List[Tuple[str]]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    _check_slot for each (patient_id, patient_name, doctor_id, db_date, slot_time, symptoms)
+    row, in order: None when it can be booked. Rows accepted earlier count as booked
+    for later ones; each doctor and doctor-day is loaded once.
+    """
+    doctors = {}
+    taken = {}
+    results = []
+
+    for row in rows:
+        doctor_id, db_date, slot_time = row[2], row[3], row[4]
+        if doctor_id not in doctors:
+            doctors[doctor_id] = load_doctor(doctor_id)
+        if (doctor_id, db_date) not in taken:
+            taken[doctor_id, db_date] = list(load_taken(doctor_id, db_date))
+
+        rejected = _check_slot(doctors[doctor_id], taken[doctor_id, db_date], db_date, slot_time)
+        if rejected is None:
+            taken[doctor_id, db_date].append((slot_time,))
+        results.append(rejected)
+
+    return results
+
+def symptom_terms(text: str) -> List[str]:
+    """
+    Lower-cased word tokens of a free-text complaint, for full-text queries.
+    """
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+class PatientCareRepository(ABC):
+    """
+    Storage interface used by Tools, DoctorDirectory, Availability and BulkLoad.
+    Doctor rows are (DOCTOR_ID, SPECIALITY, NAME, QUALIFICATION,
+    AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS); dates are 'YYYY-MM-DD'
+    strings and times 'HH:MM'.
+    """
+
+    @abstractmethod
+    def doctor_version(self) -> Tuple[Any, int]:
+        ...
+
+    @abstractmethod
+    def load_active_doctors(self) -> List[tuple]:
+        ...
+
+    @abstractmethod
+    def get_patient_id(self, name: str) -> int:
+        ...
+
+    @abstractmethod
+    def get_symptoms(self, patient_id: int) -> List[str]:
+        ...
+
+    @abstractmethod
+    def search_symptoms(self, patient_id: int, complaint: str, k: int,
+                        since: Optional[str] = None, until: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Top-k (SYMPTOMS, CREATED_AT) of a patient ranked by relevance to the complaint.
+        """
+
+    @abstractmethod
+    def recent_symptoms(self, patient_id: int, since: Optional[str], until: Optional[str],
+                        limit: int) -> List[Tuple[str, str]]:
+        """
+        Newest-first (SYMPTOMS, CREATED_AT) within a CREATED_AT window.
+        """
+
+    @abstractmethod
+    def booked_times(self, doctor_id: int, from_date: str, to_date: str) -> List[Tuple[str, str]]:
+        ...
+
+    @abstractmethod
+    def book_appointment(self, patient_id: int, patient_name: str, doctor_id: int, db_date: str,
+                         slot_time: str, symptoms: Optional[str]) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def insert_medicine_order(self, medicine: str, dosage: str, quantity: str, shipping_address: str) -> int:
+        ...
+
+    @abstractmethod
+    def bulk_book_appointments(self, rows: List[tuple], validate: bool = True
+                               ) -> Tuple[List[Optional[int]], List[int], List[Optional[Dict[str, Any]]]]:
+        """
+        rows are (patient_id, patient_name, doctor_id, db_date, slot_time, symptoms), checked
+        like book_appointment - against the table and earlier rows - unless validate is False.
+        patient_id 0 resolves by name like get_patient_id; unknown names are created once.
+        Returns (appointment_ids, patient_ids, rejections) in input order: a refused row
+        has appointment_id None and its book_appointment result in rejections.
+        """
+
+    @abstractmethod
+    def bulk_insert_symptoms(self, rows: List[tuple]) -> List[int]:
+        ...
+
+    @abstractmethod
+    def bulk_insert_medicine_orders(self, rows: List[tuple]) -> List[int]:
+        ...
+
+class SQLiteRepository(PatientCareRepository):
+    """
+    PatientCareDB.db through the pooled connection layer.
+    Reads honour the snapshot read mode; writes use BEGIN IMMEDIATE.
+    """
+
+    def doctor_version(self):
+        return get_read_connection().execute(
+            "SELECT MAX(UPDATED_AT), COUNT(*) FROM DOCTOR"
+        ).fetchone()
+
+    def load_active_doctors(self):
+        return get_read_connection().execute("""
+        SELECT
+            DOCTOR_ID,
+            SPECIALITY,
+            NAME,
+            QUALIFICATION,
+            AVAILABLE_FROM,
+            AVAILABLE_TO,
+            AVAILABLE_DAYS
+        FROM DOCTOR
+        WHERE IS_ACTIVE = 1
+        ORDER BY AVAILABLE_FROM, DOCTOR_ID
+        """).fetchall()
+
+    def get_patient_id(self, name):
+        result = get_read_connection().execute("""
+        SELECT PATIENT_ID
+        FROM PATIENT
+        WHERE LOWER(NAME)=LOWER(?)
+        """, (name,)).fetchone()
+
+        return result[0] if result else 0
+
+    def get_symptoms(self, patient_id):
+        rows = get_read_connection().execute("""
+            SELECT SYMPTOMS
+            FROM SYMPTOMS
+            WHERE PATIENT_ID = ?
+        """, (patient_id,)).fetchall()
+
+        return [row[0] for row in rows if row[0] is not None]
+
+    def search_symptoms(self, patient_id, complaint, k, since=None, until=None):
+
+        terms = symptom_terms(complaint)
+        if not terms:
+            return []
+
+        # PATIENT_KEY narrows the postings to one patient; bm25 ranks on SYMPTOMS only
+        match = f"PATIENT_KEY : p{int(patient_id)} AND SYMPTOMS : (" + " OR ".join(f'"{t}"' for t in terms) + ")"
+
+        return get_read_connection().execute("""
+            SELECT s.SYMPTOMS, s.CREATED_AT
+            FROM SYMPTOMS_FTS f
+            JOIN SYMPTOMS s ON s.SYMPTOM_ID = f.rowid
+            WHERE SYMPTOMS_FTS MATCH ?
+            AND (? IS NULL OR s.CREATED_AT >= ?)
+            AND (? IS NULL OR s.CREATED_AT < ?)
+            ORDER BY bm25(SYMPTOMS_FTS, 0.0, 1.0)
+            LIMIT ?
+        """, (match, since, since, until, until, k)).fetchall()
+
+    def recent_symptoms(self, patient_id, since, until, limit):
+        return get_read_connection().execute("""
+            SELECT SYMPTOMS, CREATED_AT
+            FROM SYMPTOMS
+            WHERE PATIENT_ID = ?
+            AND SYMPTOMS IS NOT NULL
+            AND (? IS NULL OR CREATED_AT >= ?)
+            AND (? IS NULL OR CREATED_AT < ?)
+            ORDER BY CREATED_AT DESC
+            LIMIT ?
+        """, (patient_id, since, since, until, until, limit)).fetchall()
+
+    def booked_times(self, doctor_id, from_date, to_date):
+        return get_read_connection().execute("""
+            SELECT DATE, TIME
+            FROM APPOINTMENT
+            WHERE DOCTOR_ID = ?
+            AND DATE BETWEEN ? AND ?
+        """, (doctor_id, from_date, to_date)).fetchall()
+
+    def book_appointment(self, patient_id, patient_name, doctor_id, db_date, slot_time, symptoms):
+
+        # BEGIN IMMEDIATE - concurrent bookings serialize on the write lock
+        with transaction() as conn:
+            cursor = conn.cursor()
+
+            doctor = cursor.execute("""
+                SELECT AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS
+                FROM DOCTOR
+                WHERE DOCTOR_ID = ? AND IS_ACTIVE = 1
+            """, (doctor_id,)).fetchone()
+
+            taken = cursor.execute("""
+                SELECT TIME
+                FROM APPOINTMENT
+                WHERE DOCTOR_ID = ? AND DATE = ?
+            """, (doctor_id, db_date)).fetchall()
+
+            # Off-schedule, off-grid and overlapping times are all refused
+            rejected = _check_slot(doctor, taken, db_date, slot_time)
+            if rejected:
+                return rejected
+
+            # INSERT PATIENT if not present in Table
+            if patient_id == 0:
+                cursor.execute("""
+                            INSERT INTO PATIENT (NAME)
+                            VALUES (?)
+                        """, (patient_name,))
+
+                patient_id = cursor.lastrowid
+
+            # INSERT APPOINTMENT
+            cursor.execute("""
+                INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME)
+                VALUES (?, ?, ?, ?)
+            """, (patient_id, doctor_id, db_date, slot_time))
+
+            appointment_id = cursor.lastrowid
+
+            # INSERT SYMPTOMS
+            cursor.execute("""
+                INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS)
+                VALUES (?, ?)
+            """, (patient_id, symptoms))
+
+        return {
+            "appointment_id": appointment_id,
+            "patient_id": patient_id,
+            "status": "confirmed"
+        }
+
+    def insert_medicine_order(self, medicine, dosage, quantity, shipping_address):
+        with transaction() as conn:
+            cursor = conn.cursor()
+
+            # INSERT MEDICINE ORDER
+            cursor.execute("""
+                INSERT INTO MEDICINE_ORDER (MEDICINE, DOSAGE, QUANTITY, SHIPPING_ADDRESS)
+                VALUES (?, ?, ?, ?)
+            """, (medicine, dosage, quantity, shipping_address))
+
+            # get generated ORDER_ID
+            return cursor.lastrowid
+
+    @staticmethod
+    def _insert_many(conn, query, params):
+        """
+        executemany inside the caller's write transaction and return the new row IDs.
+        AUTOINCREMENT assigns consecutive IDs while we hold the write lock, so the
+        IDs are the run ending at last_insert_rowid().
+        """
+        if not params:
+            return []
+
+        conn.executemany(query, params)
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        return list(range(last_id - len(params) + 1, last_id + 1))
+
+    def bulk_book_appointments(self, rows, validate=True):
+        with transaction() as conn:
+
+            # Same checks as book_appointment, under the same write lock
+            rejections = [None] * len(rows)
+            if validate:
+                rejections = _screen_bookings(
+                    rows,
+                    lambda doctor_id: conn.execute("""
+                        SELECT AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS
+                        FROM DOCTOR
+                        WHERE DOCTOR_ID = ? AND IS_ACTIVE = 1
+                    """, (doctor_id,)).fetchone(),
+                    lambda doctor_id, db_date: conn.execute(
+                        "SELECT TIME FROM APPOINTMENT WHERE DOCTOR_ID = ? AND DATE = ?", (doctor_id, db_date)
+                    ).fetchall()
+                )
+            accepted = [i for i, rejected in enumerate(rejections) if rejected is None]
+
+            # Rows without a patient_id find the patient by name, as get_patient_id does;
+            # an insert is seen by the lookups after it, so a new name is created once
+            resolved = [r[0] for r in rows]
+            by_name = {}
+            for i in accepted:
+                if rows[i][0] != 0:
+                    continue
+                name = rows[i][1]
+                if name not in by_name:
+                    found = conn.execute("SELECT PATIENT_ID FROM PATIENT WHERE LOWER(NAME)=LOWER(?)",
+                                         (name,)).fetchone()
+                    by_name[name] = found[0] if found else conn.execute(
+                        "INSERT INTO PATIENT (NAME) VALUES (?)", (name,)).lastrowid
+                resolved[i] = by_name[name]
+
+            inserted = self._insert_many(
+                conn,
+                "INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (?, ?, ?, ?)",
+                [(resolved[i], rows[i][2], rows[i][3], rows[i][4]) for i in accepted]
+            )
+
+            conn.executemany(
+                "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (?, ?)",
+                [(resolved[i], rows[i][5]) for i in accepted]
+            )
+
+        appointment_ids = [None] * len(rows)
+        for i, appointment_id in zip(accepted, inserted):
+            appointment_ids[i] = appointment_id
+
+        return appointment_ids, resolved, rejections
+
+    def bulk_insert_symptoms(self, rows):
+        with transaction() as conn:
+            return self._insert_many(
+                conn,
+                "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (?, ?)",
+                rows
+            )
+
+    def bulk_insert_medicine_orders(self, rows):
+        with transaction() as conn:
+            return self._insert_many(
+                conn,
+                "INSERT INTO MEDICINE_ORDER (MEDICINE, DOSAGE, QUANTITY, SHIPPING_ADDRESS) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+# Postgres schema mirroring PatientCareDB (identifiers fold to lower case)
+PG_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS DOCTOR (
+        DOCTOR_ID       SERIAL PRIMARY KEY,
+        SPECIALITY      TEXT NOT NULL,
+        NAME            TEXT NOT NULL,
+        GENDER          TEXT CHECK (GENDER IN ('M', 'F', 'O')),
+        QUALIFICATION   TEXT,
+        AVAILABLE_FROM  TEXT,
+        AVAILABLE_TO    TEXT,
+        AVAILABLE_DAYS  TEXT,
+        IS_ACTIVE       INTEGER DEFAULT 1,
+        CREATED_AT      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UPDATED_AT      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS PATIENT (
+        PATIENT_ID  SERIAL PRIMARY KEY,
+        NAME        TEXT NOT NULL,
+        AGE         INTEGER,
+        GENDER      TEXT,
+        MOBILE      BIGINT,
+        ADDRESS     TEXT,
+        CREATED_AT  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UPDATED_AT  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS SYMPTOMS (
+        SYMPTOM_ID  SERIAL PRIMARY KEY,
+        PATIENT_ID  INTEGER NOT NULL,
+        SYMPTOMS    TEXT NULL,
+        CREATED_AT  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS APPOINTMENT (
+        APPOINTMENT_ID  SERIAL PRIMARY KEY,
+        PATIENT_ID      INTEGER NULL,
+        DOCTOR_ID       INTEGER NULL,
+        DATE            TEXT NULL,
+        TIME            TEXT NULL,
+        CREATED_AT      TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UPDATED_AT      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS MEDICINE_ORDER (
+        ORDER_ID            SERIAL PRIMARY KEY,
+        MEDICINE            TEXT NULL,
+        DOSAGE              TEXT NOT NULL,
+        QUANTITY            TEXT NULL,
+        SHIPPING_ADDRESS    TEXT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS IDX_DOCTOR_SPECIALITY ON DOCTOR (SPECIALITY, IS_ACTIVE, AVAILABLE_FROM)",
+    "CREATE INDEX IF NOT EXISTS IDX_DOCTOR_UPDATED_AT ON DOCTOR (UPDATED_AT)",
+    "CREATE INDEX IF NOT EXISTS IDX_PATIENT_NAME_LOWER ON PATIENT (LOWER(NAME))",
+    "CREATE INDEX IF NOT EXISTS IDX_SYMPTOMS_PATIENT ON SYMPTOMS (PATIENT_ID, CREATED_AT)",
+    "CREATE INDEX IF NOT EXISTS IDX_SYMPTOMS_FTS ON SYMPTOMS USING GIN (TO_TSVECTOR('english', COALESCE(SYMPTOMS, '')))",
+    "CREATE INDEX IF NOT EXISTS IDX_APPOINTMENT_DOCTOR_SLOT ON APPOINTMENT (DOCTOR_ID, DATE, TIME)",
+    "CREATE INDEX IF NOT EXISTS IDX_APPOINTMENT_PATIENT ON APPOINTMENT (PATIENT_ID)",
+    """
+    CREATE OR REPLACE FUNCTION DOCTOR_TOUCH_UPDATED_AT() RETURNS TRIGGER AS $$
+    BEGIN
+        NEW.UPDATED_AT = CLOCK_TIMESTAMP();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS TRG_DOCTOR_UPDATED_AT ON DOCTOR",
+    """
+    CREATE TRIGGER TRG_DOCTOR_UPDATED_AT
+    BEFORE UPDATE ON DOCTOR
+    FOR EACH ROW EXECUTE FUNCTION DOCTOR_TOUCH_UPDATED_AT()
+    """,
+]
+
+class PostgresRepository(PatientCareRepository):
+    """
+    Server database shared by several workflow replicas, via a psycopg 3
+    connection pool. Bookings take a per-doctor advisory lock, so bookings
+    for different doctors do not serialize on a single writer.
+    """
+
+    def __init__(self, dsn: str = PG_DSN, min_size: int = PG_POOL_MIN, max_size: int = PG_POOL_MAX):
+        from psycopg_pool import ConnectionPool
+
+        self.pool = ConnectionPool(dsn, min_size=min_size, max_size=max_size, open=True)
+
+    def ensure_schema(self) -> None:
+        with self.pool.connection() as conn:
+            for statement in PG_SCHEMA:
+                conn.execute(statement)
+
+    def _fetchall(self, query, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def doctor_version(self):
+        return tuple(self._fetchall("SELECT MAX(UPDATED_AT), COUNT(*) FROM DOCTOR")[0])
+
+    def load_active_doctors(self):
+        return self._fetchall("""
+        SELECT
+            DOCTOR_ID,
+            SPECIALITY,
+            NAME,
+            QUALIFICATION,
+            AVAILABLE_FROM,
+            AVAILABLE_TO,
+            AVAILABLE_DAYS
+        FROM DOCTOR
+        WHERE IS_ACTIVE = 1
+        ORDER BY AVAILABLE_FROM, DOCTOR_ID
+        """)
+
+    def get_patient_id(self, name):
+        rows = self._fetchall("""
+        SELECT PATIENT_ID
+        FROM PATIENT
+        WHERE LOWER(NAME)=LOWER(%s)
+        LIMIT 1
+        """, (name,))
+
+        return rows[0][0] if rows else 0
+
+    def get_symptoms(self, patient_id):
+        rows = self._fetchall("""
+            SELECT SYMPTOMS
+            FROM SYMPTOMS
+            WHERE PATIENT_ID = %s
+            ORDER BY SYMPTOM_ID
+        """, (patient_id,))
+
+        return [row[0] for row in rows if row[0] is not None]
+
+    def search_symptoms(self, patient_id, complaint, k, since=None, until=None):
+
+        terms = symptom_terms(complaint)
+        if not terms:
+            return []
+
+        return self._fetchall("""
+            SELECT SYMPTOMS, CREATED_AT::TEXT
+            FROM SYMPTOMS
+            WHERE PATIENT_ID = %s
+            AND TO_TSVECTOR('english', COALESCE(SYMPTOMS, '')) @@ TO_TSQUERY('english', %s)
+            AND (%s::TIMESTAMP IS NULL OR CREATED_AT >= %s::TIMESTAMP)
+            AND (%s::TIMESTAMP IS NULL OR CREATED_AT < %s::TIMESTAMP)
+            ORDER BY TS_RANK(TO_TSVECTOR('english', COALESCE(SYMPTOMS, '')), TO_TSQUERY('english', %s)) DESC
+            LIMIT %s
+        """, (patient_id, " | ".join(terms), since, since, until, until, " | ".join(terms), k))
+
+    def recent_symptoms(self, patient_id, since, until, limit):
+        return self._fetchall("""
+            SELECT SYMPTOMS, CREATED_AT::TEXT
+            FROM SYMPTOMS
+            WHERE PATIENT_ID = %s
+            AND SYMPTOMS IS NOT NULL
+            AND (%s::TIMESTAMP IS NULL OR CREATED_AT >= %s::TIMESTAMP)
+            AND (%s::TIMESTAMP IS NULL OR CREATED_AT < %s::TIMESTAMP)
+            ORDER BY CREATED_AT DESC
+            LIMIT %s
+        """, (patient_id, since, since, until, until, limit))
+
+    def booked_times(self, doctor_id, from_date, to_date):
+        return self._fetchall("""
+            SELECT DATE, TIME
+            FROM APPOINTMENT
+            WHERE DOCTOR_ID = %s
+            AND DATE BETWEEN %s AND %s
+        """, (doctor_id, from_date, to_date))
+
+    def book_appointment(self, patient_id, patient_name, doctor_id, db_date, slot_time, symptoms):
+
+        with self.pool.connection() as conn, conn.transaction():
+
+            # Held until commit - serializes bookings for this doctor only
+            conn.execute("SELECT pg_advisory_xact_lock(%s)", (int(doctor_id),))
+
+            doctor = conn.execute("""
+                SELECT AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS
+                FROM DOCTOR
+                WHERE DOCTOR_ID = %s AND IS_ACTIVE = 1
+            """, (int(doctor_id),)).fetchone()
+
+            taken = conn.execute("""
+                SELECT TIME
+                FROM APPOINTMENT
+                WHERE DOCTOR_ID = %s AND DATE = %s
+            """, (int(doctor_id), db_date)).fetchall()
+
+            rejected = _check_slot(doctor, taken, db_date, slot_time)
+            if rejected:
+                return rejected
+
+            if patient_id == 0:
+                patient_id = conn.execute(
+                    "INSERT INTO PATIENT (NAME) VALUES (%s) RETURNING PATIENT_ID",
+                    (patient_name,)
+                ).fetchone()[0]
+
+            appointment_id = conn.execute("""
+                INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME)
+                VALUES (%s, %s, %s, %s)
+                RETURNING APPOINTMENT_ID
+            """, (patient_id, doctor_id, db_date, slot_time)).fetchone()[0]
+
+            conn.execute(
+                "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (%s, %s)",
+                (patient_id, symptoms)
+            )
+
+        return {
+            "appointment_id": appointment_id,
+            "patient_id": patient_id,
+            "status": "confirmed"
+        }
+
+    def insert_medicine_order(self, medicine, dosage, quantity, shipping_address):
+        with self.pool.connection() as conn:
+            return conn.execute("""
+                INSERT INTO MEDICINE_ORDER (MEDICINE, DOSAGE, QUANTITY, SHIPPING_ADDRESS)
+                VALUES (%s, %s, %s, %s)
+                RETURNING ORDER_ID
+            """, (medicine, dosage, quantity, shipping_address)).fetchone()[0]
+
+    @staticmethod
+    def _insert_many(cursor, query, params):
+        """
+        executemany with RETURNING; one result set per input row, in order.
+        """
+        if not params:
+            return []
+
+        cursor.executemany(query, params, returning=True)
+
+        ids = []
+        while True:
+            ids.append(cursor.fetchone()[0])
+            if not cursor.nextset():
+                break
+
+        return ids
+
+    def bulk_book_appointments(self, rows, validate=True):
+        with self.pool.connection() as conn, conn.transaction():
+            cursor = conn.cursor()
+
+            rejections = [None] * len(rows)
+            if validate:
+                # The locks book_appointment takes, in a fixed order so two loads cannot deadlock
+                for doctor_id in sorted({int(r[2]) for r in rows}):
+                    conn.execute("SELECT pg_advisory_xact_lock(%s)", (doctor_id,))
+
+                rejections = _screen_bookings(
+                    rows,
+                    lambda doctor_id: conn.execute("""
+                        SELECT AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS
+                        FROM DOCTOR
+                        WHERE DOCTOR_ID = %s AND IS_ACTIVE = 1
+                    """, (int(doctor_id),)).fetchone(),
+                    lambda doctor_id, db_date: conn.execute(
+                        "SELECT TIME FROM APPOINTMENT WHERE DOCTOR_ID = %s AND DATE = %s", (int(doctor_id), db_date)
+                    ).fetchall()
+                )
+            accepted = [i for i, rejected in enumerate(rejections) if rejected is None]
+
+            resolved = [r[0] for r in rows]
+            by_name = {}
+            for i in accepted:
+                if rows[i][0] != 0:
+                    continue
+                name = rows[i][1]
+                if name not in by_name:
+                    found = conn.execute("SELECT PATIENT_ID FROM PATIENT WHERE LOWER(NAME)=LOWER(%s) LIMIT 1",
+                                         (name,)).fetchone()
+                    by_name[name] = found[0] if found else conn.execute(
+                        "INSERT INTO PATIENT (NAME) VALUES (%s) RETURNING PATIENT_ID", (name,)).fetchone()[0]
+                resolved[i] = by_name[name]
+
+            inserted = self._insert_many(
+                cursor,
+                "INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (%s, %s, %s, %s) RETURNING APPOINTMENT_ID",
+                [(resolved[i], rows[i][2], rows[i][3], rows[i][4]) for i in accepted]
+            )
+
+            cursor.executemany(
+                "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (%s, %s)",
+                [(resolved[i], rows[i][5]) for i in accepted]
+            )
+
+        appointment_ids = [None] * len(rows)
+        for i, appointment_id in zip(accepted, inserted):
+            appointment_ids[i] = appointment_id
+
+        return appointment_ids, resolved, rejections
+
+    def bulk_insert_symptoms(self, rows):
+        with self.pool.connection() as conn, conn.transaction():
+            return self._insert_many(
+                conn.cursor(),
+                "INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (%s, %s) RETURNING SYMPTOM_ID",
+                rows
+            )
+
+    def bulk_insert_medicine_orders(self, rows):
+        with self.pool.connection() as conn, conn.transaction():
+            return self._insert_many(
+                conn.cursor(),
+                "INSERT INTO MEDICINE_ORDER (MEDICINE, DOSAGE, QUANTITY, SHIPPING_ADDRESS) "
+                "VALUES (%s, %s, %s, %s) RETURNING ORDER_ID",
+                rows
+            )
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def get_repository() -> PatientCareRepository:
+    """
+    Shared repository for the configured PATIENT_CARE_DB_BACKEND.
+    """
+    global _repository
+
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                if BACKEND == "postgres":
+                    _repository = PostgresRepository()
+                    _repository.ensure_schema()
+                else:
+                    _repository = SQLiteRepository()
+
+    return _repository
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PatientCare storage backends")
+    parser.add_argument("command", choices=["init-postgres"])
+    parser.parse_args()
+
+    PostgresRepository().ensure_schema()
+    print(f"Schema ready at {PG_DSN}")
@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import List
+
+import Database
+from Repository import PostgresRepository, SQLiteRepository
+from Schedule import SLOT_MINUTES, parse_days, parse_time
+
+def _bookable_slots(doctors: List[tuple], first_day: date, days: int) -> List[tuple]:
+    """
+    Every (doctor_id, date, time) slot in the doctors' schedules, shuffled.
+    """
+    slots = []
+    for r in doctors:
+        try:
+            start, end = parse_time(r[4]), parse_time(r[5])
+        except (ValueError, AttributeError):
+            continue
+        weekdays = parse_days(r[6])
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            if day.weekday() in weekdays:
+                slots.extend((r[0], day.isoformat(), f"{m // 60:02d}:{m % 60:02d}")
+                             for m in range(start, end - SLOT_MINUTES + 1, SLOT_MINUTES))
+    random.shuffle(slots)
+    return slots
+
+def _run(repository, backend: str, levels: List[int], operations: int):
+
+    rows = repository.load_active_doctors()
+    doctors = [r[0] for r in rows] or [1]
+    slots = _bookable_slots(rows, date(2031, 1, 1), 365)
+    run = [0]
+
+    def lookup(i):
+        repository.get_patient_id("Sourav Das")
+        repository.get_symptoms(1)
+        repository.booked_times(random.choice(doctors), "2030-01-01", "2030-01-14")
+
+    def book(i):
+        # A different free slot per booking, and a new patient so the lookup path's history stays fixed
+        doctor_id, day, slot = slots[(run[0] * operations + i) % len(slots)]
+        return repository.book_appointment(0, f"Benchmark {run[0]}-{i}", doctor_id, day, slot, "fever")["status"]
+
+    print(f"Benchmark: backend={backend}, {operations} operations per run")
+    print(f"{'threads':>8} {'lookup ops/s':>14} {'booking ops/s':>14}")
+
+    for level in levels:
+        results = []
+        with ThreadPoolExecutor(max_workers=level) as pool:
+
+            # Warm up so every worker has its connection open
+            list(pool.map(lookup, range(level * 4)))
+
+            for func in (lookup, book):
+                run[0] += 1
+                start = time.perf_counter()
+                statuses = list(pool.map(func, range(operations)))
+                results.append(operations / (time.perf_counter() - start))
+
+        print(f"{level:>8} {results[0]:>14,.0f} {results[1]:>14,.0f}  ({statuses.count('confirmed')} confirmed)")
+
+# Booking and lookup throughput at increasing concurrency
+def run_benchmark(backend: str, levels: List[int], operations: int = 2000):
+
+    if backend == "postgres":
+        repository = PostgresRepository(max_size=max(levels))
+        repository.ensure_schema()
+        _run(repository, backend, levels, operations)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        shutil.copy(Database.DEFAULT_DB_PATH, path)
+        Database.configure(path)
+        try:
+            _run(SQLiteRepository(), backend, levels, operations)
+        finally:
+            Database.close_all()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PatientCare storage backend throughput")
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--levels", default="1,4,16,64")
+    parser.add_argument("--operations", type=int, default=2000)
+    args = parser.parse_args()
+
+    run_benchmark(args.backend, [int(x) for x in args.levels.split(",")], args.operations)
@@ -0,0 +1,333 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PatientCache import LRUCache
+
+# Cache sizing
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+
+# Cosine similarity needed for a semantic (near-duplicate) hit
+SIMILARITY_THRESHOLD = 0.92
+
+# Disk store next to the sources, whatever the working directory
+DEFAULT_DISK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ResponseCache.db")
+
+def _message_fields(message: Any) -> Dict[str, Any]:
+
+    if isinstance(message, dict):
+        role = message.get("role")
+        content = message.get("content")
+        tool_calls = message.get("tool_calls")
+    else:
+        role = message.type
+        content = message.content
+        tool_calls = getattr(message, "tool_calls", None)
+
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+
+    fields = {"role": role, "content": " ".join(content.split())}
+    if tool_calls:
+        fields["tool_calls"] = sorted(
+            [{"name": c["name"], "args": c["args"]} for c in tool_calls],
+            key=lambda c: json.dumps(c, sort_keys=True, default=str)
+        )
+
+    return fields
+
+def cache_key(messages: List[Any], namespace: str = "") -> Tuple[str, str, str]:
+    """
+    Normalize (system prompt, message history, tool results) into
+    (exact_key, context_key, query_text). context_key covers everything
+    except the last message, which the semantic tier compares by embedding.
+    """
+    fields = [_message_fields(m) for m in messages]
+
+    def digest(items):
+        payload = json.dumps([namespace] + items, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    query_text = fields[-1]["content"] if fields else ""
+
+    return digest(fields), digest(fields[:-1]), query_text
+
+def hashed_ngram_embedding(text: str, dims: int = 256) -> List[float]:
+    """
+    Local, dependency-free embedding: hashed character trigrams, L2 normalized.
+    Any callable text -> vector (e.g. a sentence-transformer) can be used instead.
+    """
+    vector = [0.0] * dims
+    padded = f"  {text.lower()} "
+    for i in range(len(padded) - 2):
+        gram = padded[i:i + 3].encode("utf-8")
+        vector[int.from_bytes(hashlib.blake2b(gram, digest_size=4).digest(), "little") % dims] += 1.0
+
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+class MemoryBackend:
+    """
+    In-process LRU/TTL store.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS):
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        self._cache.put(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+def dump_entry(entry: Tuple[Any, float]) -> str:
+    """
+    (chat message, latency) as JSON for the disk store.
+    """
+    from langchain_core.messages import message_to_dict
+
+    response, latency = entry
+    return json.dumps({"message": message_to_dict(response), "latency": latency})
+
+def load_entry(text: str) -> Tuple[Any, float]:
+    from langchain_core.messages import messages_from_dict
+
+    data = json.loads(text)
+    return messages_from_dict([data["message"]])[0], data["latency"]
+
+class DiskBackend:
+    """
+    SQLite file store shared across restarts and processes. Values are
+    stored as JSON text via dumps/loads, never unpickled; rows that do not
+    decode are dropped and treated as misses.
+    LRU eviction by last use once the table exceeds max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS,
+                 dumps: Callable[[Any], str] = json.dumps, loads: Callable[[str], Any] = json.loads):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.dumps = dumps
+        self.loads = loads
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.evictions = 0
+
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS RESPONSE_CACHE (
+            KEY         TEXT PRIMARY KEY,
+            VALUE       BLOB NOT NULL,
+            EXPIRES_AT  REAL NOT NULL,
+            LAST_USED   REAL NOT NULL
+        )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS IDX_RESPONSE_CACHE_LAST_USED ON RESPONSE_CACHE (LAST_USED)")
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT VALUE FROM RESPONSE_CACHE WHERE KEY = ? AND EXPIRES_AT > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE RESPONSE_CACHE SET LAST_USED = ? WHERE KEY = ?", (now, key))
+
+        try:
+            return self.loads(row[0])
+        except (ValueError, KeyError, TypeError):
+            with self._lock:
+                self._conn.execute("DELETE FROM RESPONSE_CACHE WHERE KEY = ?", (key,))
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        text = self.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO RESPONSE_CACHE (KEY, VALUE, EXPIRES_AT, LAST_USED) VALUES (?, ?, ?, ?)",
+                (key, text, now + self.ttl, now)
+            )
+
+            # Trim occasionally rather than on every write
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._conn.execute("DELETE FROM RESPONSE_CACHE WHERE EXPIRES_AT <= ?", (now,))
+                excess = self._conn.execute("SELECT COUNT(*) FROM RESPONSE_CACHE").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self._conn.execute("""
+                        DELETE FROM RESPONSE_CACHE WHERE KEY IN (
+                            SELECT KEY FROM RESPONSE_CACHE ORDER BY LAST_USED LIMIT ?
+                        )
+                    """, (excess,))
+                    self.evictions += excess
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM RESPONSE_CACHE").fetchone()[0]
+        return {"size": size, "evictions": self.evictions}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class SemanticIndex:
+    """
+    Near-duplicate lookup: same context (system prompt + earlier history),
+    last message within SIMILARITY_THRESHOLD cosine similarity.
+    Evicted and expired entries leave the per-context index with them.
+    """
+
+    def __init__(self, embed: Callable[[str], List[float]] = hashed_ngram_embedding,
+                 threshold: float = SIMILARITY_THRESHOLD, max_entries: int = MAX_ENTRIES):
+        self.embed = embed
+        self.threshold = threshold
+        self._entries = LRUCache(max_entries=max_entries, ttl=TTL_SECONDS,
+                                 on_evict=lambda key, entry: self._forget(entry[0], key))
+        self._by_context = {}
+        self._lock = threading.Lock()
+
+    def _forget(self, context_key: str, exact_key: str) -> None:
+        with self._lock:
+            keys = self._by_context.get(context_key)
+            if keys is not None:
+                keys.discard(exact_key)
+                if not keys:
+                    del self._by_context[context_key]
+
+    def add(self, context_key: str, query_text: str, exact_key: str) -> None:
+        vector = self.embed(query_text)
+        with self._lock:
+            self._by_context.setdefault(context_key, set()).add(exact_key)
+        # Outside our lock - an eviction here calls back into _forget
+        self._entries.put(exact_key, (context_key, vector))
+
+    def lookup(self, context_key: str, query_text: str) -> Optional[str]:
+        with self._lock:
+            candidates = list(self._by_context.get(context_key, ()))
+        if not candidates:
+            return None
+
+        vector = self.embed(query_text)
+        best_key, best_score = None, self.threshold
+        for key in candidates:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._forget(context_key, key)
+                continue
+            score = sum(a * b for a, b in zip(vector, entry[1]))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        return best_key
+
+class CachedChatModel:
+    """
+    Wraps a chat model (or a tool-bound runnable) with a response cache.
+    Only responses accepted by `cacheable(messages, response)` are stored,
+    so turns that lead to bookings or orders are never replayed. Responses
+    that carry user-specific details should also be kept out of the semantic
+    tier with `shareable(messages, response)`.
+    """
+
+    def __init__(self, llm: Any, agent: str, backend: Any,
+                 semantic: Optional[SemanticIndex] = None,
+                 cacheable: Optional[Callable[[List[Any], Any], bool]] = None,
+                 shareable: Optional[Callable[[List[Any], Any], bool]] = None):
+        self.llm = llm
+        self.agent = agent
+        self.backend = backend
+        self.semantic = semantic
+        self.cacheable = cacheable or (lambda messages, response: True)
+        self.shareable = shareable or (lambda messages, response: True)
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _lookup(self, messages):
+        exact_key, context_key, query_text = cache_key(messages, self.agent)
+
+        entry = self.backend.get(exact_key)
+        if entry is not None:
+            self.hits += 1
+        elif self.semantic is not None:
+            similar_key = self.semantic.lookup(context_key, query_text)
+            if similar_key is not None:
+                entry = self.backend.get(similar_key)
+                if entry is not None:
+                    self.semantic_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None, (exact_key, context_key, query_text)
+
+        response, latency = entry
+        self.saved_seconds += latency
+
+        # Fresh message id so add_messages appends instead of replacing
+        return response.model_copy(update={"id": None}), None
+
+    def _store(self, keys, messages, response, latency):
+        if not self.cacheable(messages, response):
+            return
+        exact_key, context_key, query_text = keys
+        self.backend.put(exact_key, (response, latency))
+        if self.semantic is not None and self.shareable(messages, response):
+            self.semantic.add(context_key, query_text, exact_key)
+
+    def invoke(self, messages, config=None, **kwargs):
+        cached, keys = self._lookup(messages)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        response = self.llm.invoke(messages, config, **kwargs)
+        self._store(keys, messages, response, time.perf_counter() - start)
+
+        return response
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        cached, keys = self._lookup(messages)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        response = await self.llm.ainvoke(messages, config, **kwargs)
+        self._store(keys, messages, response, time.perf_counter() - start)
+
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            "agent": self.agent,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3)
+        }
+
+def make_backend(kind: str = os.getenv("RESPONSE_CACHE", "memory"),
+                 path: str = os.getenv("RESPONSE_CACHE_PATH", DEFAULT_DISK_PATH)):
+    """
+    "memory", "disk" or "off" (returns None).
+    """
+    if kind == "disk":
+        return DiskBackend(path, dumps=dump_entry, loads=load_entry)
+    if kind == "memory":
+        return MemoryBackend()
+    return None
@@ -0,0 +1,86 @@
+import json
+import os
+import random
+import tempfile
+import time
+
+from ResponseCache import CachedChatModel, DiskBackend, MemoryBackend, SemanticIndex
+
+# Fake LLM with fixed latency, repeated questions across users
+class _FakeMessage:
+
+    def __init__(self, content, id=None):
+        self.type = "ai"
+        self.content = content
+        self.id = id
+
+    def model_copy(self, update=None):
+        return _FakeMessage(**{"content": self.content, "id": self.id, **(update or {})})
+
+class _FakeLLM:
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return _FakeMessage(f"answer to: {messages[-1]['content']}", id="fake")
+
+def _dump_fake(entry):
+    return json.dumps([entry[0].content, entry[1]])
+
+def _load_fake(text):
+    content, latency = json.loads(text)
+    return _FakeMessage(content), latency
+
+def run_benchmark(users: int = 200, delay: float = 0.05, backend_kind: str = "memory"):
+
+    questions = [
+        "What are the symptoms of dengue?",
+        "what are the symptoms of dengue",
+        "How much water should I drink daily?",
+        "Find me a cardiologist",
+        "find me a cardiologist please",
+        "Is paracetamol safe with ibuprofen?",
+        "What is a normal blood pressure?",
+        "What foods help lower cholesterol?",
+    ]
+    system = {"role": "system", "content": "You are a clinical conversational AI assistant."}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend_kind == "disk":
+            backend = DiskBackend(os.path.join(tmp, "bench.db"), dumps=_dump_fake, loads=_load_fake)
+        else:
+            backend = MemoryBackend()
+
+        rng = random.Random(7)
+        for label, semantic in [("exact", None), ("exact+semantic", SemanticIndex())]:
+            llm = _FakeLLM(delay)
+            model = CachedChatModel(llm, f"demo-{label}", backend, semantic=semantic)
+
+            start = time.perf_counter()
+            for _ in range(users):
+                model.invoke([system, {"role": "user", "content": rng.choice(questions)}])
+            elapsed = time.perf_counter() - start
+
+            stats = model.stats()
+            print(f"Benchmark [{label}]: {users} turns, {llm.calls} LLM calls, "
+                  f"hit rate {stats['hit_rate']:.1%} (semantic {stats['semantic_hits']}), "
+                  f"elapsed {elapsed:.2f}s vs {users * delay:.2f}s uncached, "
+                  f"saved {stats['saved_seconds']:.2f}s")
+
+        if backend_kind == "disk":
+            backend.close()
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM response cache benchmark")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--backend", choices=["memory", "disk"], default="memory")
+    args = parser.parse_args()
+
+    run_benchmark(args.users, backend_kind=args.backend)
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
+
+# Parsing for the DOCTOR.AVAILABLE_* strings and user supplied times
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Length of one bookable slot; slots start at AVAILABLE_FROM and every SLOT_MINUTES after
+SLOT_MINUTES = 30
+
+TIME_FORMATS = ["%H:%M", "%I:%M %p", "%I:%M%p", "%I %p", "%I%p", "%H"]
+
+def parse_time(value: str) -> int:
+    """
+    Convert '10:30', '10:30 AM' or '3 PM' to minutes since midnight.
+    """
+    text = value.strip().upper()
+    for fmt in TIME_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+            return parsed.hour * 60 + parsed.minute
+        except ValueError:
+            continue
+
+    raise ValueError(f"Unrecognised time: {value}")
+
+def parse_day(value: str) -> int:
+    """
+    Convert 'Tue', 'Tuesday' or a 'dd-MMM-yy' date to a weekday index (Mon=0).
+    """
+    text = value.strip()
+    try:
+        return datetime.strptime(text, "%d-%b-%y").weekday()
+    except ValueError:
+        pass
+
+    prefix = text[:3].title()
+    if prefix in DAY_NAMES:
+        return DAY_NAMES.index(prefix)
+
+    raise ValueError(f"Unrecognised day: {value}")
+
+def normalize_time(value: str) -> str:
+    """
+    Store times as HH:MM so slot comparisons are exact.
+    """
+    minutes = parse_time(value)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def parse_days(value: Optional[str]) -> Set[int]:
+    """
+    Weekday indexes of an AVAILABLE_DAYS string like 'Mon,Wed,Fri'; unknown entries are skipped.
+    """
+    days = set()
+    for day in (value or "").split(","):
+        try:
+            days.add(parse_day(day))
+        except ValueError:
+            continue
+    return days
+
+def slot_problem(available_from: Optional[str], available_to: Optional[str], available_days: Optional[str],
+                 db_date: str, slot_time: str) -> Optional[str]:
+    """
+    Why slot_time on db_date ('YYYY-MM-DD') is not a slot in the doctor's
+    schedule, or None when it is one.
+    """
+    try:
+        start, end = parse_time(available_from), parse_time(available_to)
+    except (ValueError, AttributeError):
+        return "the doctor has no working hours on record"
+
+    weekday = datetime.strptime(db_date, "%Y-%m-%d").weekday()
+    if weekday not in parse_days(available_days):
+        return f"the doctor does not work on {DAY_NAMES[weekday]}"
+
+    minute = parse_time(slot_time)
+    if minute < start or minute + SLOT_MINUTES > end:
+        return f"{slot_time} is outside the doctor's hours ({available_from}-{available_to})"
+
+    if (minute - start) % SLOT_MINUTES:
+        return f"{slot_time} is not a slot start - slots are every {SLOT_MINUTES} minutes from {available_from}"
+
+    return None
+
+def overlaps_booking(booked_times: Iterable[Tuple[str]], slot_time: str) -> bool:
+    """
+    True when a booked time is less than SLOT_MINUTES away from slot_time.
+    Tolerates legacy stored values like '10:30 am'; unparseable ones are ignored.
+    """
+    minute = parse_time(slot_time)
+    for (booked_time,) in booked_times:
+        try:
+            if abs(parse_time(booked_time) - minute) < SLOT_MINUTES:
+                return True
+        except (ValueError, AttributeError):
+            continue
+    return False
@@ -1,26 +1,48 @@
 import paho.mqtt.client as mqtt
+import argparse
 import json
 import time
 import numpy as np
 
+from Features import FEATURES
+from VitalsGenerator import PROFILES, generate
+
 BROKER = "broker.emqx.io"
-TOPIC = "smartwatch/healthdata"
+
+# One topic per watch: smartwatch/<patient_id>/healthdata
+TOPIC_TEMPLATE = "smartwatch/{patient_id}/healthdata"
+
+parser = argparse.ArgumentParser(description="Publish simulated smartwatch vitals")
+parser.add_argument("--patient-id", default="P001", help="patient the watch belongs to")
+parser.add_argument("--devices", type=int, default=1,
+                    help="simulate this many watches: <patient-id>-1 ... <patient-id>-N")
+parser.add_argument("--interval", type=float, default=3.0, help="seconds between readings per watch")
+parser.add_argument("--profile", default="wearable", choices=sorted(PROFILES),
+                    help="vitals profile, e.g. fever or tachycardia to trigger alerts")
+parser.add_argument("--seed", type=int, default=None)
+args = parser.parse_args()
+
+if args.devices == 1:
+    patient_ids = [args.patient_id]
+else:
+    patient_ids = [f"{args.patient_id}-{i}" for i in range(1, args.devices + 1)]
+topics = [TOPIC_TEMPLATE.format(patient_id=p) for p in patient_ids]
 
 client = mqtt.Client()
 client.connect(BROKER, 1883, 60)
+client.loop_start()
 print("Connection: Connected to MQTT broker")
 
-def generate_data():
-    return {
-        'heart_rate': np.clip(np.random.normal(72, 20), 60,120),
-        'spo2': np.clip(np.random.normal(97, 3), 90,100),
-        'temperature_f': np.clip(np.random.normal(98, 3), 97,102),
-        'stress': np.clip(np.random.normal(3, 2), 1,10)
-    }
-
-print("Connection: Publishing health data to MQTT----")
+print(f"Connection: Publishing health data for {len(topics)} watch(es) to MQTT----")
+rng = np.random.default_rng(args.seed)
 while True:
-    data = generate_data()
-    client.publish(TOPIC, json.dumps(data))
-    print("Sent:", data)
-    time.sleep(3)
\ No newline at end of file
+    start = time.monotonic()
+    # One vectorized draw for every watch this tick
+    for topic, row in zip(topics, generate(len(topics), args.profile, rng=rng).tolist()):
+        data = dict(zip(FEATURES, row))
+        client.publish(topic, json.dumps(data))
+        if len(topics) == 1:
+            print("Sent:", data)
+    if len(topics) > 1:
+        print(f"Sent: {len(topics)} readings")
+    time.sleep(max(0.0, args.interval - (time.monotonic() - start)))
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import threading
+import time
+
+from Database import get_connection, get_db_path, add_commit_listener
+
+# Read mode for lookup tools: "primary" reads the DB file, "snapshot" reads
+# an in-memory copy built with the SQLite backup API
+READ_MODE = os.getenv("PATIENT_CARE_DB_READ_MODE", "primary")
+
+# Seconds between checks for writes made by other processes
+REFRESH_INTERVAL = float(os.getenv("PATIENT_CARE_SNAPSHOT_INTERVAL", "2.0"))
+
+# Seconds without a local commit before rebuilding, so a burst of writes
+# costs one backup; under sustained writes the rebuild waits at most the interval
+MIN_REFRESH_GAP = 0.2
+
+class SnapshotManager:
+    """
+    Keeps an in-memory copy of the primary DB for read-only lookups.
+
+    The copy is rebuilt only when the primary has changed: local commits
+    (via Database.transaction) wake the refresher, and PRAGMA data_version
+    catches commits from other processes. Each rebuild fills a fresh
+    in-memory DB and swaps it in, so readers never wait on a refresh or on
+    the primary's writer. Reads after a local commit go to the primary until
+    a rebuild that started after the commit has been swapped in.
+    """
+
+    def __init__(self, interval: float = REFRESH_INTERVAL):
+        self.interval = interval
+        self._conn = None
+        self._path = None
+        self._data_version = None
+        self._watcher = None
+        self._watcher_path = None
+        self._dirty = False
+        self._commits = 0
+        self._commits_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.refreshes = 0
+        self.last_refresh_ms = 0.0
+
+    def _primary_version(self):
+        path = get_db_path()
+        if self._watcher is None or self._watcher_path != path:
+            self._watcher = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._watcher_path = path
+        return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> None:
+        with self._lock:
+            start = time.perf_counter()
+
+            # Commits counted after this point may be missing from the copy
+            with self._commits_lock:
+                commits = self._commits
+
+            path = get_db_path()
+            snapshot = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+
+            # Open the primary first so its schema version has been checked
+            get_connection()
+
+            # Read the version first - a commit racing the backup triggers another refresh
+            data_version = self._primary_version()
+
+            source = sqlite3.connect(path, isolation_level=None)
+            try:
+                # WAL: the backup's read transaction does not block the writer
+                source.backup(snapshot)
+            finally:
+                source.close()
+
+            snapshot.execute("PRAGMA query_only=1")
+
+            # Readers still holding the old connection finish on it; it closes when released
+            self._conn = snapshot
+            self._path = path
+            self._data_version = data_version
+
+            with self._commits_lock:
+                if self._commits == commits:
+                    self._dirty = False
+
+            self.refreshes += 1
+            self.last_refresh_ms = (time.perf_counter() - start) * 1000
+
+    def mark_dirty(self) -> None:
+        with self._commits_lock:
+            self._commits += 1
+            self._dirty = True
+        self._wake.set()
+
+    def stale(self) -> bool:
+        """
+        Whether the primary has moved on: a local commit, another DB path,
+        or a commit from another process.
+        """
+        return self._dirty or self._path != get_db_path() or self._primary_version() != self._data_version
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+            # Wait for the writes to settle - reads see them on the primary meanwhile
+            deadline = time.monotonic() + self.interval
+            while self._wake.wait(MIN_REFRESH_GAP) and time.monotonic() < deadline:
+                self._wake.clear()
+
+            try:
+                if self.stale():
+                    self.refresh()
+            except sqlite3.Error as e:
+                print("Snapshot refresh error:", e)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="patient-care-snapshot", daemon=True)
+                self._thread.start()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Connection for read-only queries. Until a local commit has been copied
+        into the snapshot, reads go to the primary so callers see their own writes.
+        """
+        if self._conn is None or self._path != get_db_path():
+            self.refresh()
+            self.start()
+
+        if self._dirty:
+            return get_connection()
+
+        return self._conn
+
+_snapshot = SnapshotManager()
+add_commit_listener(_snapshot.mark_dirty)
+
+def get_read_connection() -> sqlite3.Connection:
+    """
+    Connection for lookup tools, honouring PATIENT_CARE_DB_READ_MODE.
+    """
+    if READ_MODE == "snapshot":
+        return _snapshot.connection()
+
+    return get_connection()
+
+def get_snapshot() -> SnapshotManager:
+    return _snapshot
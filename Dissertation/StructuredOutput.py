@@ -0,0 +1,411 @@
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from Tracing import current_span
+
+# Re-asks after a hard parse/schema failure
+MAX_REASKS = int(os.getenv("STRUCTURED_MAX_REASKS", "1"))
+
+# Agents whose fields are acted on as-is - a cut-off answer is always re-asked
+STRICT_AGENTS = {"validation"}
+
+INTENTS = ["appointment", "order_medicine", "reminder", "general_advise"]
+INTENT_ALIASES = {"general_advice": "general_advise", "order_medicines": "order_medicine",
+                  "medicine_order": "order_medicine", "appointments": "appointment", "reminders": "reminder"}
+
+# Agent schemas - field: (types, required, default)
+SCHEMAS = {
+    "conversation": {
+        "reply": (str, True, None),
+        "intent": (str, True, None),
+        "entities": (dict, False, {}),
+        "ready_for_routing": (bool, False, False)
+    },
+    "validation": {
+        "reply": (str, False, ""),
+        "doctor_id": ((str, int), False, None),
+        "doctor_name": (str, False, None),
+        "date": (str, False, None),
+        "time": (str, False, None),
+        "day": (str, False, None),
+        "confirmed_by_user": (bool, False, False)
+    }
+}
+
+class StructuredOutputError(Exception):
+
+    def __init__(self, agent: str, errors: List[str], text: str):
+        super().__init__(f"{agent}: {'; '.join(errors)}")
+        self.agent = agent
+        self.errors = errors
+        self.text = text
+
+# Repair pass
+
+_FENCE = re.compile(r"```(?:json|JSON)?")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+def _normalize(text: str) -> Tuple[str, List[str], bool, List[Tuple[int, List[str]]]]:
+    """
+    One string-aware pass: single quotes -> double quotes, Python literals -> JSON,
+    trailing commas dropped. Returns (json, open brackets, inside a string, cut points).
+    Stops at the end of the first complete top-level value.
+    """
+    out = []
+    stack = []
+    quote = None
+    cuts = []
+    i = 0
+
+    while i < len(text):
+        ch = text[i]
+
+        if quote is not None:
+            if ch == "\\" and i + 1 < len(text):
+                # \' is not a JSON escape
+                out.append("'" if text[i + 1] == "'" else text[i:i + 2])
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':
+                out.append('\\"')
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append(_CLOSERS[ch])
+            out.append(ch)
+            cuts.append((len(out), list(stack)))
+        elif ch in "}]":
+            # Drop a trailing comma before the closer
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                return "".join(out), stack, False, cuts
+        elif ch == ",":
+            cuts.append((len(out), list(stack)))
+            out.append(ch)
+        elif ch.isalpha():
+            word = re.match(r"[A-Za-z_]+", text[i:]).group()
+            out.append(_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    return "".join(out), stack, quote is not None, cuts
+
+def _loads(text: str) -> Any:
+    return json.loads(text, strict=False)
+
+def _repair(text: str) -> Tuple[Optional[Any], bool]:
+    """
+    (value, truncated) - truncated when the answer stopped before its closing brace.
+    """
+    if not isinstance(text, str):
+        return None, False
+
+    text = _FENCE.sub("", text).translate(_SMART_QUOTES)
+    start = text.find("{")
+    if start < 0:
+        return None, False
+
+    normalized, stack, in_string, cuts = _normalize(text[start:])
+    truncated = bool(stack) or in_string
+
+    candidates = []
+    # Only closers missing - but never close a cut-off string, number or literal
+    if not in_string and (not stack or normalized.rstrip()[-1:] in ('"', "}", "]")):
+        candidates.append(normalized + "".join(reversed(stack)))
+    # Truncated mid-member - cut back to the last complete one
+    for position, open_stack in reversed(cuts):
+        candidates.append(normalized[:position] + "".join(reversed(open_stack)))
+
+    for candidate in candidates:
+        try:
+            return _loads(candidate), truncated
+        except ValueError:
+            continue
+
+    return None, truncated
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Best-effort parse of a model answer: code fences, preamble/epilogue,
+    single quotes, Python literals, trailing commas and truncated output.
+    A truncated answer keeps only its complete members.
+    """
+    return _repair(text)[0]
+
+# Schema validation with light coercion
+
+def _coerce(value: Any, types) -> Any:
+
+    if types is bool and isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes"):
+            return True
+        if lowered in ("false", "no", ""):
+            return False
+    if types is dict and value is None:
+        return {}
+    if types is str and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+
+    return value
+
+def validate(agent: str, data: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Check a parsed answer against the agent schema; returns (data, errors).
+    """
+    if not isinstance(data, dict):
+        return None, ["answer is not a JSON object"]
+
+    errors = []
+    result = dict(data)
+    for field, (types, required, default) in SCHEMAS[agent].items():
+        if result.get(field) is None:
+            if required:
+                errors.append(f"missing field '{field}'")
+            else:
+                result[field] = default
+            continue
+
+        value = _coerce(result[field], types)
+        if not isinstance(value, types):
+            errors.append(f"field '{field}' should be {getattr(types, '__name__', 'str')}")
+        result[field] = value
+
+    if agent == "conversation" and isinstance(result.get("intent"), str):
+        intent = result["intent"].strip().lower().replace(" ", "_")
+        intent = INTENT_ALIASES.get(intent, intent)
+        if intent not in INTENTS:
+            errors.append(f"intent must be one of {INTENTS}")
+        result["intent"] = intent
+
+    return (None if errors else result), errors
+
+def parse_structured(agent: str, text: str) -> Tuple[Optional[Dict[str, Any]], List[str], bool]:
+    """
+    (data, errors, repaired) for one model answer.
+    """
+    try:
+        data, repaired = _loads(text), False
+    except (TypeError, ValueError):
+        (data, truncated), repaired = _repair(text), True
+        if truncated and agent in STRICT_AGENTS:
+            return None, ["answer was cut off"], True
+        if data is None:
+            return None, ["no JSON object found"], True
+
+    result, errors = validate(agent, data)
+
+    return result, errors, repaired
+
+# Metrics
+
+_metrics = defaultdict(lambda: defaultdict(int))
+_metrics_lock = threading.Lock()
+
+def _count(agent: str, outcome: str) -> None:
+    with _metrics_lock:
+        _metrics[agent][outcome] += 1
+
+def metrics_summary() -> Dict[str, Dict[str, float]]:
+    summary = {}
+    with _metrics_lock:
+        for agent, counts in _metrics.items():
+            calls = counts["calls"] or 1
+            summary[agent] = {
+                **dict(counts),
+                "repair_rate": counts["repaired"] / calls,
+                "reask_rate": counts["reasked"] / calls,
+                "failure_rate": counts["failed"] / calls
+            }
+    return summary
+
+def _reask_message(agent: str, errors: List[str]) -> Dict[str, str]:
+    fields = ", ".join(f'"{f}"' for f in SCHEMAS[agent])
+    return {
+        "role": "user",
+        "content": f"Your previous answer could not be used ({'; '.join(errors)}). "
+                   f"Respond again with ONLY one JSON object with the fields {fields} and nothing else."
+    }
+
+async def ainvoke_structured(agent: str, llm: Any, messages: List[Any],
+                             max_reasks: int = MAX_REASKS) -> Dict[str, Any]:
+    """
+    Call the model and return its schema-checked JSON answer. Malformed output is
+    repaired locally; only a hard failure costs a re-ask. Raises StructuredOutputError.
+    """
+    _count(agent, "calls")
+    conversation = list(messages)
+
+    for attempt in range(max_reasks + 1):
+        response = await llm.ainvoke(conversation)
+        data, errors, repaired = parse_structured(agent, response.content)
+
+        if data is not None:
+            if repaired:
+                _count(agent, "repaired")
+            return data
+
+        _count(agent, "invalid_answers")
+        current = current_span()
+        if current is not None:
+            current.add("structured.invalid_answers")
+            current.set_attribute("structured.agent", agent)
+            current.set_attribute("structured.errors", "; ".join(errors))
+        if attempt < max_reasks:
+            _count(agent, "reasked")
+            conversation = list(messages) + [{"role": "assistant", "content": str(response.content)},
+                                             _reask_message(agent, errors)]
+
+    _count(agent, "failed")
+    raise StructuredOutputError(agent, errors, str(response.content))
+
+# Incremental parsing of a streamed answer
+
+_REPLY_START = re.compile(r'"reply"\s*:\s*"')
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+class ReplyFieldStream:
+    """
+    Incrementally decode the "reply" string of a JSON answer as tokens arrive.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = None
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+
+        if self.finished:
+            return ""
+        self.buffer += chunk
+
+        if self.position is None:
+            m = _REPLY_START.search(self.buffer)
+            if m is None:
+                return ""
+            self.position = m.end()
+
+        out = []
+        i = self.position
+        while i < len(self.buffer):
+            ch = self.buffer[i]
+            if ch == '"':
+                self.finished = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+
+            # Escape sequence - wait for the rest of it
+            if i + 1 >= len(self.buffer):
+                break
+            code = self.buffer[i + 1]
+            if code == "u":
+                if i + 6 > len(self.buffer):
+                    break
+                out.append(chr(int(self.buffer[i + 2:i + 6], 16)))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+
+        self.position = i
+
+        return "".join(out)
+
+class IncrementalJSONParser:
+    """
+    Streamed JSON answer: feed() returns new "reply" text, and each top-level
+    field is available in .fields as soon as its value is complete.
+    """
+
+    def __init__(self):
+        self.reply = ReplyFieldStream()
+        self.fields = {}
+        self.buffer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, chunk: str) -> str:
+
+        start = len(self.buffer)
+        self.buffer += chunk
+
+        for i in range(start, len(self.buffer)):
+            ch = self.buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._complete(i)
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                self._complete(i)
+                self._member_start = i + 1
+
+        return self.reply.feed(chunk)
+
+    def _complete(self, end: int) -> None:
+        if self._member_start is None:
+            return
+        member = self.buffer[self._member_start:end].strip()
+        if member:
+            try:
+                self.fields.update(_loads("{" + member + "}"))
+            except ValueError:
+                pass
+
+    def result(self, agent: str) -> Tuple[Optional[Dict[str, Any]], List[str], bool]:
+        return parse_structured(agent, self.buffer)
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse one agent answer")
+    parser.add_argument("text")
+    parser.add_argument("--agent", default="conversation", choices=sorted(SCHEMAS))
+    args = parser.parse_args()
+
+    print(parse_structured(args.agent, args.text))
@@ -0,0 +1,74 @@
+import json
+import os
+import time
+
+os.environ["TRACING"] = "0"
+
+from StructuredOutput import IncrementalJSONParser, parse_structured
+
+# Model answers seen in practice, for the parser report
+MALFORMED_SAMPLES = [
+    '{"reply": "Hello!", "intent": "general_advise", "entities": {}, "ready_for_routing": false}',
+    '```json\n{"reply": "Hello!", "intent": "general_advise", "entities": {}, "ready_for_routing": false}\n```',
+    'Sure, here is the JSON:\n{"reply": "Which date?", "intent": "appointment", "entities": {"symptoms": "fever"}, '
+    '"ready_for_routing": false}\nLet me know!',
+    '{"reply": "Noted.", "intent": "appointment", "entities": {"symptoms": "cough",}, "ready_for_routing": false,}',
+    "{'reply': 'Noted, I\\'ll check.', 'intent': 'appointment', 'entities': {}, 'ready_for_routing': False}",
+    '{"reply": "Line one\nline two", "intent": "reminder", "entities": {}, "ready_for_routing": "false"}',
+    '{"reply": "Please confirm the appointment with Dr. Rao on 20-Oct-26 at 10:00", "intent": "appointment", '
+    '"entities": {"patient_name": "Anita", "symptoms": "chest pain", "preferred_date": "20-Oct-26"',
+    '{"reply": "Booked details noted", "intent": "General Advice", "entities": null, "ready_for_routing": "no"}',
+    '{"reply": “Thank you”, "intent": "general_advise", "entities": {}, "ready_for_routing": false}',
+    'I can help you book an appointment. Which date works for you?',
+    '{"reply": "Thanks", "intent": "small_talk", "entities": {}, "ready_for_routing": false}',
+]
+
+def run_benchmark(repeat: int = 2000):
+
+    strict_ok = repaired_ok = 0
+    for sample in MALFORMED_SAMPLES:
+        try:
+            json.loads(sample)
+            strict_ok += 1
+        except ValueError:
+            pass
+        if parse_structured("conversation", sample)[0] is not None:
+            repaired_ok += 1
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sample in MALFORMED_SAMPLES:
+            parse_structured("conversation", sample)
+    per_parse = (time.perf_counter() - start) / (repeat * len(MALFORMED_SAMPLES))
+
+    # Streamed answer in 4-character chunks: when is the reply usable?
+    answer = json.dumps({"reply": "I can book a cardiologist for you. Which date suits you?",
+                         "intent": "appointment", "entities": {"symptoms": "chest pain", "speciality": "Cardiology"},
+                         "ready_for_routing": False})
+    chunks = [answer[i:i + 4] for i in range(0, len(answer), 4)]
+    parser = IncrementalJSONParser()
+    first_reply = reply_done = intent_known = None
+    for n, chunk in enumerate(chunks, 1):
+        if parser.feed(chunk) and first_reply is None:
+            first_reply = n
+        if "reply" in parser.fields and reply_done is None:
+            reply_done = n
+        if "intent" in parser.fields and intent_known is None:
+            intent_known = n
+
+    print(f"Benchmark: {len(MALFORMED_SAMPLES)} model answers (2 unusable by design)")
+    print(f"  json.loads:       {strict_ok}/{len(MALFORMED_SAMPLES)} parsed")
+    print(f"  parse_structured: {repaired_ok}/{len(MALFORMED_SAMPLES)} parsed and schema-valid "
+          f"({per_parse * 1e6:.0f} us per answer)")
+    print(f"  streamed answer ({len(chunks)} chunks): reply text from chunk {first_reply}, "
+          f"reply complete at chunk {reply_done}, intent known at chunk {intent_known}")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Structured output parsing for agent answers")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    run_benchmark(args.repeat)
@@ -17,8 +17,8 @@ from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from langgraph.prebuilt import tools_condition
 
-import os
-print("DB PATH:", os.path.abspath("PatientCareDB.db"))
+from Database import get_db_path
+print("DB PATH:", get_db_path())
 
 llm = ChatGroq(model="openai/gpt-oss-120b", temperature=0)
 
@@ -1,140 +1,167 @@
-import sqlite3
 from typing import List, Dict, Optional, Any
 from typing_extensions import TypedDict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+from Repository import get_repository
+from DoctorDirectory import get_directory
+from Availability import book_slot, next_free_slots
+from TriagePrefetch import classify_speciality, rank_candidates
+import PatientCache
 
 class State(TypedDict):
     appointment_details: Optional[Dict[str, Any]]
 
-# Tool Function - DB Lookup
+def to_db_date(date: str) -> str:
+    """
+    Convert '15-Feb-26' -> '2026-02-15' (SQLite DATE format)
+    """
+    date_obj = datetime.strptime(date, "%d-%b-%y")
+    return date_obj.strftime("%Y-%m-%d")
+
+# Tool Function - Directory Lookup
 def find_available_doctors (speciality: str) -> str:
     """
     Tool: Find doctors by speciality.
     """
 
-    conn = sqlite3.connect("PatientCareDB.db")
-    
-    cursor = conn.cursor()
-
-    base_query = """
-    SELECT
-        DOCTOR_ID,
-        NAME,
-        QUALIFICATION,
-        AVAILABLE_FROM,
-        AVAILABLE_TO,
-        AVAILABLE_DAYS
-    FROM DOCTOR
-    WHERE
-        SPECIALITY = ?
-        AND IS_ACTIVE = 1
-    ORDER BY AVAILABLE_FROM LIMIT 5
-    """
-
-    params = [speciality]
-    cursor.execute(base_query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [
-        {
-            "doctor_id": r[0],
-            "name": r[1],
-            "qualification": r[2],
-            "available_from": r[3],
-            "available_to": r[4],
-            "available_days": r[5]
-        }
-        for r in rows
-    ]
+    return get_directory().by_speciality(speciality, limit=5)
+
+def find_doctors_available_at (speciality: str, preferred_day: str, preferred_time: str) -> str:
+    """
+    Tool: Find doctors of a speciality whose schedule covers the preferred day and time.
+    preferred_day accepts a weekday (e.g. Tuesday) or a date in dd-MMM-yy format.
+    preferred_time accepts HH:mm or h:mm AM/PM.
+    """
+
+    return get_directory().available_at(preferred_day, preferred_time, speciality, limit=5)
+
+def find_next_available_slots (speciality: str, after_date: str, after_time: str) -> str:
+    """
+    Tool: Find the earliest free appointment slots for a speciality.
+    after_date in dd-MMM-yy format, after_time in HH:mm format.
+    """
+
+    after = datetime.strptime(f"{after_date} {after_time}", "%d-%b-%y %H:%M")
+
+    return next_free_slots(speciality, after, n=5)
 
 def get_doctor_schedule (name: str) -> str:
     """
     Tool: Retrieve doctor's schedule by name.
     """
 
-    conn = sqlite3.connect("PatientCareDB.db")
-    
-    cursor = conn.cursor()
-
-    base_query = """
-    SELECT
-        DOCTOR_ID,
-        SPECIALITY,
-        NAME,
-        QUALIFICATION,
-        AVAILABLE_FROM,
-        AVAILABLE_TO,
-        AVAILABLE_DAYS
-    FROM DOCTOR
-    WHERE
-        LOWER(NAME) like ?
-        AND IS_ACTIVE = 1
-    ORDER BY AVAILABLE_FROM LIMIT 5
-    """
-
-    params = [f"%{name.lower()}%"]
-    cursor.execute(base_query, params)
-    rows = cursor.fetchall()
-    conn.close()
-
-    return [
-        {
-            "doctor_id": r[0],
-            "speciality": r[1],
-            "name": r[2],
-            "qualification": r[3],
-            "available_from": r[4],
-            "available_to": r[5],
-            "available_days": r[6]
-        }
-        for r in rows
-    ]
+    return get_directory().search_by_name(name, limit=5)
+
+# Doctor candidates looked up alongside context retrieval, before triage
+CANDIDATE_LIMIT = 5
+
+def _booked_on(doctor_id: int, db_date: str) -> List[tuple]:
+    return [(time,) for _, time in get_repository().booked_times(doctor_id, db_date, db_date)]
+
+def find_doctor_candidates (doctor_name: Optional[str], speciality: Optional[str],
+                            preferred_date: Optional[str], preferred_time: Optional[str],
+                            symptoms: Any = None) -> List[Dict[str, Any]]:
+    """
+    Doctors for the request ranked by how well their free slots - schedule
+    less booked appointments - fit the preferred date and time. The named
+    doctor comes first if free at that time; otherwise the speciality (given, the named doctor's, or inferred
+    from the symptoms) is used. Empty when no speciality can be settled.
+    """
+
+    directory = get_directory()
+
+    if doctor_name:
+        named = rank_candidates(directory.search_by_name(doctor_name, limit=3), preferred_date, preferred_time,
+                                _booked_on)
+        matches = [d for d in named if d.get("match") == "available"]
+        if matches:
+            return matches
+        if named and not speciality:
+            speciality = named[0]["speciality"]
+
+    if not speciality:
+        speciality, _ = classify_speciality(symptoms)
+    if not speciality:
+        return []
+
+    doctors = directory.by_speciality(speciality, limit=None)
+
+    return rank_candidates(doctors, preferred_date, preferred_time, _booked_on)[:CANDIDATE_LIMIT]
 
 def get_patient_details (name: str) -> str:
     """
     Tool: Get Patient's details by name.
     """
 
-    conn = sqlite3.connect("PatientCareDB.db")
-    cursor = conn.cursor()
+    key = PatientCache.normalize_name(name)
+    if not key:
+        return 0
 
-    cursor.execute("""
-    SELECT PATIENT_ID
-    FROM PATIENT
-    WHERE LOWER(NAME)=LOWER(?)
-    """, (name,))
+    patient_id = PatientCache.patient_ids.get(key)
+    if patient_id is not None:
+        return patient_id
 
-    result = cursor.fetchone()
-    conn.close()
+    patient_id = get_repository().get_patient_id(key)
 
-    if result:
-        patient_id = result[0]
-        return patient_id
-    else:
-        return 0
+    # Unknown names are not cached - the patient may be registered elsewhere meanwhile
+    if patient_id:
+        PatientCache.patient_ids.put(key, patient_id)
+
+    return patient_id
     
 def get_symptom_details (patient_id: str) -> List[str]:
     """
     Tool: Fetch all symptoms recorded for a given patient_id.
     """
 
-    conn = sqlite3.connect("PatientCareDB.db")
-    cursor = conn.cursor()
+    patient_id = int(patient_id)
+    cached = PatientCache.symptom_history.get(patient_id)
+    if cached is not None:
+        return list(cached)
+
+    symptoms_list = get_repository().get_symptoms(patient_id)
+    PatientCache.symptom_history.put(patient_id, symptoms_list)
+
+    return list(symptoms_list)
+
+# Bounded past history handed to the context stage
+RELEVANT_HISTORY_K = 5
+RECENT_HISTORY_DAYS = 180
+RECENT_HISTORY_LIMIT = 3
+
+def search_symptom_history (patient_id: str, complaint: str, k: int = RELEVANT_HISTORY_K) -> List[str]:
+    """
+    Tool: Fetch the k past symptoms of a patient most relevant to the current complaint.
+    """
+
+    rows = get_repository().search_symptoms(int(patient_id), complaint, k)
 
-    cursor.execute("""
-            SELECT SYMPTOMS
-            FROM SYMPTOMS
-            WHERE PATIENT_ID = ?
-        """, (patient_id,))
+    return [row[0] for row in rows]
 
-    rows = cursor.fetchall()
-    conn.close()
+def get_recent_symptoms (patient_id: str, days: int = RECENT_HISTORY_DAYS,
+                         limit: int = RECENT_HISTORY_LIMIT) -> List[str]:
+    """
+    Tool: Fetch symptoms recorded for a patient in the last given days, newest first.
+    """
+
+    # CREATED_AT is CURRENT_TIMESTAMP (UTC)
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+    rows = get_repository().recent_symptoms(int(patient_id), since, None, limit)
+
+    return [row[0] for row in rows]
 
-    # Convert rows to simple list
-    symptoms_list = [row[0] for row in rows if row[0] is not None]
+def get_relevant_history (patient_id: str, complaint: str) -> List[str]:
+    """
+    Relevant past symptoms followed by recent ones, de-duplicated and bounded
+    to RELEVANT_HISTORY_K + RECENT_HISTORY_LIMIT entries.
+    """
 
-    return symptoms_list
+    history = []
+    for symptom in search_symptom_history(patient_id, complaint) + get_recent_symptoms(patient_id):
+        if symptom not in history:
+            history.append(symptom)
+
+    return history
 
 def book_appointment(state: State) -> str:
     """
@@ -148,55 +175,32 @@ def book_appointment(state: State) -> str:
     symptoms = details["symptoms"]
     time = details["time"]
 
-    # Convert '15-Feb-26' -> '2026-02-15' (SQLite DATE format)
-    date_obj = datetime.strptime(details["date"], "%d-%b-%y")
-    db_date = date_obj.strftime("%Y-%m-%d")
-
     try:
-        conn = sqlite3.connect("PatientCareDB.db")
-        cursor = conn.cursor()
-
-        # INSERT PATIENT if not present in Table
-        if patient_id == 0:
-            cursor.execute("""
-                        INSERT INTO PATIENT (NAME)
-                        VALUES (?)
-                    """, (patient_name,))
-
-            patient_id = cursor.lastrowid
-
-        # INSERT APPOINTMENT
-        cursor.execute("""
-            INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME)
-            VALUES (?, ?, ?, ?)
-        """, (patient_id, doctor_id, db_date, time))
+        db_date = to_db_date(details["date"])
+    except (ValueError, TypeError):
+        return {
+            "status": "unavailable",
+            "reason": f"unrecognised date {details['date']!r}"
+        }
 
-        appointment_id = cursor.lastrowid
+    try:
+        # Conflict check and inserts run in one transaction
+        appointment = book_slot(patient_id, patient_name, doctor_id, db_date, time, symptoms)
 
-        # INSERT SYMPTOMS
-        cursor.execute("""
-            INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS)
-            VALUES (?, ?)
-        """, (patient_id, symptoms))
+        # Write-through so the next turn sees the new PATIENT / SYMPTOMS rows
+        if appointment["status"] == "confirmed":
+            if patient_id == 0:
+                PatientCache.record_new_patient(patient_name, appointment["patient_id"])
+            PatientCache.record_symptoms(int(appointment["patient_id"]), symptoms)
 
-        # Commit transaction
-        conn.commit()
-
-        return {
-            "appointment_id": appointment_id,
-            "status": "confirmed"
-        }
+        return appointment
 
     except Exception as e:
-        conn.rollback()
         print("Database error:", e)
         return {
             "status": "failed"
         }
 
-    finally:
-        conn.close()
-
 def order_medicine(state: State) -> str:
     """
     Tool: Insert medicine order details into database
@@ -210,20 +214,7 @@ def order_medicine(state: State) -> str:
     shipping_address = details["shipping_address"]
 
     try:
-        conn = sqlite3.connect("PatientCareDB.db")
-        cursor = conn.cursor()
-
-        # INSERT APPOINTMENT
-        cursor.execute("""
-            INSERT INTO MEDICINE_ORDER (MEDICINE, DOSAGE, QUANTITY, SHIPPING_ADDRESS)
-            VALUES (?, ?, ?, ?)
-        """, (medicine, dosage, quantity, shipping_address))
-
-        # get generated ORDER_ID
-        order_id = cursor.lastrowid
-
-        # Commit transaction
-        conn.commit()
+        order_id = get_repository().insert_medicine_order(medicine, dosage, quantity, shipping_address)
 
         return {
             "order_id": order_id,
@@ -231,15 +222,11 @@ def order_medicine(state: State) -> str:
         }
 
     except Exception as e:
-        conn.rollback()
         print("Database error:", e)
         return {
             "status": "failed"
         }
 
-    finally:
-        conn.close()
-
 def get_current_date() -> str:
     """
     Tool: Get current system date
@@ -0,0 +1,253 @@
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Local span export (OpenTelemetry field names, one span per JSONL line) - opt-in
+TRACING_ENABLED = os.getenv("TRACING", "0") == "1"
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(tempfile.gettempdir(), "patient-care-traces.jsonl"))
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+SERVICE_NAME = "patient-care-workflow"
+FLUSH_EVERY = 256
+
+# Counters added up from child spans into their ancestors (node and turn totals)
+ROLLUP_ATTRIBUTES = ["llm.calls", "llm.input_tokens", "llm.output_tokens", "db.queries", "db.time_ms", "tool.calls"]
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+
+    __slots__ = ("name", "trace_id", "span_id", "parent", "kind", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, parent: Optional["Span"], kind: str, attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes or {})
+        self.status = {"code": "UNSET"}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent.span_id if self.parent is not None else None,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": (self.end_ns - self.start_ns) / 1e6,
+            "attributes": self.attributes,
+            "status": self.status,
+            "resource": {"service.name": SERVICE_NAME}
+        }
+
+class JSONLExporter:
+    """
+    Buffered span writer; flushes at the end of a trace, every FLUSH_EVERY
+    spans and at exit. The file is rotated to <file>.1 past TRACE_MAX_BYTES.
+    """
+
+    def __init__(self, path: str, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._buffer.append(span.to_dict())
+            full = len(self._buffer) >= FLUSH_EVERY
+        if full or span.parent is None:
+            self.flush()
+
+    def flush(self) -> None:
+
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+            except OSError as e:
+                print(f"Trace export failed: {e}")
+
+_exporter: Optional[JSONLExporter] = JSONLExporter(TRACE_FILE) if TRACING_ENABLED else None
+if _exporter is not None:
+    atexit.register(_exporter.flush)
+
+def set_exporter(exporter: Optional[JSONLExporter]) -> None:
+    global _exporter
+    _exporter = exporter
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, kind: str = "INTERNAL") -> Iterator[Optional[Span]]:
+    """
+    Open a child of the current span (or a new trace). Yields None when tracing is off.
+    """
+    if _exporter is None:
+        yield None
+        return
+
+    current = Span(name, _current_span.get(), kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+        current.status = {"code": "OK"}
+    except BaseException as e:
+        current.status = {"code": "ERROR", "message": f"{type(e).__name__}: {e}"}
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Closed from another context (async generator resumed elsewhere)
+            _current_span.set(current.parent)
+
+        # Roll counters up to the parent - it passes them on when it ends
+        if current.parent is not None:
+            for key in ROLLUP_ATTRIBUTES:
+                if key in current.attributes:
+                    current.parent.add(key, current.attributes[key])
+
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(current)
+
+def traced(name: str, **attributes):
+    """
+    Decorator: run a sync or async function inside a span.
+    """
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+def traced_node(name: str, fn):
+    return traced(f"node.{name}", **{"node.name": name})(fn)
+
+def traced_tool(name: str, fn):
+    return traced(f"tool.{name}", **{"tool.name": name, "tool.calls": 1})(fn)
+
+def record_llm_usage(current: Optional[Span], response: Any) -> None:
+    """
+    Token counts from a LangChain message's usage_metadata.
+    """
+    if current is None:
+        return
+    usage = getattr(response, "usage_metadata", None) or {}
+    current.set_attribute("llm.calls", 1)
+    if usage:
+        current.set_attribute("llm.input_tokens", usage.get("input_tokens", 0))
+        current.set_attribute("llm.output_tokens", usage.get("output_tokens", 0))
+
+# Trace file summary
+
+def _percentile(ordered: List[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    spans = []
+    for candidate in (path + ".1", path):
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    return spans
+
+def summarize(spans: List[Dict[str, Any]], prefix: str = "") -> List[Dict[str, Any]]:
+    """
+    Per span name: count, p50/p95/p99/mean wall time and average rolled-up counters.
+    """
+    by_name = defaultdict(list)
+    for row in spans:
+        if row["name"].startswith(prefix):
+            by_name[row["name"]].append(row)
+
+    summary = []
+    for name, rows in by_name.items():
+        durations = sorted(r["duration_ms"] for r in rows)
+        entry = {
+            "name": name,
+            "count": len(rows),
+            "errors": sum(1 for r in rows if r.get("status", {}).get("code") == "ERROR"),
+            "p50_ms": _percentile(durations, 0.50),
+            "p95_ms": _percentile(durations, 0.95),
+            "p99_ms": _percentile(durations, 0.99),
+            "mean_ms": sum(durations) / len(durations)
+        }
+        for key in ROLLUP_ATTRIBUTES:
+            entry[key] = sum(r["attributes"].get(key, 0) for r in rows) / len(rows)
+        summary.append(entry)
+
+    # Turns first, then nodes, LLM, tools and DB, slowest first within a group
+    order = {"turn": 0, "node": 1, "llm": 2, "tool": 3, "db": 4}
+    summary.sort(key=lambda e: (order.get(e["name"].split(".")[0], 5), -e["p95_ms"]))
+
+    return summary
+
+def print_summary(summary: List[Dict[str, Any]]) -> None:
+
+    print(f"{'span':<34}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'LLM tok in/out':>18}{'DB ms':>9}{'tools':>7}")
+    for e in summary:
+        tokens = f"{e['llm.input_tokens']:.0f}/{e['llm.output_tokens']:.0f}" if e["llm.calls"] else "-"
+        print(f"{e['name']:<34}{e['count']:>7}{e['errors']:>5}{e['p50_ms']:>10.1f}{e['p95_ms']:>10.1f}"
+              f"{e['p99_ms']:>10.1f}{tokens:>18}{e['db.time_ms']:>9.1f}{e['tool.calls']:>7.1f}")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize workflow traces")
+    parser.add_argument("command", choices=["summarize"])
+    parser.add_argument("trace_file", nargs="?", default=TRACE_FILE)
+    parser.add_argument("--prefix", default="", help="only span names starting with this, e.g. node.")
+    args = parser.parse_args()
+
+    spans = load_spans(args.trace_file)
+    if not spans:
+        print(f"No spans in {args.trace_file}")
+    else:
+        print(f"{len(spans)} spans, {len({s['trace_id'] for s in spans})} traces from {args.trace_file}")
+        print_summary(summarize(spans, args.prefix))
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import time
+
+os.environ["TRACING"] = "0"
+
+import Tracing
+from Tracing import JSONLExporter, set_exporter, span
+
+# Cost of one span: create, roll counters up, export to a scratch file
+def run_benchmark(spans: int = 20000):
+
+    with tempfile.TemporaryDirectory() as scratch:
+        exporter = JSONLExporter(os.path.join(scratch, "overhead.jsonl"))
+        set_exporter(exporter)
+        start = time.perf_counter()
+        for _ in range(spans // 4):
+            with span("turn"):
+                with span("node.triage"):
+                    with span("llm.triage") as s:
+                        s.set_attribute("llm.calls", 1)
+                    with span("db.find_doctor_candidates") as s:
+                        s.set_attribute("db.queries", 1)
+        per_span = (time.perf_counter() - start) / spans
+        exported = len(Tracing.load_spans(exporter.path))
+        set_exporter(None)
+
+    print(f"Benchmark: {spans} spans ({exported} exported)")
+    print(f"  overhead (create, roll up, export): {per_span * 1e6:.1f} us per span")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Span overhead")
+    parser.add_argument("--spans", type=int, default=20000)
+    args = parser.parse_args()
+
+    run_benchmark(args.spans)
@@ -0,0 +1,182 @@
+import re
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from Availability import HORIZON_DAYS
+from Schedule import SLOT_MINUTES, overlaps_booking, parse_day, parse_days, parse_time
+
+# (doctor_id, 'YYYY-MM-DD') -> booked [(TIME,)] rows, as _check_slot sees them
+BookedTimes = Callable[[Any, str], Iterable[Tuple[str]]]
+
+# Symptom keywords per speciality - whole words (plurals allowed), "*" marks a stem
+SPECIALITY_KEYWORDS = {
+    "Cardiology": ["chest pain", "palpitat*", "heart", "breathless on exertion", "high blood pressure",
+                   "hypertension", "irregular heartbeat", "angina", "swollen ankle"],
+    "Orthopedics": ["fracture*", "joint", "knee", "back pain", "shoulder", "sprain*", "bone", "hip",
+                    "neck pain", "arthritis", "ligament"],
+    "Gynecology": ["period", "menstrua*", "pregnan*", "pelvic", "vaginal", "menopause", "pcos", "ovar*"],
+    "Pediatrics": ["child", "children", "baby", "infant", "toddler", "my son", "my daughter", "vaccination"],
+    "Dermatology": ["rash", "itch*", "skin", "acne", "eczema", "psoriasis", "hair loss", "mole", "pimple"],
+    "Neurology": ["migraine", "seizure", "numb*", "tingling", "dizz*", "vertigo", "memory loss", "tremor",
+                  "headache", "stroke", "fainting"],
+    "Psychiatry": ["anxiety", "anxious", "depress*", "panic", "insomnia", "sleepless*", "stress*", "mood",
+                   "suicid*", "hallucinat*"],
+    "ENT": ["ear", "throat", "sinus*", "tonsil*", "hearing", "nose bleed", "blocked nose", "hoarse*"],
+    "Ophthalmology": ["eye", "vision", "blurr*", "cataract", "red eye", "watery eye"],
+    "Pulmonology": ["cough*", "wheez*", "asthma*", "shortness of breath", "breathing difficulty", "phlegm",
+                    "sputum", "tuberculosis"],
+    "Gastroenterology": ["stomach", "abdominal", "acidity", "heartburn", "diarrh*", "constipat*", "vomit*",
+                         "nausea", "bloat*", "indigestion", "jaundice"],
+    "Endocrinology": ["diabet*", "thyroid", "blood sugar", "weight gain", "excessive thirst", "hormon*"],
+    "Nephrology": ["kidney", "urine", "urinary", "dialysis", "creatinine", "swelling of feet", "renal"],
+    "General Medicine": ["fever*", "cold", "flu", "body ache", "fatigue", "weakness", "viral", "chills"]
+}
+
+# General Medicine keywords are weak evidence - a specific match beats them
+GENERAL_WEIGHT = 0.5
+MIN_SCORE = 1.0
+
+def _keyword_pattern(keyword: str):
+    if keyword.endswith("*"):
+        return re.compile(r"\b" + re.escape(keyword[:-1]), re.I)
+    # "ear" must not match "early"
+    return re.compile(r"\b" + re.escape(keyword) + r"(?:s|es)?\b", re.I)
+
+_PATTERNS = [
+    (speciality, _keyword_pattern(keyword), GENERAL_WEIGHT if speciality == "General Medicine" else 1.0)
+    for speciality, keywords in SPECIALITY_KEYWORDS.items()
+    for keyword in keywords
+]
+
+def classify_speciality(symptoms: Any) -> Tuple[Optional[str], float]:
+    """
+    Local symptom -> speciality guess: (speciality, score) or (None, 0.0).
+    """
+    if isinstance(symptoms, list):
+        symptoms = ", ".join(str(s) for s in symptoms)
+    if not symptoms:
+        return None, 0.0
+
+    scores = defaultdict(float)
+    for speciality, pattern, weight in _PATTERNS:
+        if pattern.search(symptoms):
+            scores[speciality] += weight
+
+    if not scores:
+        return None, 0.0
+
+    ranked = sorted(scores.items(), key=lambda s: -s[1])
+
+    # Symptoms only matching "fever"-type keywords still go to General Medicine
+    if ranked[0][0] == "General Medicine" and len(ranked) == 1:
+        return "General Medicine", MIN_SCORE
+    if ranked[0][1] < MIN_SCORE:
+        return None, 0.0
+
+    # A tie between specific specialities is left to the LLM
+    if len(ranked) > 1 and ranked[1][1] == ranked[0][1] and ranked[1][0] != "General Medicine":
+        return None, 0.0
+
+    return ranked[0][0], ranked[0][1]
+
+def _free_slots(start: int, end: int, taken: Iterable[Tuple[str]]) -> List[int]:
+    """
+    Slot starts on the SLOT_MINUTES grid from start that no booking overlaps.
+    """
+    taken = list(taken)
+    return [
+        minute for minute in range(start, end - SLOT_MINUTES + 1, SLOT_MINUTES)
+        if not overlaps_booking(taken, f"{minute // 60:02d}:{minute % 60:02d}")
+    ]
+
+def _match(doctor: Dict[str, Any], day: int, minute: int, on: Optional[date] = None,
+           booked: Optional[BookedTimes] = None) -> Optional[Tuple[int, int, Dict[str, Any]]]:
+    """
+    (tier, distance, suggestion) - tier 0 has a free slot at the time, 1 on that day, 2 on a later day.
+    With a date and booked times, slots taken by appointments are skipped like in
+    Availability; suggested times are always bookable slots.
+    """
+    try:
+        start = parse_time(doctor["available_from"])
+        end = parse_time(doctor["available_to"])
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+    days = parse_days(doctor["available_days"])
+    if not days:
+        return None
+
+    for ahead in range(HORIZON_DAYS + 1):
+        if (day + ahead) % 7 not in days:
+            continue
+
+        taken = ()
+        if on is not None and booked is not None:
+            taken = booked(doctor["doctor_id"], (on + timedelta(days=ahead)).isoformat())
+
+        free = _free_slots(start, end, taken)
+        if not free:
+            # A window shorter than one slot is never bookable
+            if not taken:
+                return None
+            continue
+        suggested = min(free, key=lambda m: (abs(m - minute), m))
+        suggested_time = f"{suggested // 60:02d}:{suggested % 60:02d}"
+
+        if ahead == 0:
+            if suggested == minute:
+                return 0, 0, {"match": "available"}
+            return 1, abs(suggested - minute), {"match": "same day, different time", "suggested_time": suggested_time}
+
+        details = {
+            "match": "different day",
+            "suggested_day": datetime(2024, 1, 1 + (day + ahead) % 7).strftime("%A"),
+            "suggested_time": suggested_time
+        }
+        if on is not None:
+            details["suggested_date"] = (on + timedelta(days=ahead)).strftime("%d-%b-%y")
+        return 2, ahead * 1440 + abs(suggested - minute), details
+
+    return None
+
+def rank_candidates(doctors: List[Dict[str, Any]], preferred_day: Optional[str],
+                    preferred_time: Optional[str], booked: Optional[BookedTimes] = None) -> List[Dict[str, Any]]:
+    """
+    Order doctors by how well their free slots fit the preferred day and time.
+    booked is only consulted for a dd-MMM-yy date; a weekday name ranks on
+    schedules alone. Doctors with nothing free within HORIZON_DAYS are left out,
+    and without a usable day/time the directory order is kept.
+    """
+    try:
+        day, minute = parse_day(preferred_day), parse_time(preferred_time)
+    except (ValueError, AttributeError, TypeError):
+        return [dict(d) for d in doctors]
+
+    try:
+        on = datetime.strptime(preferred_day.strip(), "%d-%b-%y").date()
+    except ValueError:
+        on = None
+
+    ranked = []
+    for position, doctor in enumerate(doctors):
+        fit = _match(doctor, day, minute, on, booked)
+        if fit is None:
+            continue
+        tier, distance, details = fit
+        ranked.append((tier, distance, position, {**doctor, **details}))
+
+    ranked.sort(key=lambda r: r[:3])
+
+    return [r[3] for r in ranked]
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Triage prefetch: speciality inference and candidate ranking")
+    parser.add_argument("command", choices=["classify"])
+    parser.add_argument("text")
+    args = parser.parse_args()
+
+    print(classify_speciality(args.text))
@@ -0,0 +1,33 @@
+import time
+
+from TriagePrefetch import classify_speciality, rank_candidates
+
+# Cost of the local classify + rank step that replaces the triage tool round
+def run_benchmark(repeat: int = 2000):
+
+    doctors = [
+        {"doctor_id": i, "name": f"Dr. {i}", "speciality": "Cardiology",
+         "available_from": f"{8 + i % 5:02d}:00", "available_to": f"{13 + i % 5:02d}:00",
+         "available_days": ["Mon,Wed,Fri", "Tue,Thu", "Mon,Tue,Wed,Thu,Fri", "Sat"][i % 4]}
+        for i in range(40)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        classify_speciality("chest pain and breathlessness")
+        ranked = rank_candidates(doctors, "Tuesday", "16:30")
+    per_call = (time.perf_counter() - start) / repeat
+
+    print(f"Benchmark: classify + rank {len(doctors)} doctors: {per_call * 1e6:.0f} us")
+    print(f"  top match for Tuesday 16:30: {ranked[0]['name']} ({ranked[0]['match']})")
+    print("  LLM calls per triage: 2 with a tool round (tool call + answer), 1 with prefetched candidates")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Triage prefetch benchmark")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    run_benchmark(args.repeat)
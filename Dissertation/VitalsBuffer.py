@@ -0,0 +1,148 @@
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Features import FEATURES
+
+# Smoothing factor for the exponentially weighted moving average
+EWMA_ALPHA = float(os.getenv("VITALS_EWMA_ALPHA", "0.1"))
+
+# Re-sum the window from the array every this many appends (float drift)
+RESUM_EVERY = 4096
+
+def _push(ring: memoryview, ends: list, column: memoryview, head: int, x: float, capacity: int, low: bool) -> None:
+    """
+    Add slot head (value x, already written to column) to a monotonic queue of
+    slots held in ring[first:last] (modulo capacity). The entry that left the
+    window is the one in the slot just overwritten, so at most capacity are live.
+    """
+    first, last = ends
+    if first < last and ring[first % capacity] == head:
+        first += 1
+    while first < last:
+        back = column[ring[(last - 1) % capacity]]
+        if (back < x) if low else (back > x):
+            break
+        last -= 1
+    ring[last % capacity] = head
+    ends[0], ends[1] = first, last + 1
+
+class VitalsBuffer:
+    """
+    Fixed-capacity columnar ring of vitals and timestamps.
+
+    Every row is written twice, at i and i + capacity, so the newest n rows are
+    always one contiguous slice: window() and column() return views, no copies.
+    append() is O(1); the rolling mean uses a running sum, min/max use monotonic
+    queues and the EWMA is updated on every append, so reading them is O(1) too.
+    The queues are preallocated rings of slot indexes, so the footprint is
+    fixed at construction (see nbytes).
+    """
+
+    def __init__(self, capacity: int, features: Sequence[str] = FEATURES, alpha: float = EWMA_ALPHA):
+        self.capacity = capacity
+        self.features = list(features)
+        self.alpha = alpha
+        self._index = {f: i for i, f in enumerate(self.features)}
+
+        self.values = np.full((2 * capacity, len(self.features)), np.nan, dtype=np.float32)
+        self.timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self.head = 0
+        self.count = 0
+        self.appended = 0
+
+        self._sum = np.zeros(len(self.features), dtype=np.float64)
+        self._ewma = None
+
+        # Monotonic queues of ring slots, capacity entries per feature; the slot of
+        # the row leaving the window is the one append() overwrites
+        slot = np.min_scalar_type(capacity)
+        self._min = np.zeros((len(self.features), capacity), dtype=slot)
+        self._max = np.zeros((len(self.features), capacity), dtype=slot)
+        self._min_ends = [[0, 0] for _ in self.features]
+        self._max_ends = [[0, 0] for _ in self.features]
+
+        # Element access from Python is several times faster through memoryviews
+        self._columns = [memoryview(self.values[:capacity, j]) for j in range(len(self.features))]
+        self._min_rings = [memoryview(ring) for ring in self._min]
+        self._max_rings = [memoryview(ring) for ring in self._max]
+
+    def append(self, row: Sequence[float], timestamp: float) -> None:
+
+        capacity = self.capacity
+        head = self.head
+
+        if self.count == capacity:
+            # Oldest row leaves the window
+            self._sum -= self.values[head]
+        else:
+            self.count += 1
+
+        self.values[head] = row
+        self.values[head + capacity] = self.values[head]
+        self.timestamps[head] = timestamp
+        self.timestamps[head + capacity] = timestamp
+        self.head = (head + 1) % capacity
+
+        # Aggregates follow the stored float32 values, so adds and removals cancel exactly
+        row = self.values[head].astype(np.float64)
+        self._sum += row
+
+        self._ewma = row.copy() if self._ewma is None else self._ewma + self.alpha * (row - self._ewma)
+
+        for j, x in enumerate(row.tolist()):
+            column = self._columns[j]
+            _push(self._min_rings[j], self._min_ends[j], column, head, x, capacity, True)
+            _push(self._max_rings[j], self._max_ends[j], column, head, x, capacity, False)
+
+        self.appended += 1
+        if self.appended % RESUM_EVERY == 0:
+            self._sum = self.window()[1].sum(axis=0, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def window(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (timestamps, values) of the newest n rows, oldest first - views into the buffer.
+        """
+        n = self.count if n is None else min(n, self.count)
+        end = self.head + self.capacity
+        return self.timestamps[end - n:end], self.values[end - n:end]
+
+    def column(self, feature: str, n: Optional[int] = None) -> np.ndarray:
+        return self.window(n)[1][:, self._index[feature]]
+
+    def mean(self) -> np.ndarray:
+        return self._sum / self.count if self.count else np.full(len(self.features), np.nan)
+
+    def _front(self, rings: list, ends: list) -> np.ndarray:
+        if not self.count:
+            return np.full(len(self.features), np.nan)
+        capacity = self.capacity
+        return np.array([column[ring[first % capacity]]
+                         for column, ring, (first, _) in zip(self._columns, rings, ends)])
+
+    def minimum(self) -> np.ndarray:
+        return self._front(self._min_rings, self._min_ends)
+
+    def maximum(self) -> np.ndarray:
+        return self._front(self._max_rings, self._max_ends)
+
+    def ewma(self) -> np.ndarray:
+        return self._ewma if self._ewma is not None else np.full(len(self.features), np.nan)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Rolling aggregates over the window, per feature.
+        """
+        mean, low, high, ewma = self.mean(), self.minimum(), self.maximum(), self.ewma()
+        return {
+            feature: {"mean": float(mean[i]), "min": float(low[i]), "max": float(high[i]), "ewma": float(ewma[i])}
+            for i, feature in enumerate(self.features)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.timestamps.nbytes + self._min.nbytes + self._max.nbytes
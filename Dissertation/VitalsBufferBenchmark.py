@@ -0,0 +1,61 @@
+import time
+from collections import deque
+from typing import Sequence
+
+import pandas as pd
+
+from Features import FEATURES
+from VitalsBuffer import VitalsBuffer
+from VitalsGenerator import generate
+
+# Dashboard refresh: DataFrame rebuilt from a deque of dicts vs the columnar ring
+def run_benchmark(appends: int = 100000, refreshes: int = 200, lengths: Sequence[int] = (100, 1000, 10000)):
+
+    rows = generate(appends, "wearable", seed=0)
+    dict_rows = [dict(zip(FEATURES, r)) for r in rows.tolist()]
+
+    print(f"Benchmark: {appends} appends, dashboard refresh averaged over {refreshes} calls")
+    print(f"  {'history':>8}  {'deque append':>13}  {'buffer append':>14}  "
+          f"{'DataFrame refresh':>18}  {'buffer refresh':>15}  {'buffer bytes':>13}")
+
+    for length in lengths:
+        history = deque(maxlen=length)
+        start = time.perf_counter()
+        for r in dict_rows:
+            history.append(r)
+        deque_append = (time.perf_counter() - start) / appends
+
+        buffer = VitalsBuffer(length)
+        start = time.perf_counter()
+        for i, r in enumerate(rows):
+            buffer.append(r, float(i))
+        buffer_append = (time.perf_counter() - start) / appends
+
+        # Old refresh: rebuild a DataFrame and pull the plotted columns
+        start = time.perf_counter()
+        for _ in range(refreshes):
+            df = pd.DataFrame(history)
+            for feature in FEATURES:
+                df[feature]
+        frame_refresh = (time.perf_counter() - start) / refreshes
+
+        # New refresh: views for the plot plus the rolling summary
+        start = time.perf_counter()
+        for _ in range(refreshes):
+            for feature in FEATURES:
+                buffer.column(feature)
+            buffer.summary()
+        buffer_refresh = (time.perf_counter() - start) / refreshes
+
+        print(f"  {length:>8}  {deque_append * 1e6:>10.2f} us  {buffer_append * 1e6:>11.2f} us  "
+              f"{frame_refresh * 1e3:>15.2f} ms  {buffer_refresh * 1e6:>12.1f} us  {buffer.nbytes:>13}")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Columnar vitals ring buffer")
+    parser.add_argument("--appends", type=int, default=100000)
+    args = parser.parse_args()
+
+    run_benchmark(args.appends)
@@ -0,0 +1,168 @@
+import os
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from Features import FEATURES
+
+# Per feature (mean, sd, low, high), in FEATURES order:
+# heart_rate (bpm), spo2 (%), temperature_f (Fahrenheit), stress (scale 1-10)
+BASELINE = [(72, 10, 60, 100), (97, 2, 95, 100), (98, 1, 97, 99), (3, 2, 1, 6)]
+
+# What the simulated watches send - wider than the training baseline
+WEARABLE = [(72, 20, 60, 120), (97, 3, 90, 100), (98, 3, 97, 102), (3, 2, 1, 10)]
+
+# Anomalous ranges from generate_anomalous_data (IsolationForest notebook)
+TACHYCARDIA = (95, 7, 80, 120)      # tachycardia but not extreme
+HYPOXIA = (93, 1.5, 88, 95)         # mild hypoxia
+FEVER = (100.2, 0.8, 99, 102)       # low grade fever
+HIGH_STRESS = (7, 1.5, 5, 10)       # high stress
+
+PROFILES = {
+    "baseline": BASELINE,
+    "wearable": WEARABLE,
+    "tachycardia": [TACHYCARDIA, BASELINE[1], BASELINE[2], BASELINE[3]],
+    "hypoxia": [BASELINE[0], HYPOXIA, BASELINE[2], BASELINE[3]],
+    "fever": [BASELINE[0], BASELINE[1], FEVER, BASELINE[3]],
+    "stress": [BASELINE[0], BASELINE[1], BASELINE[2], HIGH_STRESS],
+    "anomalous": [TACHYCARDIA, HYPOXIA, FEVER, HIGH_STRESS]
+}
+
+ANOMALY_PROFILES = ["tachycardia", "hypoxia", "fever", "stress", "anomalous"]
+
+CHUNK_ROWS = 1_000_000
+
+Profile = Union[str, Sequence[Tuple[float, float, float, float]]]
+
+def _parameters(profile: Profile) -> np.ndarray:
+    spec = PROFILES[profile] if isinstance(profile, str) else profile
+    params = np.asarray(spec, dtype=np.float64)
+    if params.shape != (len(FEATURES), 4):
+        raise ValueError(f"Profile needs (mean, sd, low, high) for each of {FEATURES}")
+    return params
+
+def generate(n: int, profile: Profile = "baseline", seed: Optional[int] = None,
+             rng: Optional[Union[np.random.Generator, np.random.RandomState]] = None,
+             dtype=np.float64) -> np.ndarray:
+    """
+    n x len(FEATURES) readings in one shot: clipped normals per feature.
+    Same seed, same array. A legacy RandomState gives the rows a loop of
+    np.random.normal calls per reading would, so np.random.seed-era data can be rebuilt.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    dtype = np.dtype(dtype)
+    params = _parameters(profile).astype(dtype)
+
+    if isinstance(rng, np.random.RandomState):
+        # Legacy streams only draw float64
+        out = rng.standard_normal((n, len(FEATURES))).astype(dtype, copy=False)
+    else:
+        out = rng.standard_normal((n, len(FEATURES)), dtype=dtype)
+    out *= params[:, 1]
+    out += params[:, 0]
+    np.clip(out, params[:, 2], params[:, 3], out=out)
+
+    return out
+
+def generate_labeled(n: int, anomaly_rate: float = 0.1, profiles: Sequence[Profile] = ANOMALY_PROFILES,
+                     seed: Optional[int] = None, rng: Optional[np.random.Generator] = None,
+                     dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Baseline rows with anomalies injected at random positions: (X, y), y = 1 for anomalies.
+    Anomalous rows are split evenly across the given profiles.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    X = generate(n, "baseline", rng=rng, dtype=dtype)
+    y = np.zeros(n, dtype=np.int8)
+
+    anomalies = rng.choice(n, size=int(round(n * anomaly_rate)), replace=False)
+    for profile, rows in zip(profiles, np.array_split(anomalies, len(profiles))):
+        X[rows] = generate(len(rows), profile, rng=rng, dtype=dtype)
+    y[anomalies] = 1
+
+    return X, y
+
+def iter_chunks(rows: int, profile: Profile = "baseline", anomaly_rate: float = 0.0, seed: Optional[int] = None,
+                chunk_rows: int = CHUNK_ROWS, dtype=np.float64) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (X, y) chunks with constant memory. Each chunk has its own child seed,
+    so a dataset is reproducible from (seed, chunk_rows) alone.
+    """
+    chunks = -(-rows // chunk_rows)
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(chunks)):
+        rng = np.random.default_rng(child)
+        n = min(chunk_rows, rows - i * chunk_rows)
+        if anomaly_rate > 0:
+            yield generate_labeled(n, anomaly_rate, rng=rng, dtype=dtype)
+        else:
+            yield generate(n, profile, rng=rng, dtype=dtype), np.zeros(n, dtype=np.int8)
+
+def write_dataset(path: str, rows: int, profile: Profile = "baseline", anomaly_rate: float = 0.0,
+                  seed: Optional[int] = None, chunk_rows: int = CHUNK_ROWS, dtype=np.float32) -> str:
+    """
+    Write a dataset chunk by chunk. .npy goes to a memory-mapped array (plus
+    <name>.labels.npy when anomalies are injected); .parquet needs pyarrow.
+    """
+    chunks = iter_chunks(rows, profile, anomaly_rate, seed, chunk_rows, dtype)
+
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+
+        writer = None
+        try:
+            for X, y in chunks:
+                columns = {feature: X[:, i] for i, feature in enumerate(FEATURES)}
+                if anomaly_rate > 0:
+                    columns["label"] = y
+                table = pa.table(columns)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return path
+
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.dtype(dtype), shape=(rows, len(FEATURES)))
+    labels = None
+    if anomaly_rate > 0:
+        labels = np.lib.format.open_memmap(os.path.splitext(path)[0] + ".labels.npy", mode="w+",
+                                           dtype=np.int8, shape=(rows,))
+    start = 0
+    for X, y in chunks:
+        out[start:start + len(X)] = X
+        if labels is not None:
+            labels[start:start + len(y)] = y
+        start += len(X)
+
+    out.flush()
+    if labels is not None:
+        labels.flush()
+
+    return path
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Synthetic smartwatch vitals")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="write a dataset to .npy or .parquet")
+    build.add_argument("path")
+    build.add_argument("--rows", type=int, default=1_000_000)
+    build.add_argument("--profile", default="baseline", choices=sorted(PROFILES))
+    build.add_argument("--anomaly-rate", type=float, default=0.0, help="inject anomalies into baseline rows")
+    build.add_argument("--seed", type=int, default=None)
+    build.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    build.add_argument("--dtype", default="float32", choices=["float32", "float64"])
+
+    args = parser.parse_args()
+
+    write_dataset(args.path, args.rows, args.profile, args.anomaly_rate, args.seed, args.chunk_rows, args.dtype)
+    print(f"Wrote {args.rows:,} rows to {args.path}")
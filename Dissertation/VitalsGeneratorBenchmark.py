@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from VitalsGenerator import CHUNK_ROWS, generate, write_dataset
+
+# Per-row simulate_data() (the old monitor and notebook) vs one vectorized draw
+def run_benchmark(rows: int = 50000, dataset_rows: int = 10_000_000):
+
+    def simulate_data():
+        return {
+            'heart_rate': np.clip(np.random.normal(72, 10), 60, 100),
+            'spo2': np.clip(np.random.normal(97, 2), 95, 100),
+            'temperature_f': np.clip(np.random.normal(98, 1), 97, 99),
+            'stress': np.clip(np.random.normal(3, 2), 1, 6)
+        }
+
+    start = time.perf_counter()
+    pd.DataFrame([simulate_data() for _ in range(rows)])
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generate(rows, seed=0)
+    new = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "vitals.npy")
+        start = time.perf_counter()
+        write_dataset(path, dataset_rows, anomaly_rate=0.01, seed=0)
+        written = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+    print(f"Benchmark: {rows} baseline rows")
+    print(f"  simulate_data() loop + DataFrame: {old * 1000:8.1f} ms")
+    print(f"  generate() one shot:              {new * 1000:8.1f} ms  ({old / new:.0f}x)")
+    print(f"  {dataset_rows:,} labeled rows to .npy in {CHUNK_ROWS:,}-row chunks: {written:.2f} s "
+          f"({dataset_rows / written / 1e6:.0f}M rows/s, {size / 1e6:.0f} MB, float32)")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Synthetic vitals generation")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dataset-rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.dataset_rows)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+# Mocked run - no remote LLM, no caches or fast path, in-process checkpoints,
+# tool calls against a scratch copy of the database
+_scratch = tempfile.mkdtemp()
+_db_copy = os.path.join(_scratch, "PatientCareDB.db")
+shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "PatientCareDB.db"), _db_copy)
+os.environ["PATIENT_CARE_DB"] = _db_copy
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+os.environ["PATIENT_CARE_CHECKPOINTER"] = "memory"
+os.environ["PROMPT_BUDGET_LOG"] = "0"
+os.environ["RESPONSE_CACHE"] = "off"
+os.environ["FAST_PATH"] = "0"
+os.environ["TRACING"] = "0"
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+import AgenticWorkflow
+import Notifications
+
+# Fixed delays (seconds)
+LLM_DELAY = 0.4
+HISTORY_DELAY = 0.15
+CANDIDATES_DELAY = 0.15
+PATIENT_DELAY = 0.02
+BOOKING_DELAY = 0.05
+TWILIO_DELAY = 0.6
+
+class FakeLLM:
+    """
+    Stand-in chat model: fixed latency, canned content.
+    """
+    calls = 0
+
+    def __init__(self, content: str, delay: float = LLM_DELAY):
+        self.content = content
+        self.delay = delay
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        FakeLLM.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=self.content)
+
+class FakeToolLLM(FakeLLM):
+    """
+    Tool-bound stand-in: asks for one tool call, then answers from its result.
+    """
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        FakeLLM.calls += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content=self.content)
+        return AIMessage(content="", tool_calls=[{
+            "name": "find_doctors_available_at",
+            "args": {"speciality": "Cardiology", "preferred_day": "20-Oct-26", "preferred_time": "10:00"},
+            "id": f"call-{FakeLLM.calls}"
+        }])
+
+def _delayed(result, delay):
+    async def call(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return result
+    return call
+
+def _install_mocks():
+
+    AgenticWorkflow.llm_conversation = FakeLLM(json.dumps({
+        "reply": "Let me find a cardiologist for you.",
+        "intent": "appointment",
+        "entities": {
+            "patient_name": "Benchmark Patient",
+            "symptoms": "chest pain",
+            "speciality": "Cardiology",
+            "preferred_date": "20-Oct-26",
+            "preferred_time": "10:00"
+        },
+        "ready_for_routing": True
+    }))
+    AgenticWorkflow.llm_tools = FakeToolLLM("Dr. Benchmark (Cardiology) is available at 10:00. Please confirm.")
+    AgenticWorkflow.llm_triage = FakeLLM("Dr. Benchmark (Cardiology) is available at 10:00. Please confirm.")
+    AgenticWorkflow.llm_validation = FakeLLM(json.dumps({
+        "reply": "Confirmed.",
+        "doctor_id": "1",
+        "doctor_name": "Dr. Benchmark",
+        "date": "20-Oct-26",
+        "time": "10:00",
+        "day": "Tuesday",
+        "confirmed_by_user": True
+    }))
+
+    AgenticWorkflow.aget_patient_details = _delayed(1, PATIENT_DELAY)
+    AgenticWorkflow.aget_relevant_history = _delayed(["fever"], HISTORY_DELAY)
+    AgenticWorkflow.afind_doctor_candidates = _delayed([{"doctor_id": 1, "name": "Dr. Benchmark"}], CANDIDATES_DELAY)
+    AgenticWorkflow.abook_appointment = _delayed({"status": "confirmed", "appointment_id": 1, "patient_id": 1},
+                                                 BOOKING_DELAY)
+
+def _twilio_stub(body, to):
+    time.sleep(TWILIO_DELAY)
+    return "SM-benchmark"
+
+async def _run(graph, turns: int):
+
+    latencies = []
+    for i in range(turns):
+        config = {"configurable": {"thread_id": f"benchmark-{time.time_ns()}-{i}"}}
+        start = time.perf_counter()
+        state = await graph.ainvoke({"messages": "I have chest pain, book a cardiologist for 20-Oct-26 10:00"},
+                                    config=config)
+        latencies.append(time.perf_counter() - start)
+        assert state.get("appointment_confirmed"), "mocked turn did not reach scheduling"
+
+    return latencies
+
+def run_benchmark(turns: int = 10):
+
+    _install_mocks()
+
+    results = {}
+    llm_calls = {}
+    for label, fan_out, inline, prefetch in [
+        ("baseline", False, True, False),
+        ("fan-out + queued notify", True, False, False),
+        ("+ prefetched triage", True, False, True)
+    ]:
+        dispatcher = Notifications.NotificationDispatcher(send=_twilio_stub, inline=inline)
+        Notifications.set_dispatcher(dispatcher)
+        AgenticWorkflow.TRIAGE_PREFETCH = prefetch
+        FakeLLM.calls = 0
+
+        graph = AgenticWorkflow.build_graph(fan_out=fan_out).compile(checkpointer=InMemorySaver())
+        results[label] = asyncio.run(_run(graph, turns))
+        llm_calls[label] = FakeLLM.calls / turns
+
+        dispatcher.shutdown()
+
+    shutil.rmtree(_scratch, ignore_errors=True)
+
+    print(f"Benchmark: {turns} appointment turns, LLM {LLM_DELAY}s, history {HISTORY_DELAY}s, "
+          f"candidates {CANDIDATES_DELAY}s, Twilio {TWILIO_DELAY}s")
+    for label, latencies in results.items():
+        print(f"  {label:<28} mean {statistics.mean(latencies):.3f}s  max {max(latencies):.3f}s  "
+              f"LLM calls/turn {llm_calls[label]:.1f}")
+
+    means = [statistics.mean(v) for v in results.values()]
+    baseline, optimized = means[0], means[-1]
+    print(f"  reduction: {baseline - optimized:.3f}s per turn ({100 * (baseline - optimized) / baseline:.0f}%)")
+
+if __name__ == "__main__":
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="End-to-end workflow latency with a mocked LLM")
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    run_benchmark(args.turns)
@@ -0,0 +1,145 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langchain_core.messages import AIMessageChunk, BaseMessage
+
+from StructuredOutput import IncrementalJSONParser
+from Tracing import span
+
+# Progress label shown when a node finishes
+NODE_LABELS = {
+    "conversation": "Understood your message",
+    "router": "Routed the request",
+    "appointment_intake": "Collected appointment details",
+    "context": "Reviewed medical history",
+    "doctor_candidates": "Looked up matching doctors",
+    "triage": "Assessed symptoms and specialists",
+    "tools": "Checked doctor availability",
+    "appointment_validation": "Validated appointment details",
+    "medicine_validation": "Validated medicine order",
+    "reminder_validation": "Validated reminder",
+    "scheduling": "Booked the appointment",
+    "pharmacy": "Placed the order",
+    "reminder": "Queued the reminder"
+}
+
+# Nodes whose LLM tokens are user-facing: plain text, or the "reply" field of a JSON answer
+TEXT_NODES = {"triage"}
+JSON_REPLY_NODES = {"conversation"}
+
+def _message_text(message: Any) -> Optional[str]:
+
+    if isinstance(message, dict):
+        if message.get("role") not in ("assistant", "ai"):
+            return None
+        content = message.get("content")
+    elif isinstance(message, BaseMessage):
+        if message.type != "ai":
+            return None
+        content = message.content
+    else:
+        return None
+
+    if not isinstance(content, str) or not content.strip():
+        return None
+
+    return content
+
+async def stream_turn(graph: Any, user_input: str, config: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one user turn and yield UI events as they happen:
+      {"type": "token", "node", "text"}     partial assistant text
+      {"type": "replace", "node", "text"}   text that replaces the node's tokens so far - the
+                                            model was re-asked, or the final reply differs
+      {"type": "message", "node", "text"}   a whole assistant message that was not streamed
+      {"type": "progress", "node", "label"} a node finished
+    """
+    reply_streams = {}
+    streamed = {}
+    runs = {}
+
+    thread_id = config.get("configurable", {}).get("thread_id")
+    with span("turn", {"thread_id": thread_id}):
+        async for mode, chunk in graph.astream(
+            {"messages": user_input}, config=config, stream_mode=["messages", "updates"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if not isinstance(message, AIMessageChunk) or not isinstance(message.content, str):
+                    continue
+
+                # Another model call in the same node run - a structured-output re-ask
+                if node in runs and runs[node] != message.id:
+                    reply_streams.pop(node, None)
+                    if streamed.get(node):
+                        streamed[node] = ""
+                        yield {"type": "replace", "node": node, "text": ""}
+                runs[node] = message.id
+
+                if node in TEXT_NODES:
+                    text = message.content
+                elif node in JSON_REPLY_NODES:
+                    text = reply_streams.setdefault(node, IncrementalJSONParser()).feed(message.content)
+                else:
+                    continue
+
+                if text:
+                    streamed[node] = streamed.get(node, "") + text
+                    yield {"type": "token", "node": node, "text": text}
+
+            elif mode == "updates":
+                for node, update in chunk.items():
+                    messages = (update or {}).get("messages") if isinstance(update, dict) else None
+                    if messages is not None and not isinstance(messages, list):
+                        messages = [messages]
+
+                    texts = [text for text in map(_message_text, messages or []) if text]
+                    sent = streamed.pop(node, None)
+
+                    # Cache hits, fast-path replies and templated messages arrive here whole
+                    if not sent:
+                        for text in texts:
+                            yield {"type": "message", "node": node, "text": text}
+
+                    # e.g. the fallback reply after a failed answer
+                    elif texts and texts[-1].strip() != sent.strip():
+                        yield {"type": "replace", "node": node, "text": texts[-1]}
+
+                    # A node can run again (triage -> tools -> triage)
+                    reply_streams.pop(node, None)
+                    runs.pop(node, None)
+
+                    yield {"type": "progress", "node": node, "label": NODE_LABELS.get(node, node)}
+
+# Time-to-first-token vs whole-turn latency for one message
+async def _measure(user_input: str, thread_id: str):
+
+    import time
+
+    from AgenticWorkflow import graph_builder
+
+    config = {"configurable": {"thread_id": thread_id}}
+    start = time.perf_counter()
+    first_output = None
+
+    async for event in stream_turn(graph_builder, user_input, config):
+        if event["type"] in ("token", "message") and first_output is None:
+            first_output = time.perf_counter() - start
+        if event["type"] == "progress":
+            print(f"  [{time.perf_counter() - start:6.2f}s] {event['label']}")
+
+    total = time.perf_counter() - start
+    print(f"time to first output: {first_output if first_output is not None else float('nan'):.2f}s, "
+          f"whole turn: {total:.2f}s")
+
+if __name__ == "__main__":
+
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Stream one workflow turn")
+    parser.add_argument("message")
+    parser.add_argument("--thread", default="stream-check")
+    args = parser.parse_args()
+
+    asyncio.run(_measure(args.message, args.thread))
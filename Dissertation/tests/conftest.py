@@ -0,0 +1,43 @@
+import os
+import shutil
+import sqlite3
+import sys
+
+import pytest
+
+# The Dissertation modules are flat scripts - make them importable by name
+DISSERTATION_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DISSERTATION_DIR not in sys.path:
+    sys.path.insert(0, DISSERTATION_DIR)
+
+# Nothing written next to the sources during a test run
+os.environ.setdefault("TRACING", "0")
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    """
+    Migrated copy of PatientCareDB.db with the connection layer pointed at it.
+    """
+    import Database
+    import PatientCache
+    from DoctorDirectory import get_directory
+    from Migrations import migrate
+
+    path = str(tmp_path / "PatientCareDB.db")
+    shutil.copy(Database.DEFAULT_DB_PATH, path)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    migrate(conn)
+    conn.close()
+
+    previous = Database.get_db_path()
+    Database.configure(path)
+
+    # Process-wide caches must not carry rows over from another test's DB
+    PatientCache.patient_ids.clear()
+    PatientCache.symptom_history.clear()
+    get_directory().invalidate()
+
+    yield path
+
+    Database.configure(previous)
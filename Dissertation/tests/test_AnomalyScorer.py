@@ -0,0 +1,109 @@
+import math
+import threading
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from AnomalyScorer import MicroBatchScorer, ShardedScorer, score_batch
+from Features import FEATURES, to_row
+from VitalsGenerator import generate
+
+@pytest.fixture(scope="module")
+def model():
+    IsolationForest = pytest.importorskip("sklearn.ensemble").IsolationForest
+    return IsolationForest(n_estimators=25, contamination=0.01, random_state=0).fit(generate(2000, seed=0))
+
+def _reading(row):
+    return dict(zip(FEATURES, row))
+
+class Collector:
+
+    def __init__(self):
+        self.results = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def __call__(self, device_id, results):
+        with self.lock:
+            self.results[device_id].extend(results)
+
+def test_to_row_marks_missing_values():
+    row = to_row({"heart_rate": "80", "spo2": None, "temperature_f": 98.6})
+
+    assert row[0] == 80.0 and row[2] == 98.6
+    assert math.isnan(row[1]) and math.isnan(row[3])
+
+def test_score_batch_matches_predict_and_decision_function(model):
+    X = np.vstack([generate(500, "wearable", seed=1), generate(100, "anomalous", seed=2)])
+
+    decision, anomalous = score_batch(model, X)
+
+    np.testing.assert_allclose(decision, model.decision_function(X))
+    np.testing.assert_array_equal(anomalous, model.predict(X) == -1)
+    assert anomalous[500:].mean() > anomalous[:500].mean()
+
+def test_results_fan_out_per_device_in_arrival_order(model):
+    X = generate(300, "wearable", seed=3)
+    collector = Collector()
+    scorer = MicroBatchScorer(model, collector, max_batch=16, max_delay=0.001)
+
+    for i, row in enumerate(X.tolist()):
+        scorer.submit(f"watch-{i % 3}", {**_reading(row), "seq": i})
+    scorer.submit("watch-0", {"heart_rate": "n/a"})
+    scorer.close()
+
+    expected = -model.decision_function(X)
+    for device in range(3):
+        results = collector.results[f"watch-{device}"]
+        assert [reading["seq"] for reading, _, _ in results] == list(range(device, 300, 3))
+        np.testing.assert_allclose([score for _, score, _ in results], expected[device::3])
+
+    stats = scorer.stats()
+    assert (stats["rows"], stats["invalid"]) == (301, 1)
+    assert stats["batches"] >= 300 / 16
+
+def test_handler_errors_do_not_stop_the_worker(model):
+    seen = []
+
+    def on_results(device_id, results):
+        if device_id == "broken":
+            raise RuntimeError("handler failed")
+        seen.extend(results)
+
+    scorer = MicroBatchScorer(model, on_results, max_batch=1)
+    row = _reading(generate(1, seed=4)[0].tolist())
+    scorer.submit("broken", row)
+    scorer.submit("watch", row)
+    scorer.close()
+
+    assert len(seen) == 1
+
+def test_each_device_stays_on_one_shard(model):
+    collector = Collector()
+    scorer = ShardedScorer(model, collector, shards=4, max_batch=8, max_delay=0.001)
+    X = generate(400, "wearable", seed=5)
+
+    assert scorer.shard_for("watch-7") is scorer.shard_for("watch-7")
+    for i, row in enumerate(X.tolist()):
+        scorer.submit(f"watch-{i % 20}", {**_reading(row), "seq": i})
+    scorer.close()
+
+    for device in range(20):
+        assert [r["seq"] for r, _, _ in collector.results[f"watch-{device}"]] == list(range(device, 400, 20))
+    assert scorer.stats()["rows"] == 400
+
+def test_set_model_swaps_every_shard(model):
+
+    class Flagging:
+        offset_ = 0.0
+
+        def score_samples(self, X):
+            return -np.ones(len(X))
+
+    collector = Collector()
+    scorer = ShardedScorer(model, collector, shards=2)
+    scorer.set_model(Flagging())
+    scorer.submit("watch", _reading(generate(1, seed=6)[0].tolist()))
+    scorer.close()
+
+    assert collector.results["watch"][0][1:] == (1.0, True)
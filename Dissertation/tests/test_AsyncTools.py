@@ -0,0 +1,54 @@
+import asyncio
+import contextvars
+
+import pytest
+
+import AsyncTools
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+def test_run_sync_reuses_one_loop():
+    first = AsyncTools.run_sync(_current_loop())
+    second = AsyncTools.run_sync(_current_loop())
+
+    assert first is second
+    assert first.is_running()
+
+def test_iterate_sync_yields_in_order_on_the_shared_loop():
+    loops = []
+
+    async def events():
+        for i in range(5):
+            await asyncio.sleep(0)
+            loops.append(asyncio.get_running_loop())
+            yield i
+
+    assert list(AsyncTools.iterate_sync(events())) == [0, 1, 2, 3, 4]
+    assert set(loops) == {AsyncTools.get_event_loop()}
+
+def test_iterate_sync_keeps_context_across_items():
+    current = contextvars.ContextVar("current", default=None)
+
+    async def events():
+        token = current.set("turn")
+        try:
+            yield current.get()
+            await asyncio.sleep(0)
+            yield current.get()
+        finally:
+            current.reset(token)
+
+    assert list(AsyncTools.iterate_sync(events())) == ["turn", "turn"]
+
+def test_iterate_sync_raises_generator_errors():
+    async def events():
+        yield 1
+        raise ValueError("boom")
+
+    received = []
+    with pytest.raises(ValueError, match="boom"):
+        for item in AsyncTools.iterate_sync(events()):
+            received.append(item)
+
+    assert received == [1]
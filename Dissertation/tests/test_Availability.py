@@ -0,0 +1,137 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import Tools
+from Availability import book_slot, doctor_free_slots
+from Database import get_connection, transaction
+from Schedule import overlaps_booking, slot_problem
+
+# Doctor 1 works Mon-Fri 09:00-13:00; 2030-01-07 is a Monday
+DOCTOR = 1
+MONDAY = "2030-01-07"
+SUNDAY = "2030-01-06"
+
+def _book(time, db_date=MONDAY, doctor_id=DOCTOR):
+    return book_slot(1, "Sourav Das", doctor_id, db_date, time, "fever")
+
+def _doctor(doctor_id=DOCTOR):
+    row = get_connection().execute(
+        "SELECT DOCTOR_ID, AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS FROM DOCTOR WHERE DOCTOR_ID = ?",
+        (doctor_id,)
+    ).fetchone()
+    return {"doctor_id": row[0], "available_from": row[1], "available_to": row[2], "available_days": row[3]}
+
+def _free_times(db_date=MONDAY):
+    after = datetime.strptime(db_date, "%Y-%m-%d")
+    return [slot.strftime("%H:%M") for slot, _, _ in doctor_free_slots(_doctor(), after, horizon_days=0)]
+
+@pytest.mark.parametrize("time, problem", [
+    ("10:00", None),
+    ("12:30", None),
+    ("13:00", "outside"),
+    ("08:30", "outside"),
+    ("03:00", "outside"),
+    ("10:15", "not a slot start"),
+])
+def test_slot_problem(time, problem):
+    result = slot_problem("09:00", "13:00", "Mon,Tue,Wed,Thu,Fri", MONDAY, time)
+    if problem is None:
+        assert result is None
+    else:
+        assert problem in result
+
+def test_slot_problem_off_day_and_missing_hours():
+    assert "Sun" in slot_problem("09:00", "13:00", "Mon,Tue", SUNDAY, "10:00")
+    assert "working hours" in slot_problem(None, None, "Mon", MONDAY, "10:00")
+
+def test_overlaps_booking_tolerates_legacy_times():
+    assert overlaps_booking([("10:30 am",)], "10:30")
+    assert overlaps_booking([("10:15",)], "10:00")
+    assert not overlaps_booking([("10:30",), ("garbage",), (None,)], "10:00")
+
+def test_second_booking_of_same_slot_conflicts(scratch_db):
+    assert _book("10:00")["status"] == "confirmed"
+    assert _book("10:00")["status"] == "conflict"
+    assert _book("10:00 AM")["status"] == "conflict"
+
+def test_overlapping_booking_conflicts(scratch_db):
+    # A legacy off-grid booking blocks the slots it overlaps
+    with transaction() as conn:
+        conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (1, ?, ?, '10:15')",
+                     (DOCTOR, MONDAY))
+
+    assert _book("10:00")["status"] == "conflict"
+    assert _book("10:30")["status"] == "conflict"
+    assert _book("11:00")["status"] == "confirmed"
+
+@pytest.mark.parametrize("time, db_date", [
+    ("10:15", MONDAY),
+    ("03:00", MONDAY),
+    ("13:00", MONDAY),
+    ("10:00", SUNDAY),
+])
+def test_off_schedule_booking_is_unavailable(scratch_db, time, db_date):
+    result = _book(time, db_date)
+
+    assert result["status"] == "unavailable"
+    assert result["reason"]
+    assert get_connection().execute("SELECT COUNT(*) FROM APPOINTMENT WHERE DATE = ?", (db_date,)).fetchone()[0] == 0
+
+def test_unknown_or_inactive_doctor_is_unavailable(scratch_db):
+    with transaction() as conn:
+        conn.execute("UPDATE DOCTOR SET IS_ACTIVE = 0 WHERE DOCTOR_ID = 2")
+
+    assert _book("10:00", doctor_id=2)["status"] == "unavailable"
+    assert _book("10:00", doctor_id=9999)["status"] == "unavailable"
+
+def test_unparseable_time_is_unavailable(scratch_db):
+    result = _book("half past ten")
+
+    assert result["status"] == "unavailable"
+    assert "half past ten" in result["reason"]
+
+def test_concurrent_bookings_confirm_once(scratch_db):
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: _book("11:30")["status"], range(64)))
+
+    assert results.count("confirmed") == 1
+    assert results.count("conflict") == 63
+
+def test_free_slots_skip_overlapping_bookings(scratch_db):
+    assert _free_times()[:4] == ["09:00", "09:30", "10:00", "10:30"]
+
+    with transaction() as conn:
+        conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (1, ?, ?, '10:15')",
+                     (DOCTOR, MONDAY))
+        conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES (1, ?, ?, '12:30 pm')",
+                     (DOCTOR, MONDAY))
+
+    free = _free_times()
+    assert "10:00" not in free and "10:30" not in free and "12:30" not in free
+    assert free == ["09:00", "09:30", "11:00", "11:30", "12:00"]
+
+def test_free_slots_are_bookable(scratch_db):
+    for time in _free_times():
+        assert _book(time)["status"] == "confirmed"
+    assert _free_times() == []
+
+def _details(**overrides):
+    details = {"patient_id": 1, "patient_name": "Sourav Das", "doctor_id": DOCTOR, "symptoms": "fever",
+               "date": "07-Jan-30", "time": "10:00"}
+    details.update(overrides)
+    return {"appointment_details": details}
+
+def test_book_appointment_reports_each_outcome(scratch_db, monkeypatch):
+    assert Tools.book_appointment(_details())["status"] == "confirmed"
+    assert Tools.book_appointment(_details())["status"] == "conflict"
+    assert Tools.book_appointment(_details(time="10:15"))["status"] == "unavailable"
+    assert Tools.book_appointment(_details(date="next tuesday"))["status"] == "unavailable"
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(Tools, "book_slot", locked)
+    assert Tools.book_appointment(_details(time="11:00"))["status"] == "failed"
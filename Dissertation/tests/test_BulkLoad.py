@@ -0,0 +1,85 @@
+import BulkLoad
+import PatientCache
+from Database import get_connection
+
+def test_bulk_book_appointments_returns_ids_in_order(scratch_db):
+    rows = [
+        {"patient_id": 1, "doctor_id": 1, "symptoms": "fever", "date": "07-Jan-30", "time": "9 AM"},
+        {"patient_id": 0, "patient_name": "Bulk Patient", "doctor_id": 2, "symptoms": None,
+         "date": "09-Jan-30", "time": "10:30"}
+    ]
+
+    ids, rejected = BulkLoad.bulk_book_appointments(rows, chunk_size=1)
+    assert rejected == []
+
+    stored = get_connection().execute(
+        "SELECT APPOINTMENT_ID, DOCTOR_ID, DATE, TIME FROM APPOINTMENT WHERE APPOINTMENT_ID IN (?, ?) "
+        "ORDER BY APPOINTMENT_ID", ids
+    ).fetchall()
+    assert stored == [(ids[0], 1, "2030-01-07", "09:00"), (ids[1], 2, "2030-01-09", "10:30")]
+
+    new_patient = get_connection().execute(
+        "SELECT COUNT(*) FROM PATIENT WHERE NAME = 'Bulk Patient'").fetchone()[0]
+    assert new_patient == 1
+
+def test_bulk_booking_is_checked_like_book_appointment(scratch_db):
+    booked = BulkLoad.bulk_book_appointments([{"patient_id": 1, "doctor_id": 1, "date": "07-Jan-30", "time": "10:00"}])
+    assert booked[1] == []
+
+    rows = [
+        {"patient_id": 1, "doctor_id": 1, "date": "07-Jan-30", "time": "10:00"},
+        {"patient_id": 1, "doctor_id": 1, "date": "07-Jan-30", "time": "10:15"},
+        {"patient_id": 1, "doctor_id": 2, "date": "08-Jan-30", "time": "10:30"},
+        {"patient_id": 1, "doctor_id": 1, "date": "07-Jan-30", "time": "11:00"},
+        {"patient_id": 0, "patient_name": "Refused Patient", "doctor_id": 1, "date": "07-Jan-30", "time": "11:00"},
+    ]
+
+    ids, rejected = BulkLoad.bulk_book_appointments(rows, chunk_size=2)
+
+    assert ids[:3] == [None, None, None] and ids[3] is not None and ids[4] is None
+    assert [(r["index"], r["status"]) for r in rejected] == [
+        (0, "conflict"), (1, "unavailable"), (2, "unavailable"), (4, "conflict")]
+    assert get_connection().execute(
+        "SELECT COUNT(*) FROM PATIENT WHERE NAME = 'Refused Patient'").fetchone()[0] == 0
+
+def test_bulk_booking_can_skip_checks(scratch_db):
+    row = {"patient_id": 1, "doctor_id": 2, "date": "08-Jan-30", "time": "10:30"}
+
+    ids, rejected = BulkLoad.bulk_book_appointments([row, row], validate=False)
+
+    assert None not in ids and rejected == []
+
+def test_bulk_booking_reuses_patients_by_name(scratch_db):
+    existing = get_connection().execute("SELECT PATIENT_ID, NAME FROM PATIENT LIMIT 1").fetchone()
+    rows = [
+        {"patient_id": 0, "patient_name": "Twice Booked", "doctor_id": 1, "date": "07-Jan-30", "time": "09:00"},
+        {"patient_id": 0, "patient_name": "TWICE booked", "doctor_id": 1, "date": "07-Jan-30", "time": "09:30"},
+        {"patient_id": 0, "patient_name": existing[1].upper(), "doctor_id": 1, "date": "07-Jan-30", "time": "10:00"},
+    ]
+    before = get_connection().execute("SELECT COUNT(*) FROM PATIENT").fetchone()[0]
+
+    ids, _ = BulkLoad.bulk_book_appointments(rows)
+
+    patients = [r[0] for r in get_connection().execute(
+        "SELECT PATIENT_ID FROM APPOINTMENT WHERE APPOINTMENT_ID IN (?, ?, ?) ORDER BY APPOINTMENT_ID", ids)]
+    assert patients[0] == patients[1] and patients[2] == existing[0]
+    assert get_connection().execute("SELECT COUNT(*) FROM PATIENT").fetchone()[0] == before + 1
+
+def test_bulk_inserts_invalidate_cached_history(scratch_db):
+    PatientCache.symptom_history.put(1, ["old"])
+    PatientCache.patient_ids.put("bulk patient", 0)
+
+    BulkLoad.bulk_insert_symptoms([{"patient_id": 1, "symptoms": "cough"}] * 3)
+    BulkLoad.bulk_book_appointments([{"patient_id": 0, "patient_name": "Bulk  Patient", "doctor_id": 1,
+                                      "date": "07-Jan-30", "time": "09:00"}])
+
+    assert PatientCache.symptom_history.get(1) is None
+    assert PatientCache.patient_ids.get("bulk patient") is None
+
+def test_bulk_order_medicines(scratch_db):
+    ids = BulkLoad.bulk_order_medicines(
+        {"medicine": "Paracetamol", "dosage": "650 mg", "quantity": str(q), "shipping_address": "Kolkata"}
+        for q in range(7)
+    )
+
+    assert ids == list(range(ids[0], ids[0] + 7))
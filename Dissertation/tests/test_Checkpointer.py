@@ -0,0 +1,99 @@
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+
+import Checkpointer
+from Checkpointer import MAX_SUMMARY_CHARS, SUMMARY_ID, SQLiteCheckpointer, compact_messages
+
+def _conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"question {i}", id=f"h{i}"))
+        messages.append(AIMessage(content=f"answer {i}", id=f"a{i}"))
+    return messages
+
+def _put(saver, thread_id, messages, step=0):
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = str(uuid6(clock_seq=step))
+    checkpoint["channel_values"] = {"messages": messages}
+    return saver.put({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}, checkpoint, {"step": step}, {})
+
+@pytest.fixture
+def saver(tmp_path):
+    saver = SQLiteCheckpointer(str(tmp_path / "checkpoints.db"), keep_checkpoints=3, max_messages=10)
+    yield saver
+    saver.close()
+
+def test_short_history_is_untouched():
+    messages = _conversation(3)
+    assert compact_messages(messages, max_messages=10, keep_recent=4) is messages
+
+def test_compaction_summarizes_older_messages():
+    compacted = compact_messages(_conversation(10), max_messages=10, keep_recent=4)
+
+    assert len(compacted) == 5
+    assert compacted[0].id == SUMMARY_ID
+    assert "User: question 0" in compacted[0].content and "Assistant: answer 7" in compacted[0].content
+    assert [m.content for m in compacted[1:]] == ["question 8", "answer 8", "question 9", "answer 9"]
+
+def test_compaction_folds_previous_summary():
+    first = compact_messages(_conversation(10), max_messages=10, keep_recent=4)
+    second = compact_messages(first + _conversation(10)[:8], max_messages=10, keep_recent=4)
+
+    assert sum(m.id == SUMMARY_ID for m in second) == 1
+    assert "answer 7" in second[0].content and "question 0" in second[0].content
+
+def test_cut_never_orphans_tool_results():
+    messages = _conversation(5) + [
+        AIMessage(content="", tool_calls=[{"name": "lookup", "args": {}, "id": "call-1"}]),
+        ToolMessage(content="result", tool_call_id="call-1"),
+        AIMessage(content="done"),
+    ]
+
+    compacted = compact_messages(messages, max_messages=5, keep_recent=2)
+
+    assert not isinstance(compacted[1], ToolMessage)
+    assert "result" not in compacted[0].content
+
+def test_summary_stays_within_budget():
+    long_turns = [HumanMessage(content="x" * 500, id=f"h{i}") for i in range(100)]
+
+    compacted = compact_messages(long_turns, max_messages=10, keep_recent=2)
+
+    assert len(compacted[0].content) <= MAX_SUMMARY_CHARS + 50
+    assert isinstance(compacted[0], SystemMessage)
+
+def test_stored_checkpoint_is_compacted(saver):
+    config = _put(saver, "t1", _conversation(20))
+
+    stored = saver.get_tuple(config).checkpoint["channel_values"]["messages"]
+
+    assert len(stored) <= 10 and stored[0].id == SUMMARY_ID
+    assert stored[-1].content == "answer 19"
+
+def test_only_latest_checkpoints_are_kept(saver):
+    for step in range(6):
+        config = _put(saver, "t1", _conversation(1), step)
+        saver.put_writes(config, [("messages", "x")], task_id=f"task-{step}")
+    _put(saver, "t2", _conversation(1))
+
+    kept = list(saver.list({"configurable": {"thread_id": "t1"}}))
+
+    assert len(kept) == 3
+    assert kept[0].checkpoint["id"] == saver.get_tuple({"configurable": {"thread_id": "t1"}}).checkpoint["id"]
+    assert saver._conn.execute("SELECT COUNT(DISTINCT CHECKPOINT_ID) FROM WRITES").fetchone()[0] == 3
+    assert len(list(saver.list({"configurable": {"thread_id": "t2"}}))) == 1
+
+def test_idle_threads_expire(saver, monkeypatch):
+    _put(saver, "old", _conversation(1))
+    now = Checkpointer.time.time()
+    monkeypatch.setattr(Checkpointer.time, "time", lambda: now + saver.idle_ttl + 1)
+    _put(saver, "fresh", _conversation(1))
+
+    assert saver.expire_idle_threads() == 1
+    assert saver.get_tuple({"configurable": {"thread_id": "old"}}) is None
+    assert saver.get_tuple({"configurable": {"thread_id": "fresh"}}) is not None
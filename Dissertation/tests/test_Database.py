@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+import Database
+
+def test_connection_reused_per_thread(scratch_db):
+    conn = Database.get_connection()
+    assert Database.get_connection() is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(Database.get_connection()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not conn
+
+def test_connection_settings(scratch_db):
+    conn = Database.get_connection()
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == Database.BUSY_TIMEOUT_MS
+    assert conn.isolation_level is None
+
+def test_transaction_rolls_back_on_error(scratch_db):
+    count = "SELECT COUNT(*) FROM PATIENT"
+    before = Database.get_connection().execute(count).fetchone()[0]
+
+    with pytest.raises(RuntimeError):
+        with Database.transaction() as conn:
+            conn.execute("INSERT INTO PATIENT (NAME) VALUES ('Rolled Back')")
+            raise RuntimeError("abort")
+
+    assert Database.get_connection().execute(count).fetchone()[0] == before
+
+def test_nested_transaction_joins_outer(scratch_db):
+    with Database.transaction() as outer:
+        with Database.transaction() as inner:
+            assert inner is outer
+            inner.execute("INSERT INTO PATIENT (NAME) VALUES ('Nested')")
+        assert outer.in_transaction
+
+    assert not Database.get_connection().in_transaction
+
+def test_commit_listeners_run_after_commit(scratch_db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(Database, "_commit_listeners", [lambda: calls.append(1)])
+
+    with Database.transaction() as conn:
+        conn.execute("INSERT INTO PATIENT (NAME) VALUES ('Listener')")
+        assert calls == []
+
+    assert calls == [1]
+
+def test_configure_reopens_connections(scratch_db, tmp_path):
+    conn = Database.get_connection()
+
+    Database.configure(scratch_db)
+
+    assert Database.get_connection() is not conn
@@ -0,0 +1,76 @@
+import json
+import threading
+
+import numpy as np
+
+from DeviceRegistry import DeviceRegistry, DeviceState, load_recipients, patient_of
+
+def _reading(value):
+    return {"heart_rate": value, "spo2": value, "temperature_f": value, "stress": value}
+
+def test_least_recently_seen_device_is_evicted_quietly(capsys):
+    registry = DeviceRegistry(capacity=4, max_devices=2)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    assert registry.device_ids() == ["a", "c"]
+    assert registry.evicted == 1
+    assert capsys.readouterr().out == ""
+
+def test_recipients_by_device_then_patient_then_default(tmp_path):
+    path = tmp_path / "recipients.json"
+    path.write_text(json.dumps({"P001": "whatsapp:+911", "P001-2": "whatsapp:+912"}))
+    registry = DeviceRegistry(recipients=load_recipients(str(path)), default_recipient="whatsapp:+910")
+
+    assert registry.get("P001").recipient == "whatsapp:+911"
+    assert registry.get("P001-1").recipient == "whatsapp:+911"
+    assert registry.get("P001-2").recipient == "whatsapp:+912"
+    assert registry.get("P002").recipient == "whatsapp:+910"
+    assert load_recipients("") == {}
+
+def test_patient_of():
+    assert patient_of("P001-12") == "P001"
+    assert patient_of("P001") == "P001"
+    assert patient_of("ward-a") == "ward-a"
+    assert patient_of("-3") == "-3"
+
+def test_snapshot_is_a_copy():
+    state = DeviceState("watch", capacity=3)
+    for value in (70, 80, 90):
+        state.append(_reading(value), 0.1, False, timestamp=value)
+
+    snapshot = state.snapshot()
+    state.append(_reading(120), 0.9, True, timestamp=120)
+
+    assert snapshot["history"]["heart_rate"].tolist() == [70, 80, 90]
+    assert snapshot["latest"]["heart_rate"] == 90
+    assert snapshot["status"].startswith("✅")
+    assert snapshot["summary"]["heart_rate"]["mean"] == 80
+    assert state.snapshot()["history"]["timestamp"].tolist() == [80, 90, 120]
+
+def test_snapshot_is_consistent_under_concurrent_appends():
+    state = DeviceState("watch", capacity=50)
+    stop = threading.Event()
+
+    def writer():
+        value = 0
+        while not stop.is_set():
+            value += 1
+            state.append(_reading(value % 1000), 0.0, False)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(500):
+            snapshot = state.snapshot()
+            history = snapshot["history"]["heart_rate"]
+            if not len(history):
+                continue
+            assert history[-1] == snapshot["latest"]["heart_rate"]
+            assert np.isclose(snapshot["summary"]["heart_rate"]["mean"], history.mean())
+            assert snapshot["window"] == len(history)
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,31 @@
+from Database import transaction
+from DoctorDirectory import DoctorDirectory
+
+def _add_doctor(name, available_from, available_to="13:00", days="Mon,Wed", speciality="ENT"):
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO DOCTOR (SPECIALITY, NAME, QUALIFICATION, AVAILABLE_FROM, AVAILABLE_TO, AVAILABLE_DAYS)
+            VALUES (?, ?, 'MBBS', ?, ?, ?)
+        """, (speciality, name, available_from, available_to, days))
+
+def test_search_by_name_sorts_missing_start_last(scratch_db):
+    _add_doctor("Dr. Zubin Unscheduled", None, None)
+    _add_doctor("Dr. Zubin Early", "08:00")
+
+    names = [d["name"] for d in DoctorDirectory().search_by_name("zubin")]
+
+    assert names == ["Dr. Zubin Early", "Dr. Zubin Unscheduled"]
+
+def test_search_by_name_falls_back_to_similarity(scratch_db):
+    names = [d["name"] for d in DoctorDirectory().search_by_name("Dr. Amit Sharmaa")]
+
+    assert names[0] == "Dr. Amit Sharma"
+
+def test_available_at_covers_day_and_time(scratch_db):
+    _add_doctor("Dr. Zubin Early", "08:00", "09:00", "Sun", "Zoology")
+
+    directory = DoctorDirectory()
+
+    assert [d["name"] for d in directory.available_at("Sunday", "08:30", "Zoology")] == ["Dr. Zubin Early"]
+    assert directory.available_at("Sunday", "09:00", "Zoology") == []
+    assert directory.available_at("Monday", "08:30", "Zoology") == []
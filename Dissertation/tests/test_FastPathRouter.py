@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from FastPathRouter import EVALUATION_CORPUS, MIN_CONFIDENCE, classify, extract_date, extract_time, fast_path
+
+TODAY = date(2026, 10, 17)
+APPOINTMENT = {"patient_name": "Ravi", "symptoms": "fever", "preferred_date": "20-Oct-26", "preferred_time": "10:00"}
+
+def _outcome(intent, entities, previous, text):
+    result = fast_path({
+        "intent": intent,
+        "extracted_entities": entities,
+        "messages": [{"role": "assistant", "content": previous}, {"role": "user", "content": text}]
+    }, today=TODAY)
+
+    if result is None:
+        return "llm"
+    return "route" if result["ready_for_routing"] else "slots"
+
+@pytest.mark.parametrize("intent, entities, previous, text, expected", EVALUATION_CORPUS)
+def test_evaluation_turns(intent, entities, previous, text, expected):
+    assert _outcome(intent, entities, previous, text) == expected
+
+@pytest.mark.parametrize("text", ["yes", "yes please", "ok", "correct", "sure go ahead", "yes, confirm"])
+def test_affirmatives_confirm(text):
+    assert classify(text) == ("confirm", 1.0)
+
+@pytest.mark.parametrize("text", [
+    "is it ok",
+    "it is all good thanks",
+    "are the details correct?",
+    "is that right?",
+    "ok?",
+    "can I go ahead",
+    "is it all booked",
+    "what are the details",
+    "thanks",
+    "all good?",
+])
+def test_fillers_and_questions_never_confirm(text):
+    label, confidence = classify(text)
+    assert label != "confirm" or confidence < MIN_CONFIDENCE
+    assert _outcome("appointment", APPOINTMENT, "Shall I confirm the booking?", text) == "llm"
+
+@pytest.mark.parametrize("text", ["no", "no, change the time", "wait", "don't book"])
+def test_denials(text):
+    assert classify(text) == ("deny", 1.0)
+
+@pytest.mark.parametrize("text, label", [
+    ("tomorrow", "date"),
+    ("at 4 pm", "time"),
+    ("saturday at 10 am", "datetime"),
+    ("tomorrow, I have a rash", None),
+])
+def test_date_time_rules(text, label):
+    found, confidence = classify(text)
+    if label is None:
+        assert confidence < 1.0
+    else:
+        assert (found, confidence) == (label, 1.0)
+
+def test_extractors():
+    assert extract_time("around 3 pm") == "15:00"
+    assert extract_time("noon") == "12:00"
+    assert extract_date("day after tomorrow", TODAY) == "19-Oct-26"
+    assert extract_date("on monday", TODAY) == "19-Oct-26"
+    assert extract_date("3rd of march", TODAY) == "03-Mar-27"
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import LLMGateway
+from LLMGateway import ConcurrencyLimiter, GatewayChatModel, LLMGateway as Gateway, LatencyStats
+
+class HTTPStatusError(Exception):
+
+    def __init__(self, status_code, headers):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers
+
+class ScriptedServer:
+    """
+    Local chat-completions endpoint answering from a script of
+    (status, delay seconds, headers); the last entry repeats.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with scripted._lock:
+                    status, delay, headers = scripted.script[min(scripted.requests, len(scripted.script) - 1)]
+                    scripted.requests += 1
+                    scripted.in_flight += 1
+                    scripted.max_in_flight = max(scripted.max_in_flight, scripted.in_flight)
+                try:
+                    time.sleep(delay)
+                    body = json.dumps({"choices": [{"message": {"content": f"reply {status}"}}]}).encode()
+                    self.send_response(status)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with scripted._lock:
+                        scripted.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/chat/completions"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def invoke(self, messages, config=None, **kwargs):
+        request = urllib.request.Request(self.url, data=json.dumps({"messages": messages}).encode(),
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return json.loads(response.read())["choices"][0]["message"]["content"]
+        except urllib.error.HTTPError as e:
+            raise HTTPStatusError(e.code, dict(e.headers)) from None
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        return await asyncio.to_thread(self.invoke, messages, config)
+
+@pytest.fixture
+def serve(monkeypatch):
+    monkeypatch.setattr(LLMGateway, "BACKOFF_BASE", 0.01)
+    servers = []
+
+    def start(*script):
+        servers.append(ScriptedServer(script))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.server.shutdown()
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+def _gateway(**kwargs):
+    return Gateway("fake", **{"max_concurrency": 4, "requests_per_minute": 60000, "tokens_per_minute": 1e8, **kwargs})
+
+def test_429_honours_retry_after(serve):
+    server = serve((429, 0, {"Retry-After": "0.3"}), (200, 0, {}))
+    model = GatewayChatModel(server, "conversation", _gateway(), hedge=False)
+
+    start = time.perf_counter()
+    assert model.invoke(MESSAGES) == "reply 200"
+
+    assert time.perf_counter() - start >= 0.3
+    assert model.gateway.stats["conversation"].counters["retries"] == 1
+    assert server.requests == 2
+
+def test_5xx_gives_up_after_max_attempts(serve):
+    server = serve((503, 0, {}))
+    model = GatewayChatModel(server, "triage", _gateway(max_attempts=3), hedge=False)
+
+    with pytest.raises(HTTPStatusError) as raised:
+        asyncio.run(model.ainvoke(MESSAGES))
+
+    assert raised.value.status_code == 503
+    assert server.requests == 3
+    counters = model.gateway.stats["triage"].counters
+    assert (counters["errors"], counters["retries"]) == (3, 2)
+
+def test_client_errors_are_not_retried(serve):
+    server = serve((400, 0, {}))
+    model = GatewayChatModel(server, "triage", _gateway(), hedge=False)
+
+    with pytest.raises(HTTPStatusError):
+        model.invoke(MESSAGES)
+
+    assert server.requests == 1
+
+def test_concurrency_stays_within_limit(serve):
+    server = serve((200, 0.1, {}))
+    model = GatewayChatModel(server, "triage", _gateway(max_concurrency=3), hedge=False)
+
+    async def burst():
+        return await asyncio.gather(*(model.ainvoke(MESSAGES) for _ in range(12)))
+
+    assert asyncio.run(burst()) == ["reply 200"] * 12
+    assert server.max_in_flight == 3
+    assert model.gateway.limiter._available == 3
+
+def test_hedge_wins_and_slow_primary_is_dropped(serve):
+    server = serve((200, 1.0, {}), (200, 0.05, {}))
+    model = GatewayChatModel(server, "validation", _gateway(), hedge=True)
+    for _ in range(LLMGateway.HEDGE_MIN_SAMPLES):
+        model.gateway.stats["validation"].observe(0.05)
+
+    async def timed():
+        start = time.perf_counter()
+        reply = await model.ainvoke(MESSAGES)
+        return reply, time.perf_counter() - start
+
+    # Timed inside the loop - asyncio.run still joins the abandoned primary's thread
+    reply, elapsed = asyncio.run(timed())
+
+    assert reply == "reply 200"
+    assert elapsed < 0.8
+    counters = model.gateway.stats["validation"].counters
+    assert (counters["hedges"], counters["hedge_wins"]) == (1, 1)
+    assert model.gateway.limiter._available == 4
+
+def test_hedge_cap_uses_the_recent_window():
+    stats = LatencyStats(window=10)
+    for _ in range(100):
+        stats.count("hedges")
+    for i in range(10):
+        stats.observe(0.1, hedged=i == 0)
+
+    # 100 hedges over the lifetime, 1 in the window
+    assert stats.hedged_share() == pytest.approx(0.1)
+    stats.observe(0.1)
+    assert stats.hedged_share() == 0.0
+
+def test_waiter_cancelled_after_release_does_not_double_release():
+
+    async def scenario(grant_first):
+        limiter = ConcurrencyLimiter(1)
+        await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+
+        limiter.release()
+        if grant_first:
+            await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+        return limiter._available
+
+    assert asyncio.run(scenario(grant_first=False)) == 1
+    assert asyncio.run(scenario(grant_first=True)) == 1
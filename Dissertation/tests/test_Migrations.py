@@ -0,0 +1,173 @@
+import sqlite3
+
+import pytest
+
+import Database
+from Migrations import MIGRATIONS, get_version, migrate
+
+LATEST = MIGRATIONS[-1][0]
+
+# PatientCareDB tables as first shipped, before any migration
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE DOCTOR (
+        DOCTOR_ID INTEGER, SPECIALITY TEXT NOT NULL, NAME TEXT NOT NULL,
+        GENDER TEXT CHECK (GENDER IN ('M', 'F', 'O')), QUALIFICATION TEXT,
+        AVAILABLE_FROM TIME, AVAILABLE_TO TIME, AVAILABLE_DAYS TEXT, IS_ACTIVE INTEGER DEFAULT 1,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(DOCTOR_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE PATIENT (
+        PATIENT_ID INTEGER, NAME TEXT NOT NULL, AGE INTEGER, GENDER TEXT, MOBILE INTEGER, ADDRESS TEXT,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(PATIENT_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE SYMPTOMS (
+        SYMPTOM_ID INTEGER NOT NULL, PATIENT_ID INTEGER NOT NULL, SYMPTOMS TEXT NULL,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(SYMPTOM_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE APPOINTMENT (
+        APPOINTMENT_ID INTEGER NOT NULL, PATIENT_ID TEXT NULL, DOCTOR_ID TEXT NULL, DATE DATE NULL, TIME TIME NULL,
+        CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP, UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY(APPOINTMENT_ID AUTOINCREMENT)
+    )
+    """,
+    """
+    CREATE TABLE MEDICINE_ORDER (
+        ORDER_ID INTEGER NOT NULL, MEDICINE TEXT NULL, DOSAGE INTEGER NOT NULL, QUANTITY TEXT NULL,
+        SHIPPING_ADDRESS TEXT NULL,
+        PRIMARY KEY(ORDER_ID AUTOINCREMENT)
+    )
+    """
+]
+
+@pytest.fixture
+def baseline_db(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    conn = sqlite3.connect(path, isolation_level=None)
+    for ddl in BASELINE_SCHEMA:
+        conn.execute(ddl)
+    yield path, conn
+    conn.close()
+
+def _sequence(conn, table):
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    return row[0] if row else None
+
+def test_migrate_reaches_latest_and_is_idempotent(baseline_db):
+    _, conn = baseline_db
+
+    assert migrate(conn) == LATEST
+    schema = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+
+    assert migrate(conn) == LATEST
+    assert conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == schema
+
+def test_lookup_indexes_are_used(baseline_db):
+    _, conn = baseline_db
+    migrate(conn)
+
+    def plan(query, params):
+        return " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+    assert "IDX_DOCTOR_SPECIALITY" in plan(
+        "SELECT NAME FROM DOCTOR WHERE SPECIALITY = ? AND IS_ACTIVE = 1 ORDER BY AVAILABLE_FROM", ("ENT",))
+    assert "IDX_PATIENT_NAME_LOWER" in plan("SELECT PATIENT_ID FROM PATIENT WHERE LOWER(NAME)=LOWER(?)", ("x",))
+    assert "IDX_SYMPTOMS_PATIENT" in plan("SELECT SYMPTOMS FROM SYMPTOMS WHERE PATIENT_ID = ?", (1,))
+    assert "IDX_APPOINTMENT_DOCTOR_SLOT" in plan(
+        "SELECT 1 FROM APPOINTMENT WHERE DOCTOR_ID = ? AND DATE = ?", (1, "2030-01-01"))
+
+def test_appointment_keys_become_integers(baseline_db):
+    _, conn = baseline_db
+    conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID, DATE, TIME) VALUES ('3', '7', '2030-01-07', '10:00')")
+
+    migrate(conn)
+
+    assert conn.execute("SELECT APPOINTMENT_ID, PATIENT_ID, DOCTOR_ID FROM APPOINTMENT").fetchall() == [(1, 3, 7)]
+    assert conn.execute("SELECT TYPEOF(DOCTOR_ID) FROM APPOINTMENT").fetchone()[0] == "integer"
+
+def test_appointment_sequence_survives_rebuild(baseline_db):
+    _, conn = baseline_db
+    for _ in range(5):
+        conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID) VALUES ('1', '1')")
+    conn.execute("DELETE FROM APPOINTMENT WHERE APPOINTMENT_ID > 2")
+
+    migrate(conn)
+
+    assert _sequence(conn, "APPOINTMENT") == 5
+    conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID) VALUES (1, 1)")
+    assert conn.execute("SELECT MAX(APPOINTMENT_ID) FROM APPOINTMENT").fetchone()[0] == 6
+
+def test_appointment_sequence_survives_rebuild_of_empty_table(baseline_db):
+    _, conn = baseline_db
+    for _ in range(3):
+        conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID) VALUES ('1', '1')")
+    conn.execute("DELETE FROM APPOINTMENT")
+
+    migrate(conn)
+
+    assert _sequence(conn, "APPOINTMENT") == 3
+    conn.execute("INSERT INTO APPOINTMENT (PATIENT_ID, DOCTOR_ID) VALUES (1, 1)")
+    assert conn.execute("SELECT APPOINTMENT_ID FROM APPOINTMENT").fetchone()[0] == 4
+
+def test_symptom_index_follows_writes(baseline_db):
+    _, conn = baseline_db
+    conn.execute("INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (1, 'chest pain')")
+
+    migrate(conn)
+    conn.execute("INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS) VALUES (1, 'persistent cough')")
+
+    def matches(query):
+        return [r[0] for r in conn.execute("SELECT rowid FROM SYMPTOMS_FTS WHERE SYMPTOMS_FTS MATCH ?", (query,))]
+
+    assert matches("pain") == [1]
+    assert matches("PATIENT_KEY : p1 AND SYMPTOMS : coughing") == [2]
+
+    conn.execute("UPDATE SYMPTOMS SET SYMPTOMS = 'back pain' WHERE SYMPTOM_ID = 2")
+    conn.execute("DELETE FROM SYMPTOMS WHERE SYMPTOM_ID = 1")
+    assert matches("pain") == [2]
+    assert matches("cough") == []
+
+def test_doctor_update_touches_updated_at(baseline_db):
+    _, conn = baseline_db
+    conn.execute("INSERT INTO DOCTOR (SPECIALITY, NAME, UPDATED_AT) VALUES ('ENT', 'Dr. A', '2020-01-01 00:00:00')")
+
+    migrate(conn)
+    conn.execute("UPDATE DOCTOR SET IS_ACTIVE = 0")
+
+    assert conn.execute("SELECT UPDATED_AT FROM DOCTOR").fetchone()[0] > "2020-01-01 00:00:00"
+
+def test_connecting_does_not_migrate_by_default(baseline_db):
+    path, conn = baseline_db
+    previous = Database.get_db_path()
+
+    Database.configure(path)
+    try:
+        assert get_version(Database.get_connection()) == 0
+    finally:
+        Database.configure(previous)
+
+def test_checked_in_db_is_migrated():
+    conn = sqlite3.connect(f"file:{Database.DEFAULT_DB_PATH}?mode=ro", uri=True)
+    try:
+        assert get_version(conn) == LATEST
+    finally:
+        conn.close()
+
+def test_benchmark_starts_from_the_baseline_schema(tmp_path):
+    from MigrationsBenchmark import _build_benchmark_db
+
+    conn = _build_benchmark_db(str(tmp_path / "bench.db"), n_doctors=20, n_patients=50, n_symptoms=100)
+
+    assert get_version(conn) == 0
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type IN ('index', 'trigger') "
+                        "AND sql IS NOT NULL").fetchone()[0] == 0
+    assert conn.execute("SELECT TYPEOF(DOCTOR_ID) FROM APPOINTMENT LIMIT 1").fetchone()[0] == "text"
+    conn.close()
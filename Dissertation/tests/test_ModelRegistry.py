@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import ModelRegistry
+from ModelRegistry import (ModelWatcher, latest_version, list_models, load_model, load_or_train, promote_model,
+                           save_model, train_model)
+from VitalsGenerator import generate
+
+pytest.importorskip("sklearn")
+pytest.importorskip("joblib")
+
+def _train(seed=0):
+    return train_model(rows=500, seed=seed, n_estimators=10)
+
+def test_same_seed_same_artifact(tmp_path):
+    first = save_model(*_train(), str(tmp_path))
+    again = save_model(*_train(), str(tmp_path), promote=False)
+    other = save_model(*_train(seed=1), str(tmp_path), promote=False)
+
+    assert first["version"] == again["version"] != other["version"]
+    assert latest_version(str(tmp_path)) == first["version"]
+    assert len(list_models(str(tmp_path))) == 2
+
+def test_loaded_model_scores_like_the_trained_one(tmp_path):
+    model, params = _train()
+    manifest = save_model(model, params, str(tmp_path))
+
+    loaded, loaded_manifest = load_model(model_dir=str(tmp_path))
+
+    X = generate(200, "anomalous", seed=2)
+    np.testing.assert_array_equal(model.score_samples(X), loaded.score_samples(X))
+    assert loaded_manifest == manifest
+    assert manifest["params"]["rows"] == 500
+
+def test_promote(tmp_path):
+    first = save_model(*_train(), str(tmp_path))
+    second = save_model(*_train(seed=1), str(tmp_path))
+    assert latest_version(str(tmp_path)) == second["version"]
+
+    promote_model(first["version"], str(tmp_path))
+    assert load_model(model_dir=str(tmp_path))[1]["version"] == first["version"]
+
+    with pytest.raises(FileNotFoundError):
+        promote_model("0123456789ab", str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        load_model(model_dir=str(tmp_path / "empty"))
+
+def test_tampered_artifact_is_refused(tmp_path):
+    manifest = save_model(*_train(), str(tmp_path))
+    with open(tmp_path / manifest["artifact"], "ab") as f:
+        f.write(b"\0")
+
+    with pytest.raises(ValueError, match="content hash"):
+        load_model(model_dir=str(tmp_path))
+
+def test_feature_mismatch_is_refused(tmp_path):
+    manifest = save_model(*_train(), str(tmp_path))
+    path = tmp_path / f"anomaly-{manifest['version']}.json"
+    path.write_text(json.dumps({**manifest, "features": ["heart_rate", "spo2"]}))
+
+    with pytest.raises(ValueError, match="expects features"):
+        load_model(model_dir=str(tmp_path))
+
+def test_load_or_train_trains_only_when_nothing_is_promoted(tmp_path, monkeypatch):
+    monkeypatch.setattr(ModelRegistry, "train_model", lambda: _train())
+    model, manifest = load_or_train(str(tmp_path))
+    assert latest_version(str(tmp_path)) == manifest["version"]
+
+    def no_training():
+        raise AssertionError("trained again")
+
+    monkeypatch.setattr(ModelRegistry, "train_model", no_training)
+    assert load_or_train(str(tmp_path))[1]["version"] == manifest["version"]
+
+def test_watcher_swaps_promoted_models_and_skips_broken_ones(tmp_path):
+    first = save_model(*_train(), str(tmp_path))
+    swapped = []
+    swap = threading.Event()
+
+    def on_swap(model, manifest):
+        swapped.append(manifest["version"])
+        swap.set()
+
+    watcher = ModelWatcher(on_swap, model_dir=str(tmp_path), interval=0.02)
+    try:
+        broken = save_model(*_train(seed=1), str(tmp_path))
+        os.remove(tmp_path / broken["artifact"])
+        second = save_model(*_train(seed=2), str(tmp_path), promote=False)
+
+        promote_model(broken["version"], str(tmp_path))
+        swap.wait(0.3)
+        assert swapped == []
+
+        promote_model(second["version"], str(tmp_path))
+        assert swap.wait(5)
+    finally:
+        watcher.stop()
+
+    assert swapped == [second["version"]]
+    assert watcher.current == second["version"] != first["version"]
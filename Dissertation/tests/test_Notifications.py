@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+import Notifications
+import Tracing
+from Notifications import NotificationDispatcher, is_safe_to_retry
+
+class RestError(Exception):
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+class FlakySend:
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, body, to):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"SM{self.calls}"
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(Notifications, "BACKOFF_SECONDS", 0.0)
+
+@pytest.fixture
+def spans(monkeypatch):
+    exported = []
+    exporter = Tracing.JSONLExporter("unused")
+    monkeypatch.setattr(exporter, "export", exported.append)
+    monkeypatch.setattr(Tracing, "_exporter", exporter)
+    return exported
+
+def test_safe_retry_classification():
+    requests = pytest.importorskip("requests")
+
+    assert is_safe_to_retry(RestError(429))
+    assert is_safe_to_retry(RestError(503))
+    assert is_safe_to_retry(requests.exceptions.ConnectTimeout())
+    assert not is_safe_to_retry(RestError(400))
+    assert not is_safe_to_retry(requests.exceptions.ReadTimeout())
+    assert not is_safe_to_retry(TimeoutError())
+
+def test_throttled_send_is_retried(spans):
+    send = FlakySend([RestError(429), RestError(503)])
+    dispatcher = NotificationDispatcher(send=send, inline=True)
+
+    assert dispatcher.dispatch("Take BP pills")["status"] == "sent"
+    assert (send.calls, dispatcher.retries, dispatcher.sent) == (3, 2, 1)
+    assert spans[-1].attributes["notification.attempts"] == 3
+    assert spans[-1].attributes["notification.status"] == "sent"
+
+def test_ambiguous_failure_is_not_retried(spans):
+    send = FlakySend([TimeoutError("read timed out")])
+    dispatcher = NotificationDispatcher(send=send, inline=True)
+
+    assert dispatcher.dispatch("Take BP pills")["status"] == "failed"
+    assert send.calls == 1
+    assert spans[-1].attributes["notification.status"] == "failed"
+    assert "read timed out" in spans[-1].attributes["notification.error"]
+
+def test_retries_stop_after_max_attempts():
+    send = FlakySend([RestError(503)] * 10)
+    dispatcher = NotificationDispatcher(send=send, inline=True)
+
+    assert dispatcher.dispatch("x")["status"] == "failed"
+    assert send.calls == Notifications.MAX_ATTEMPTS
+
+def test_shutdown_delivers_queued_then_drops(monkeypatch):
+    registered = []
+    monkeypatch.setattr(Notifications.atexit, "register", lambda fn, **kwargs: registered.append((fn, kwargs)))
+    release = threading.Event()
+    delivered = []
+
+    def slow_send(body, to):
+        release.wait()
+        delivered.append(body)
+        return "SM"
+
+    dispatcher = NotificationDispatcher(send=slow_send, workers=1)
+    statuses = [dispatcher.dispatch(f"message {i}")["status"] for i in range(3)]
+    release.set()
+    dispatcher.shutdown()
+    dispatcher.shutdown()
+
+    assert statuses == ["queued"] * 3
+    assert delivered == ["message 0", "message 1", "message 2"]
+    assert dispatcher.dispatch("late")["status"] == "dropped"
+    assert registered == [(dispatcher.shutdown, {"timeout": Notifications.SHUTDOWN_TIMEOUT})]
+
+def test_inline_dispatcher_has_no_exit_hook(monkeypatch):
+    registered = []
+    monkeypatch.setattr(Notifications.atexit, "register", lambda fn, **kwargs: registered.append(fn))
+
+    NotificationDispatcher(send=FlakySend([]), inline=True)
+
+    assert registered == []
@@ -0,0 +1,84 @@
+import time
+
+import PatientCache
+import Tools
+from Database import transaction
+from PatientCache import LRUCache
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(ttl=10)
+    cache.put("a", 1)
+
+    now[0] += 9
+    assert cache.get("a") == 1
+
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_on_evict_sees_evicted_and_expired_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    dropped = []
+    cache = LRUCache(max_entries=1, ttl=10, on_evict=lambda key, value: dropped.append((key, value)))
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    now[0] += 11
+    cache.get("b")
+
+    assert dropped == [("a", 1), ("b", 2)]
+
+def test_update_only_touches_cached_keys():
+    cache = LRUCache()
+    cache.update("missing", lambda v: v + ["x"])
+    assert cache.get("missing") is None
+
+    cache.put(1, ["fever"])
+    cache.update(1, lambda v: v + ["cough"])
+    assert cache.get(1) == ["fever", "cough"]
+
+def test_normalize_name():
+    assert PatientCache.normalize_name("  Sourav   DAS ") == "sourav das"
+    assert PatientCache.normalize_name(None) == ""
+
+def test_missing_name_is_unknown_patient(scratch_db):
+    assert Tools.get_patient_details(None) == 0
+    assert Tools.get_patient_details("   ") == 0
+
+def test_known_patient_is_cached(scratch_db, monkeypatch):
+    patient_id = Tools.get_patient_details("Sourav Das")
+    assert patient_id
+
+    monkeypatch.setattr(Tools, "get_repository", lambda: None)
+    assert Tools.get_patient_details("sourav  das") == patient_id
+
+def test_unknown_patient_is_not_cached(scratch_db):
+    assert Tools.get_patient_details("New Patient") == 0
+
+    # Registered by another process after the first lookup
+    with transaction() as conn:
+        patient_id = conn.execute("INSERT INTO PATIENT (NAME) VALUES ('New Patient')").lastrowid
+
+    assert Tools.get_patient_details("New Patient") == patient_id
+
+def test_symptom_history_write_through(scratch_db):
+    history = Tools.get_symptom_details(1)
+
+    PatientCache.record_symptoms(1, "rash")
+    PatientCache.record_symptoms(1, None)
+
+    assert Tools.get_symptom_details(1) == history + ["rash"]
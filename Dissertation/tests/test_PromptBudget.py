@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+import PromptBudget
+import Tracing
+from PromptBudget import MAX_OLD_TOOL_TOKENS, count_tokens, fit_prompt, message_tokens
+
+SYSTEM = "You are a clinical conversational AI assistant."
+TOOL_OUTPUT = json.dumps([{"doctor_id": i, "name": f"Dr. Doctor {i}", "speciality": "Cardiology"} for i in range(60)])
+
+def _history(turns):
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "content": f"Turn {turn}: I still have chest pain, can we find a slot?"})
+        messages.append({"role": "assistant", "content": "",
+                         "tool_calls": [{"name": "find_available_doctors", "args": {}, "id": f"c{turn}"}]})
+        messages.append({"role": "tool", "content": TOOL_OUTPUT, "tool_call_id": f"c{turn}"})
+        messages.append({"role": "assistant", "content": f"Reply {turn}: here are the cardiologists."})
+    return messages
+
+def _tokens(prompt):
+    return sum(message_tokens(m) for m in prompt)
+
+@pytest.mark.parametrize("budget", [1500, 3000, 6000])
+def test_prompt_fits_budget_and_keeps_latest_turn(budget):
+    state = {"messages": _history(30)}
+
+    prompt = fit_prompt("conversation", SYSTEM, state, budget=budget)
+
+    assert _tokens(prompt) <= budget
+    assert prompt[-1]["content"] == "Reply 29: here are the cardiologists."
+    assert "Earlier conversation (summarized)" in prompt[0]["content"]
+
+def test_short_history_is_sent_whole():
+    state = {"messages": _history(1)}
+
+    prompt = fit_prompt("conversation", SYSTEM, state, budget=10000)
+
+    assert prompt[1:] == state["messages"]
+    assert "summarized" not in prompt[0]["content"]
+
+def test_tool_calls_stay_with_their_results():
+    prompt = fit_prompt("triage", SYSTEM, {"messages": _history(30)}, budget=2500)
+
+    for i, message in enumerate(prompt):
+        if message["role"] == "tool":
+            assert prompt[i - 1]["role"] in ("assistant", "tool")
+            assert prompt[i - 1] is not prompt[0]
+
+def test_only_latest_tool_result_is_full():
+    prompt = fit_prompt("triage", SYSTEM, {"messages": _history(3)}, budget=100000)
+
+    tool_results = [m["content"] for m in prompt if m["role"] == "tool"]
+    assert tool_results[-1] == TOOL_OUTPUT
+    assert all(count_tokens(t) <= MAX_OLD_TOOL_TOKENS + 10 and t.endswith("[truncated]") for t in tool_results[:-1])
+
+def test_pinned_details_survive_any_budget():
+    state = {
+        "messages": _history(30),
+        "extracted_entities": {"patient_name": "Ravi"},
+        "appointment_details": {"doctor_id": 7, "doctor_name": "Dr. Doctor 7"}
+    }
+
+    system = fit_prompt("validation", SYSTEM, state, budget=800)[0]["content"]
+
+    assert '"patient_name": "Ravi"' in system and '"doctor_id": 7' in system
+
+def test_counts_go_to_the_span_not_stdout(capsys, monkeypatch):
+    exported = []
+    exporter = Tracing.JSONLExporter("unused")
+    monkeypatch.setattr(exporter, "export", exported.append)
+    monkeypatch.setattr(Tracing, "_exporter", exporter)
+
+    with Tracing.span("node.conversation") as node:
+        fit_prompt("conversation", SYSTEM, {"messages": _history(30)}, budget=2000)
+
+    assert node.attributes["prompt.agent"] == "conversation"
+    assert node.attributes["prompt.tokens_before"] > node.attributes["prompt.tokens_after"] > 0
+    assert node.attributes["prompt.messages_summarized"] > 0
+    assert not PromptBudget.LOG_TURNS
+    assert capsys.readouterr().out == ""
+
+def test_oversized_latest_tool_round_is_shortened_not_dropped():
+    prompt = fit_prompt("conversation", SYSTEM, {"messages": _history(5)}, budget=900)
+
+    tool_results = [m["content"] for m in prompt if m["role"] == "tool"]
+    assert _tokens(prompt) <= 900
+    assert tool_results and tool_results[-1].endswith("[truncated]")
+
+def test_checkpointer_summary_survives_a_long_history():
+    from langchain_core.messages import SystemMessage
+
+    compacted = [f"User: Earlier visit {i} - knee pain since the fall" for i in range(80)]
+    summary = SystemMessage(content="\n".join([PromptBudget.SUMMARY_HEADER] + compacted), id=PromptBudget.SUMMARY_ID)
+    state = {"messages": [summary] + _history(40)}
+
+    prompt = fit_prompt("conversation", SYSTEM, state, budget=3000)
+    system = prompt[0]["content"]
+    first_kept = min(int(m["content"].split(":")[0][5:]) for m in prompt[1:] if m["role"] == "user")
+
+    # Newest lines of both the compacted history and the turns dropped now
+    assert "Earlier visit 79" in system and "Earlier visit 0 " not in system
+    assert f"Turn {first_kept - 1}:" in system
+    assert PromptBudget.SUMMARY_HEADER not in system
+    assert count_tokens(system) - count_tokens(SYSTEM) <= 3000 * PromptBudget.SUMMARY_SHARE + 10
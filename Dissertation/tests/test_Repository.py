@@ -0,0 +1,174 @@
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import Database
+from Repository import PatientCareRepository, PostgresRepository, SQLiteRepository
+
+# Tables copied from PatientCareDB.db into Postgres, with their key column
+SEED_TABLES = [
+    ("DOCTOR", "DOCTOR_ID", ["DOCTOR_ID", "SPECIALITY", "NAME", "GENDER", "QUALIFICATION", "AVAILABLE_FROM",
+                             "AVAILABLE_TO", "AVAILABLE_DAYS", "IS_ACTIVE", "CREATED_AT", "UPDATED_AT"]),
+    # Some PATIENT timestamps are 0 in the checked-in DB, which Postgres refuses
+    ("PATIENT", "PATIENT_ID", ["PATIENT_ID", "NAME", "AGE", "GENDER", "MOBILE", "ADDRESS"]),
+    ("SYMPTOMS", "SYMPTOM_ID", ["SYMPTOM_ID", "PATIENT_ID", "SYMPTOMS", "CREATED_AT"]),
+    ("APPOINTMENT", "APPOINTMENT_ID", ["APPOINTMENT_ID", "PATIENT_ID", "DOCTOR_ID", "DATE", "TIME", "CREATED_AT",
+                                       "UPDATED_AT"]),
+    ("MEDICINE_ORDER", "ORDER_ID", ["ORDER_ID", "MEDICINE", "DOSAGE", "QUANTITY", "SHIPPING_ADDRESS"]),
+]
+
+# Doctor 1 works Mon-Fri 09:00-13:00; 2030-01-07 is a Monday
+DOCTOR = 1
+MONDAY = "2030-01-07"
+
+@pytest.fixture(scope="module")
+def pg_dsn(tmp_path_factory):
+    """
+    PATIENT_CARE_PG_TEST_DSN if set, else a throwaway server from pgserver.
+    """
+    dsn = os.getenv("PATIENT_CARE_PG_TEST_DSN")
+    if dsn:
+        yield dsn
+        return
+
+    pytest.importorskip("psycopg_pool")
+    pgserver = pytest.importorskip("pgserver")
+
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pg")), cleanup_mode="stop")
+    yield server.get_uri()
+    server.cleanup()
+
+@pytest.fixture(scope="module")
+def pg_repository(pg_dsn):
+    repository = PostgresRepository(pg_dsn, min_size=1, max_size=8)
+    repository.ensure_schema()
+    yield repository
+    repository.pool.close()
+
+def _seed_postgres(repository):
+    source = sqlite3.connect(f"file:{Database.DEFAULT_DB_PATH}?mode=ro", uri=True)
+
+    with repository.pool.connection() as conn, conn.transaction():
+        conn.execute("TRUNCATE " + ", ".join(t for t, _, _ in SEED_TABLES))
+
+        for table, key, columns in SEED_TABLES:
+            rows = source.execute(f"SELECT {', '.join(columns)} FROM {table}").fetchall()
+            if table == "MEDICINE_ORDER":
+                rows = [r[:2] + (str(r[2]),) + r[3:] for r in rows]
+            if rows:
+                placeholders = ", ".join(["%s"] * len(columns))
+                conn.cursor().executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+            # Explicit keys bypass SERIAL - move the sequence past them
+            conn.execute(f"SELECT SETVAL(PG_GET_SERIAL_SEQUENCE('{table.lower()}', '{key.lower()}'), "
+                         f"COALESCE((SELECT MAX({key}) FROM {table}), 0) + 1, false)")
+
+    source.close()
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def repository(request):
+    """
+    Each backend loaded with the rows of PatientCareDB.db.
+    """
+    if request.param == "sqlite":
+        request.getfixturevalue("scratch_db")
+        return SQLiteRepository()
+
+    repository = request.getfixturevalue("pg_repository")
+    _seed_postgres(repository)
+    return repository
+
+def test_repository_is_abstract():
+    with pytest.raises(TypeError):
+        PatientCareRepository()
+
+    class Partial(PatientCareRepository):
+        def doctor_version(self):
+            return None, 0
+
+    with pytest.raises(TypeError):
+        Partial()
+
+def test_doctors(repository):
+    doctors = repository.load_active_doctors()
+    updated_at, count = repository.doctor_version()
+
+    assert count == len(doctors) > 0
+    assert updated_at is not None
+    assert doctors[0][4] <= doctors[-1][4]
+    assert next(r for r in doctors if r[0] == DOCTOR)[4:] == ("09:00", "13:00", "Mon,Tue,Wed,Thu,Fri")
+
+def test_get_patient_id_ignores_case(repository):
+    assert repository.get_patient_id("SOURAV DAS") == repository.get_patient_id("sourav das") > 0
+    assert repository.get_patient_id("Nobody Here") == 0
+
+def test_booking_outcomes(repository):
+    first = repository.book_appointment(0, "New Patient", DOCTOR, MONDAY, "10:00", "sore throat")
+
+    assert first["status"] == "confirmed"
+    assert repository.get_patient_id("new patient") == first["patient_id"]
+    assert repository.get_symptoms(first["patient_id"]) == ["sore throat"]
+
+    assert repository.book_appointment(1, "Sourav Das", DOCTOR, MONDAY, "10:00", None)["status"] == "conflict"
+    assert repository.book_appointment(1, "Sourav Das", DOCTOR, MONDAY, "10:15", None)["status"] == "unavailable"
+    assert repository.book_appointment(1, "Sourav Das", 9999, MONDAY, "10:00", None)["status"] == "unavailable"
+    assert ("2030-01-07", "10:00") in [tuple(r) for r in repository.booked_times(DOCTOR, MONDAY, MONDAY)]
+
+def test_concurrent_bookings_confirm_once(repository):
+    def book(_):
+        return repository.book_appointment(1, "Sourav Das", DOCTOR, MONDAY, "11:30", None)["status"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(book, range(32)))
+
+    assert results.count("confirmed") == 1
+
+def test_symptom_queries(repository):
+    booked = repository.book_appointment(0, "Symptom Patient", DOCTOR, MONDAY, "09:00", "sharp chest pain")
+    patient_id = booked["patient_id"]
+    repository.bulk_insert_symptoms([(patient_id, "mild fever"), (patient_id, "chest tightness")])
+
+    found = [s for s, _ in repository.search_symptoms(patient_id, "chest", 5)]
+    assert sorted(found) == ["chest tightness", "sharp chest pain"]
+    assert repository.search_symptoms(patient_id, "!!", 5) == []
+
+    recent = repository.recent_symptoms(patient_id, None, None, 10)
+    assert len(recent) == 3
+    assert all(isinstance(created_at, str) for _, created_at in recent)
+    assert repository.recent_symptoms(patient_id, "2999-01-01 00:00:00", None, 10) == []
+
+def test_bulk_ids_follow_input_order(repository):
+    rows = [
+        (0, "Bulk One", DOCTOR, "2030-01-08", "09:00", "cough"),
+        (1, "Sourav Das", DOCTOR, "2030-01-08", "09:30", None),
+        (0, "Bulk Two", DOCTOR, "2030-01-08", "10:00", "rash"),
+    ]
+
+    appointment_ids, patient_ids, rejections = repository.bulk_book_appointments(rows)
+
+    assert rejections == [None, None, None]
+    assert appointment_ids == sorted(appointment_ids) and len(set(appointment_ids)) == 3
+    assert patient_ids[1] == 1
+    assert patient_ids[0] == repository.get_patient_id("Bulk One")
+    assert patient_ids[2] == repository.get_patient_id("Bulk Two")
+
+    # Checked against the rows just booked and each other; names resolve to the same patient
+    again = [
+        (0, "bulk one", DOCTOR, "2030-01-08", "09:00", None),
+        (0, "BULK THREE", DOCTOR, "2030-01-08", "10:30", None),
+        (0, "Bulk Three", DOCTOR, "2030-01-08", "11:00", None),
+        (0, "Bulk Four", DOCTOR, "2030-01-08", "11:00", None),
+    ]
+    appointment_ids, patient_ids, rejections = repository.bulk_book_appointments(again)
+    assert [r and r["status"] for r in rejections] == ["conflict", None, None, "conflict"]
+    assert appointment_ids[0] is None and appointment_ids[3] is None
+    assert patient_ids[1] == patient_ids[2] == repository.get_patient_id("Bulk Three")
+    assert repository.get_patient_id("Bulk Four") == 0
+
+    order_ids = repository.bulk_insert_medicine_orders([("Paracetamol", "500", "10", "Kolkata")] * 3)
+    single = repository.insert_medicine_order("Cetirizine", "10", "5", "Kolkata")
+    assert order_ids == list(range(order_ids[0], order_ids[0] + 3))
+    assert single == order_ids[-1] + 1
@@ -0,0 +1,149 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+import ResponseCache
+from ResponseCache import CachedChatModel, DiskBackend, MemoryBackend, SemanticIndex, cache_key
+
+SYSTEM = {"role": "system", "content": "You are a clinical conversational AI assistant."}
+
+class FakeMessage:
+
+    def __init__(self, content, id=None):
+        self.type = "ai"
+        self.content = content
+        self.id = id
+
+    def model_copy(self, update=None):
+        return FakeMessage(**{"content": self.content, "id": self.id, **(update or {})})
+
+class FakeLLM:
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs):
+        self.calls += 1
+        return FakeMessage(f"answer {self.calls}", id="llm")
+
+def _turn(text):
+    return [SYSTEM, {"role": "user", "content": text}]
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ResponseCache.time, "time", lambda: now[0])
+    monkeypatch.setattr("PatientCache.time.monotonic", lambda: now[0])
+    return now
+
+def test_cache_key_ignores_whitespace_and_splits_context():
+    exact, context, query = cache_key(_turn("Find  me a\ncardiologist"), "triage")
+
+    assert (exact, context) == cache_key(_turn("Find me a\ncardiologist"), "triage")[:2]
+    assert context == cache_key(_turn("something else"), "triage")[1]
+    assert exact != cache_key(_turn("Find me a\ncardiologist"), "conversation")[0]
+    assert query == "Find me a cardiologist"
+
+def test_exact_hit_skips_llm_and_gets_fresh_id():
+    llm = FakeLLM()
+    model = CachedChatModel(llm, "conversation", MemoryBackend())
+
+    first = model.invoke(_turn("What is a normal blood pressure?"))
+    second = model.invoke(_turn("What is a normal  blood pressure?"))
+
+    assert llm.calls == 1
+    assert second.content == first.content and second.id is None
+    assert model.stats()["hits"] == 1
+
+def test_semantic_hit_only_within_same_context():
+    llm = FakeLLM()
+    model = CachedChatModel(llm, "conversation", MemoryBackend(), semantic=SemanticIndex())
+
+    model.invoke(_turn("What are the symptoms of dengue?"))
+    model.invoke(_turn("what are the symptoms of dengue"))
+    assert (llm.calls, model.semantic_hits) == (1, 1)
+
+    model.invoke(_turn("How much water should I drink daily?"))
+    model.invoke([{"role": "system", "content": "Other prompt"}, {"role": "user", "content": "what are the symptoms of dengue"}])
+    assert llm.calls == 3
+
+def test_unshareable_responses_stay_out_of_semantic_tier():
+    llm = FakeLLM()
+    model = CachedChatModel(llm, "conversation", MemoryBackend(), semantic=SemanticIndex(),
+                            shareable=lambda messages, response: "dengue" not in messages[-1]["content"])
+
+    model.invoke(_turn("What are the symptoms of dengue?"))
+    model.invoke(_turn("what are the symptoms of dengue"))
+    model.invoke(_turn("What are the symptoms of dengue?"))
+
+    assert llm.calls == 2
+    assert (model.hits, model.semantic_hits) == (1, 0)
+
+def test_uncacheable_responses_are_not_stored():
+    llm = FakeLLM()
+    model = CachedChatModel(llm, "triage", MemoryBackend(), cacheable=lambda messages, response: False)
+
+    model.invoke(_turn("Book me with Dr. Sharma"))
+    model.invoke(_turn("Book me with Dr. Sharma"))
+
+    assert llm.calls == 2
+
+def test_memory_entries_expire(clock):
+    backend = MemoryBackend(ttl=60)
+    backend.put("k", "v")
+
+    clock[0] += 59
+    assert backend.get("k") == "v"
+    clock[0] += 2
+    assert backend.get("k") is None
+
+def test_semantic_index_drops_evicted_contexts(clock):
+    index = SemanticIndex(max_entries=2)
+    for i in range(5):
+        index.add(f"context-{i}", "what are the symptoms of dengue", f"key-{i}")
+
+    assert sorted(index._by_context) == ["context-3", "context-4"]
+
+    clock[0] += ResponseCache.TTL_SECONDS + 1
+    assert index.lookup("context-4", "what are the symptoms of dengue") is None
+    assert "context-4" not in index._by_context
+
+def test_disk_backend_stores_json_and_expires(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    backend = DiskBackend(path, ttl=60)
+    backend.put("k", {"content": "hello", "latency": 0.5})
+
+    assert backend.get("k") == {"content": "hello", "latency": 0.5}
+    raw = sqlite3.connect(path).execute("SELECT VALUE FROM RESPONSE_CACHE").fetchone()[0]
+    assert json.loads(raw) == {"content": "hello", "latency": 0.5}
+
+    clock[0] += 61
+    assert backend.get("k") is None
+    backend.close()
+
+def test_disk_backend_drops_undecodable_rows(tmp_path):
+    backend = DiskBackend(str(tmp_path / "cache.db"))
+    backend._conn.execute("INSERT INTO RESPONSE_CACHE VALUES ('old', ?, 1e12, 0)", (b"\x80\x04pickled",))
+
+    assert backend.get("old") is None
+    assert backend.stats()["size"] == 0
+    backend.close()
+
+def test_default_disk_path_is_next_to_module():
+    assert os.path.dirname(ResponseCache.DEFAULT_DISK_PATH) == os.path.dirname(os.path.abspath(ResponseCache.__file__))
+
+def test_disk_backend_round_trips_chat_messages(tmp_path):
+    messages = pytest.importorskip("langchain_core.messages")
+    backend = ResponseCache.make_backend("disk", str(tmp_path / "cache.db"))
+    response = messages.AIMessage(content="", id="run-1",
+                                  tool_calls=[{"name": "lookup", "args": {"q": "fever"}, "id": "call-1"}])
+
+    backend.put("k", (response, 1.5))
+    cached, latency = backend.get("k")
+
+    assert isinstance(cached, messages.AIMessage)
+    assert cached.tool_calls[0]["args"] == {"q": "fever"}
+    assert latency == 1.5
+    backend.close()
@@ -0,0 +1,114 @@
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+import Database
+import Snapshot
+from Database import get_connection, transaction
+
+def _add_patient(name):
+    with transaction() as conn:
+        conn.execute("INSERT INTO PATIENT (NAME) VALUES (?)", (name,))
+
+def _has_patient(conn, name):
+    return conn.execute("SELECT COUNT(*) FROM PATIENT WHERE NAME = ?", (name,)).fetchone()[0] == 1
+
+@pytest.fixture
+def manager(scratch_db, monkeypatch):
+    """
+    A snapshot of the scratch DB told about local commits, with no background refresher.
+    """
+    manager = Snapshot.SnapshotManager(interval=3600)
+    monkeypatch.setattr(manager, "start", lambda: None)
+    monkeypatch.setattr(Database, "_commit_listeners", [manager.mark_dirty])
+    manager.refresh()
+    return manager
+
+def _during_backup(manager, monkeypatch, action):
+    """
+    Run action once, while the next refresh() is copying - after it has noted the commit count.
+    """
+    backup = Snapshot.sqlite3.Connection.backup
+    pending = [action]
+
+    class Source(Snapshot.sqlite3.Connection):
+        def backup(self, target, **kwargs):
+            while pending:
+                pending.pop()()
+            return backup(self, target, **kwargs)
+
+    connect = Snapshot.sqlite3.connect
+    monkeypatch.setattr(Snapshot.sqlite3, "connect",
+                        lambda path, **kwargs: connect(path, **kwargs) if path == ":memory:"
+                        else connect(path, factory=Source, **kwargs))
+
+def test_reads_see_own_writes_while_refreshing(manager, monkeypatch):
+    _add_patient("Before Refresh")
+    seen = []
+    _during_backup(manager, monkeypatch, lambda: seen.append(_has_patient(manager.connection(), "Before Refresh")))
+
+    manager.refresh()
+
+    assert seen == [True]
+    assert _has_patient(manager.connection(), "Before Refresh")
+    assert not manager.stale()
+
+def test_commit_during_refresh_keeps_reads_on_primary(manager, monkeypatch):
+    _during_backup(manager, monkeypatch, lambda: _add_patient("During Refresh"))
+
+    manager.refresh()
+
+    assert manager.connection() is get_connection()
+    assert _has_patient(manager.connection(), "During Refresh")
+
+    manager.refresh()
+    assert manager.connection() is not get_connection()
+    assert _has_patient(manager.connection(), "During Refresh")
+
+def test_path_change_rebuilds_snapshot(manager, tmp_path):
+    other = str(tmp_path / "other.db")
+    shutil.copy(Database.get_db_path(), other)
+    conn = Snapshot.sqlite3.connect(other)
+    conn.execute("INSERT INTO PATIENT (NAME) VALUES ('Other File')")
+    conn.commit()
+    conn.close()
+
+    Database.configure(other)
+
+    assert _has_patient(manager.connection(), "Other File")
+
+def test_commit_from_another_process_is_noticed(manager):
+    subprocess.run([
+        sys.executable, "-c",
+        "import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); "
+        "conn.execute(\"INSERT INTO PATIENT (NAME) VALUES ('Other Process')\"); conn.commit()",
+        Database.get_db_path()
+    ], check=True)
+
+    assert not _has_patient(manager.connection(), "Other Process")
+    assert manager.stale()
+
+    manager.refresh()
+
+    assert _has_patient(manager.connection(), "Other Process")
+    assert not manager.stale()
+
+def test_burst_of_commits_costs_one_rebuild(scratch_db, monkeypatch):
+    manager = Snapshot.SnapshotManager(interval=3600)
+    monkeypatch.setattr(Database, "_commit_listeners", [manager.mark_dirty])
+    monkeypatch.setattr(Snapshot, "MIN_REFRESH_GAP", 0.5)
+    manager.connection()
+    refreshes = manager.refreshes
+
+    for i in range(20):
+        _add_patient(f"Burst {i}")
+
+    deadline = time.monotonic() + 10
+    while manager.stale() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert manager.refreshes == refreshes + 1
+    assert _has_patient(manager.connection(), "Burst 19")
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import StructuredOutput
+import Tracing
+from StructuredOutput import (IncrementalJSONParser, StructuredOutputError, ainvoke_structured, parse_structured,
+                              repair_json)
+
+ANSWER = {"reply": "Which date?", "intent": "appointment", "entities": {"symptoms": "fever"},
+          "ready_for_routing": False}
+
+@pytest.mark.parametrize("text", [
+    "```json\n" + json.dumps(ANSWER) + "\n```",
+    "Sure, here it is:\n" + json.dumps(ANSWER) + "\nLet me know!",
+    "{'reply': 'Which date?', 'intent': 'appointment', 'entities': {'symptoms': 'fever',}, 'ready_for_routing': False,}",
+    '{"reply": “Which date?”, "intent": "Appointments", "entities": {"symptoms": "fever"}, "ready_for_routing": "no"}',
+])
+def test_repairable_answers(text):
+    data, errors, repaired = parse_structured("conversation", text)
+
+    assert (data, errors, repaired) == (ANSWER, [], True)
+
+def test_schema_errors():
+    assert parse_structured("conversation", "Which date works for you?")[1] == ["no JSON object found"]
+    assert parse_structured("conversation", '{"reply": "Hi", "intent": "small_talk"}')[1][0].startswith("intent must")
+    assert parse_structured("conversation", '{"intent": "reminder"}')[1] == ["missing field 'reply'"]
+
+def test_truncated_validation_answer_is_rejected():
+    text = ('{"confirmed_by_user": true, "doctor_id": "3", "doctor_name": "Dr. X", '
+            '"date": "20-Oct-26", "time": "10:')
+
+    assert parse_structured("validation", text) == (None, ["answer was cut off"], True)
+    # Even when every member it has is complete
+    assert parse_structured("validation", '{"confirmed_by_user": true, "doctor_id": "3"')[0] is None
+
+def test_truncated_conversation_keeps_only_complete_members():
+    assert parse_structured("conversation", '{"reply": "Please confirm the appoint')[0] is None
+
+    data, _, _ = parse_structured("conversation", '{"reply": "Noted", "intent": "appointment", '
+                                                  '"entities": {"symptoms": "cough", "preferred_date": "20-Oc')
+    assert data["reply"] == "Noted"
+    assert data["entities"] == {"symptoms": "cough"}
+
+    # A number or literal may be cut short too
+    assert repair_json('{"reply": "Hi", "age": 4') == {"reply": "Hi"}
+    assert repair_json('{"reply": "Hi", "ok": tr') == {"reply": "Hi"}
+
+class ScriptedLLM:
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        return SimpleNamespace(content=self.answers.pop(0))
+
+@pytest.fixture
+def exported(monkeypatch):
+    spans = []
+    exporter = Tracing.JSONLExporter("unused")
+    monkeypatch.setattr(exporter, "export", spans.append)
+    monkeypatch.setattr(Tracing, "_exporter", exporter)
+    monkeypatch.setattr(StructuredOutput, "_metrics", StructuredOutput.defaultdict(
+        lambda: StructuredOutput.defaultdict(int)))
+    return spans
+
+def _run(agent, llm, max_reasks=1):
+
+    async def node():
+        with Tracing.span("node"):
+            return await ainvoke_structured(agent, llm, [{"role": "user", "content": "book it"}], max_reasks)
+
+    return asyncio.run(node())
+
+def test_cut_off_validation_answer_is_reasked(exported):
+    complete = {"confirmed_by_user": True, "doctor_id": "3", "date": "20-Oct-26", "time": "10:00"}
+    llm = ScriptedLLM('{"confirmed_by_user": true, "doctor_id": "3", "date": "20-Oct-26", "time": "10:',
+                      json.dumps(complete))
+
+    data = _run("validation", llm)
+
+    assert data["time"] == "10:00"
+    assert "answer was cut off" in llm.calls[1][-1]["content"]
+    assert StructuredOutput.metrics_summary()["validation"]["reasked"] == 1
+
+    attributes = exported[-1].attributes
+    assert attributes["structured.invalid_answers"] == 1
+    assert attributes["structured.errors"] == "answer was cut off"
+
+def test_failure_after_reasks(exported):
+    llm = ScriptedLLM("no json", "still no json")
+
+    with pytest.raises(StructuredOutputError) as raised:
+        _run("conversation", llm)
+
+    assert raised.value.text == "still no json"
+    summary = StructuredOutput.metrics_summary()["conversation"]
+    assert (summary["invalid_answers"], summary["failed"]) == (2, 1)
+    assert exported[-1].attributes["structured.invalid_answers"] == 2
+
+def test_incremental_parser_streams_reply_and_fields():
+    answer = json.dumps({"reply": "Line \"one\"\nnext é", **{k: v for k, v in ANSWER.items() if k != "reply"}})
+    parser = IncrementalJSONParser()
+
+    streamed = "".join(parser.feed(answer[i:i + 3]) for i in range(0, len(answer), 3))
+
+    assert streamed == "Line \"one\"\nnext é"
+    assert parser.fields["intent"] == "appointment"
+    assert parser.result("conversation")[0]["entities"] == {"symptoms": "fever"}
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+import Tools
+from Availability import book_slot
+from Database import transaction
+
+def _add_symptom(patient_id, text, created_at):
+    with transaction() as conn:
+        conn.execute("INSERT INTO SYMPTOMS (PATIENT_ID, SYMPTOMS, CREATED_AT) VALUES (?, ?, ?)",
+                     (patient_id, text, created_at.strftime("%Y-%m-%d %H:%M:%S")))
+
+def test_recent_symptoms_window_is_utc(scratch_db):
+    # CURRENT_TIMESTAMP rows are UTC; the cut-off must be computed in UTC too
+    now = datetime.now(timezone.utc)
+    _add_symptom(7, "inside window", now - timedelta(days=2))
+    _add_symptom(7, "outside window", now - timedelta(days=3, hours=1))
+
+    assert Tools.get_recent_symptoms("7", days=3) == ["inside window"]
+    assert Tools.get_recent_symptoms("7", days=4) == ["inside window", "outside window"]
+
+def test_doctor_candidates_skip_booked_slots(scratch_db):
+    # Tuesday 11:00 - General Medicine doctors 1, 3 and 4 all work then
+    def matches():
+        return {d["doctor_id"]: d["match"] for d in
+                Tools.find_doctor_candidates(None, "General Medicine", "08-Jan-30", "11:00")}
+
+    assert matches()[1] == "available"
+    assert [d["doctor_id"] for d in Tools.find_doctor_candidates("Amit Sharma", None, "08-Jan-30", "11:00")] == [1]
+
+    assert book_slot(1, "Sourav Das", 1, "2030-01-08", "11:00", None)["status"] == "confirmed"
+
+    assert matches()[1] == "same day, different time"
+    named = Tools.find_doctor_candidates("Amit Sharma", None, "08-Jan-30", "11:00")
+    assert 1 not in [d["doctor_id"] for d in named if d["match"] == "available"]
@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import Tracing
+from Tracing import JSONLExporter, load_spans, span
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    exporter = JSONLExporter(str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(Tracing, "_exporter", exporter)
+    return exporter
+
+def test_tracing_is_opt_in_and_writes_outside_the_package():
+    env = {k: v for k, v in os.environ.items() if k not in ("TRACING", "TRACE_FILE")}
+    out = subprocess.run([sys.executable, "-c", "import Tracing; print(Tracing._exporter, Tracing.TRACE_FILE)"],
+                         cwd=os.path.dirname(Tracing.__file__), env=env, capture_output=True, text=True, check=True)
+
+    exporter, trace_file = out.stdout.split()
+    assert exporter == "None"
+    assert not os.path.abspath(trace_file).startswith(os.path.dirname(os.path.abspath(Tracing.__file__)))
+
+def test_counters_roll_up_and_trace_is_flushed(exporter):
+    with span("turn"):
+        with span("node.triage"):
+            with span("llm.triage") as s:
+                s.set_attribute("llm.calls", 1)
+            with span("llm.triage") as s:
+                s.set_attribute("llm.calls", 1)
+
+    spans = {s["name"]: s for s in load_spans(exporter.path)}
+    assert spans["turn"]["attributes"]["llm.calls"] == 2
+    assert spans["node.triage"]["parent_span_id"] == spans["turn"]["span_id"]
+    assert len({s["trace_id"] for s in spans.values()}) == 1
+
+def test_error_status(exporter):
+    with pytest.raises(ValueError):
+        with span("turn"):
+            raise ValueError("bad date")
+
+    assert load_spans(exporter.path)[0]["status"] == {"code": "ERROR", "message": "ValueError: bad date"}
+
+def test_file_rotates_past_max_bytes(tmp_path, monkeypatch):
+    exporter = JSONLExporter(str(tmp_path / "traces.jsonl"), max_bytes=1)
+    monkeypatch.setattr(Tracing, "_exporter", exporter)
+
+    with span("first"):
+        pass
+    with span("second"):
+        pass
+
+    def names(path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line)["name"] for line in f]
+
+    assert names(exporter.path + ".1") == ["first"]
+    assert names(exporter.path) == ["second"]
+    # Read back together, oldest first
+    assert [s["name"] for s in load_spans(exporter.path)] == ["first", "second"]
@@ -0,0 +1,98 @@
+import pytest
+
+from Schedule import slot_problem
+from TriagePrefetch import classify_speciality, rank_candidates
+
+# The keyword lists were tuned on these; this guards against regressions only
+TUNING_EXAMPLES = [
+    ("chest pain when climbing stairs", "Cardiology"), ("palpitations at night", "Cardiology"),
+    ("my knee hurts after running", "Orthopedics"), ("lower back pain for a week", "Orthopedics"),
+    ("irregular periods", "Gynecology"), ("itchy red rash on arms", "Dermatology"),
+    ("acne on face", "Dermatology"), ("frequent migraine with nausea", "Neurology"),
+    ("numbness in left hand", "Neurology"), ("anxiety and panic attacks", "Psychiatry"),
+    ("cannot sleep, insomnia for weeks", "Psychiatry"), ("ear pain and hearing loss", "ENT"),
+    ("sore throat and swollen tonsils", "ENT"), ("blurred vision", "Ophthalmology"),
+    ("dry cough and wheezing", "Pulmonology"), ("asthma attacks", "Pulmonology"),
+    ("stomach ache and acidity", "Gastroenterology"), ("diarrhoea since yesterday", "Gastroenterology"),
+    ("high blood sugar, diabetic", "Endocrinology"), ("thyroid problem", "Endocrinology"),
+    ("blood in urine", "Nephrology"), ("kidney stone pain", "Nephrology"),
+    ("fever and body ache", "General Medicine"), ("cold and chills", "General Medicine"),
+    ("my baby has a fever", "Pediatrics"), ("fever with cough", "Pulmonology"),
+]
+
+@pytest.mark.parametrize("text, speciality", TUNING_EXAMPLES)
+def test_tuning_examples_still_classify(text, speciality):
+    predicted, _ = classify_speciality(text)
+    assert predicted in (speciality, None)
+
+def test_abstains_without_evidence_or_on_a_tie():
+    assert classify_speciality("") == (None, 0.0)
+    assert classify_speciality("I feel strange") == (None, 0.0)
+    assert classify_speciality("rash and ear pain")[0] is None
+    assert classify_speciality("early morning walk")[0] is None
+
+def _doctor(doctor_id, start, end, days="Mon,Tue,Wed,Thu,Fri"):
+    return {"doctor_id": doctor_id, "name": f"Dr. {doctor_id}", "available_from": start,
+            "available_to": end, "available_days": days}
+
+def test_ranking_tiers():
+    doctors = [
+        _doctor(1, "14:00", "18:00", "Sat"),
+        _doctor(2, "09:00", "11:00"),
+        _doctor(3, "09:00", "13:00"),
+    ]
+
+    ranked = rank_candidates(doctors, "Tuesday", "12:00")
+
+    assert [d["doctor_id"] for d in ranked] == [3, 2, 1]
+    assert ranked[0]["match"] == "available"
+    assert ranked[1]["suggested_time"] == "10:30"
+    assert (ranked[2]["suggested_day"], ranked[2]["suggested_time"]) == ("Saturday", "14:00")
+
+@pytest.mark.parametrize("start, end, preferred, suggested", [
+    ("09:00", "13:00", "08:00", "09:00"),
+    ("09:00", "13:00", "12:45", "12:30"),
+    ("09:00", "13:00", "10:10", "10:00"),
+    ("09:15", "09:45", "08:00", "09:15"),
+    ("09:15", "09:45", "11:00", "09:15"),
+    ("10:00", "10:50", "12:00", "10:00"),
+])
+def test_suggestions_are_bookable_slots(start, end, preferred, suggested):
+    # 2030-01-07 is a Monday
+    ranked = rank_candidates([_doctor(1, start, end)], "Monday", preferred)
+
+    assert ranked[0]["suggested_time"] == suggested
+    assert slot_problem(start, end, "Mon,Tue,Wed,Thu,Fri", "2030-01-07", suggested) is None
+
+def test_window_shorter_than_a_slot_is_skipped():
+    assert rank_candidates([_doctor(1, "09:00", "09:20")], "Monday", "09:00") == []
+
+def test_unusable_preference_keeps_directory_order():
+    doctors = [_doctor(2, "09:00", "11:00"), _doctor(1, "09:00", "13:00")]
+
+    assert [d["doctor_id"] for d in rank_candidates(doctors, "someday", "10:00")] == [2, 1]
+
+def test_booked_slots_are_not_offered():
+    # 2030-01-08 is a Tuesday; doctor 3 is booked at noon, doctor 2 all Tuesday
+    bookings = {
+        (3, "2030-01-08"): [("12:00",)],
+        (2, "2030-01-08"): [("09:00",), ("09:30",), ("10:00",), ("10:30",)],
+    }
+    doctors = [_doctor(2, "09:00", "11:00"), _doctor(3, "09:00", "13:00")]
+
+    ranked = rank_candidates(doctors, "08-Jan-30", "12:00", lambda d, day: bookings.get((d, day), []))
+
+    assert [d["doctor_id"] for d in ranked] == [3, 2]
+    assert (ranked[0]["match"], ranked[0]["suggested_time"]) == ("same day, different time", "11:30")
+    assert (ranked[1]["match"], ranked[1]["suggested_date"], ranked[1]["suggested_time"]) == (
+        "different day", "09-Jan-30", "10:30")
+
+def test_off_grid_booking_blocks_the_slots_it_overlaps():
+    ranked = rank_candidates([_doctor(1, "09:00", "13:00")], "08-Jan-30", "10:00",
+                             lambda d, day: [("10:15",)] if day == "2030-01-08" else [])
+
+    assert ranked[0]["suggested_time"] == "09:30"
+
+def test_fully_booked_horizon_drops_the_doctor():
+    assert rank_candidates([_doctor(1, "09:00", "10:00")], "08-Jan-30", "09:00",
+                           lambda d, day: [("09:00",), ("09:30",)]) == []
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+import VitalsBuffer as VitalsBufferModule
+from VitalsBuffer import VitalsBuffer
+
+FEATURES = ["a", "b"]
+
+def _rows(n, seed=0):
+    return np.random.default_rng(seed).normal(70, 15, size=(n, len(FEATURES))).astype(np.float32)
+
+def _fill(buffer, rows):
+    for i, row in enumerate(rows):
+        buffer.append(row, float(i))
+
+def test_empty_buffer():
+    buffer = VitalsBuffer(4, FEATURES)
+
+    assert len(buffer) == 0
+    assert buffer.window()[1].shape == (0, 2)
+    assert np.isnan(buffer.mean()).all() and np.isnan(buffer.minimum()).all() and np.isnan(buffer.ewma()).all()
+
+def test_window_wraps_around_oldest_first():
+    buffer = VitalsBuffer(5, FEATURES)
+    rows = _rows(13)
+    _fill(buffer, rows)
+
+    timestamps, values = buffer.window()
+    assert len(buffer) == 5
+    assert timestamps.tolist() == [8, 9, 10, 11, 12]
+    np.testing.assert_array_equal(values, rows[-5:])
+    np.testing.assert_array_equal(buffer.window(2)[1], rows[-2:])
+    np.testing.assert_array_equal(buffer.column("b", 3), rows[-3:, 1])
+
+    # A contiguous view of the ring, not a copy
+    assert np.shares_memory(values, buffer.values)
+
+def test_capacity_one():
+    buffer = VitalsBuffer(1, FEATURES)
+
+    for i, row in enumerate(_rows(4)):
+        buffer.append(row, float(i))
+        assert buffer.window()[0].tolist() == [i]
+        np.testing.assert_array_equal(buffer.mean(), row)
+        np.testing.assert_array_equal(buffer.minimum(), row)
+        np.testing.assert_array_equal(buffer.maximum(), row)
+
+@pytest.mark.parametrize("capacity", [1, 2, 3, 7, 50])
+def test_rolling_aggregates_match_recomputation(capacity):
+    buffer = VitalsBuffer(capacity, FEATURES)
+
+    for i, row in enumerate(_rows(300, seed=capacity)):
+        buffer.append(row, float(i))
+        window = buffer.window()[1]
+        np.testing.assert_allclose(buffer.mean(), window.mean(axis=0, dtype=np.float64), rtol=1e-9)
+        np.testing.assert_array_equal(buffer.minimum(), window.min(axis=0))
+        np.testing.assert_array_equal(buffer.maximum(), window.max(axis=0))
+
+def test_min_and_max_expire_with_the_window():
+    buffer = VitalsBuffer(3, ["x"])
+
+    for i, x in enumerate([1, 9, 5, 4, 3, 2]):
+        buffer.append([x], float(i))
+
+    # The 1 and the 9 have both left the window [4, 3, 2]
+    assert buffer.minimum().tolist() == [2]
+    assert buffer.maximum().tolist() == [4]
+
+    buffer.append([2], 6.0)
+    buffer.append([2], 7.0)
+    assert buffer.minimum().tolist() == [2] and buffer.maximum().tolist() == [2]
+
+def test_ewma():
+    buffer = VitalsBuffer(2, ["x"], alpha=0.5)
+
+    for i, x in enumerate([10, 20, 40]):
+        buffer.append([x], float(i))
+
+    # 10 -> 15 -> 27.5, independent of the window length
+    assert buffer.ewma().tolist() == [27.5]
+    assert buffer.summary()["x"] == {"mean": 30.0, "min": 20.0, "max": 40.0, "ewma": 27.5}
+
+def test_running_sum_is_resummed(monkeypatch):
+    monkeypatch.setattr(VitalsBufferModule, "RESUM_EVERY", 8)
+    buffer = VitalsBuffer(5, FEATURES)
+    rows = _rows(40) * 1000
+
+    _fill(buffer, rows)
+
+    np.testing.assert_array_equal(buffer._sum, buffer.window()[1].sum(axis=0, dtype=np.float64))
+
+def test_footprint_is_fixed_at_construction():
+    import tracemalloc
+
+    buffer = VitalsBuffer(200, FEATURES)
+    nbytes = buffer.nbytes
+    _fill(buffer, _rows(300))
+
+    # Worst case for the min/max queues: a monotonic run keeps every position live
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(1000):
+        buffer.append([float(i), float(-i)], float(i))
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert buffer.nbytes == nbytes
+    assert grown < 1024
+    np.testing.assert_array_equal(buffer.minimum(), [800, -999])
+    np.testing.assert_array_equal(buffer.maximum(), [999, -800])
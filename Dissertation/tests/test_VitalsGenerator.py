@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from Features import FEATURES
+from VitalsGenerator import PROFILES, generate, generate_labeled, iter_chunks, write_dataset
+
+@pytest.mark.parametrize("profile", sorted(PROFILES))
+def test_generate_stays_within_profile_bounds(profile):
+    X = generate(5000, profile, seed=0)
+    bounds = np.asarray(PROFILES[profile])
+
+    assert X.shape == (5000, len(FEATURES))
+    assert (X >= bounds[:, 2]).all() and (X <= bounds[:, 3]).all()
+
+def test_same_seed_same_array():
+    np.testing.assert_array_equal(generate(100, seed=7), generate(100, seed=7))
+    assert not np.array_equal(generate(100, seed=7), generate(100, seed=8))
+    assert generate(10, seed=7, dtype=np.float32).dtype == np.float32
+
+def test_profile_needs_every_feature():
+    with pytest.raises(ValueError):
+        generate(10, [(72, 10, 60, 100)])
+
+def test_labeled_anomalies():
+    X, y = generate_labeled(10000, anomaly_rate=0.1, seed=1)
+
+    assert y.sum() == 1000
+    # Injected rows leave the baseline: fever, tachycardia and friends move the feature means
+    assert np.abs(X[y == 1].mean(axis=0) - X[y == 0].mean(axis=0)).max() > 1
+
+def test_chunks_are_reproducible_and_cover_every_row():
+    chunks = list(iter_chunks(2500, seed=3, chunk_rows=1000))
+
+    assert [len(X) for X, _ in chunks] == [1000, 1000, 500]
+    again = np.concatenate([X for X, _ in iter_chunks(2500, seed=3, chunk_rows=1000)])
+    np.testing.assert_array_equal(np.concatenate([X for X, _ in chunks]), again)
+
+def test_write_npy_with_labels(tmp_path):
+    path = str(tmp_path / "vitals.npy")
+
+    write_dataset(path, 2500, anomaly_rate=0.05, seed=4, chunk_rows=1000)
+
+    X = np.load(path)
+    y = np.load(str(tmp_path / "vitals.labels.npy"))
+    chunks = list(iter_chunks(2500, anomaly_rate=0.05, seed=4, chunk_rows=1000, dtype=np.float32))
+    np.testing.assert_array_equal(X, np.concatenate([c for c, _ in chunks]))
+    np.testing.assert_array_equal(y, np.concatenate([labels for _, labels in chunks]))
+    assert X.dtype == np.float32
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "vitals.parquet")
+
+    write_dataset(path, 1500, anomaly_rate=0.1, seed=5, chunk_rows=1000)
+
+    table = pq.read_table(path)
+    assert table.column_names == FEATURES + ["label"]
+    assert table.num_rows == 1500
+    assert not os.path.exists(str(tmp_path / "vitals.labels.npy"))
+
+def test_legacy_stream_matches_per_reading_draws():
+    # How the IsolationForest notebook first built its data
+    np.random.seed(42)
+    expected = np.array([
+        [np.clip(np.random.normal(mean, sd), low, high) for mean, sd, low, high in PROFILES["baseline"]]
+        for _ in range(500)
+    ])
+
+    np.testing.assert_array_equal(generate(500, "baseline", rng=np.random.RandomState(42)), expected)
@@ -0,0 +1,120 @@
+import asyncio
+import json
+from typing import Annotated, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from StructuredOutput import StructuredOutputError, ainvoke_structured
+from WorkflowStream import NODE_LABELS, stream_turn
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+    triage_runs: int
+
+def _answer(reply, intent="appointment"):
+    return json.dumps({"reply": reply, "intent": intent, "entities": {}, "ready_for_routing": False})
+
+def _model(*answers):
+    """
+    Chat model that streams each answer word by word, one answer per call.
+    """
+    return GenericFakeChatModel(messages=iter([AIMessage(content=a) for a in answers]))
+
+def _graph(conversation_answers=None, triage_answers=(), whole_reply=None):
+    """
+    conversation -> triage (-> tools -> triage while triage answers remain) -> END
+    """
+    conversation_llm = _model(*(conversation_answers or []))
+    triage_llm = _model(*triage_answers)
+
+    async def conversation(state):
+        if whole_reply is not None:
+            return {"messages": [{"role": "assistant", "content": whole_reply}]}
+        try:
+            answer = await ainvoke_structured("conversation", conversation_llm, state["messages"])
+        except StructuredOutputError:
+            answer = {"reply": "Sorry, could you rephrase?"}
+        return {"messages": [{"role": "assistant", "content": answer["reply"]}]}
+
+    async def triage(state):
+        return {"messages": await triage_llm.ainvoke(state["messages"]),
+                "triage_runs": state.get("triage_runs", 0) + 1}
+
+    async def tools(state):
+        return {"messages": []}
+
+    def after_triage(state):
+        return "tools" if state["triage_runs"] < len(triage_answers) else END
+
+    builder = StateGraph(State)
+    builder.add_node("conversation", conversation)
+    builder.add_node("triage", triage)
+    builder.add_node("tools", tools)
+    builder.add_edge(START, "conversation")
+    builder.add_conditional_edges("conversation", lambda state: "triage" if triage_answers else END)
+    builder.add_conditional_edges("triage", after_triage)
+    builder.add_edge("tools", "triage")
+    return builder.compile()
+
+def _events(graph):
+
+    async def collect():
+        return [event async for event in stream_turn(graph, "I have a fever", {"configurable": {"thread_id": "t"}})]
+
+    return asyncio.run(collect())
+
+def _bubbles(events):
+    """
+    What the chat UI shows: one bubble per node run, filled by token/replace, plus whole messages.
+    """
+    shown, current = [], {}
+    for event in events:
+        if event["type"] == "token":
+            current[event["node"]] = current.get(event["node"], "") + event["text"]
+        elif event["type"] == "replace":
+            current[event["node"]] = event["text"]
+        elif event["type"] == "message":
+            shown.append((event["node"], event["text"]))
+        elif event["node"] in current:
+            shown.append((event["node"], current.pop(event["node"])))
+    return shown
+
+def test_tokens_then_progress():
+    events = _events(_graph([_answer("Which date suits you?")], ["See a general physician."]))
+
+    assert _bubbles(events) == [("conversation", "Which date suits you?"), ("triage", "See a general physician.")]
+    assert [e["type"] for e in events if e["node"] == "conversation"][-1] == "progress"
+    assert sum(e["type"] == "token" and e["node"] == "triage" for e in events) > 1
+    assert [e["label"] for e in events if e["type"] == "progress"] == [
+        NODE_LABELS["conversation"], NODE_LABELS["triage"]]
+    assert not [e for e in events if e["type"] in ("message", "replace")]
+
+def test_unstreamed_reply_arrives_whole():
+    events = _events(_graph(whole_reply="Your appointment is on Monday."))
+
+    assert events == [
+        {"type": "message", "node": "conversation", "text": "Your appointment is on Monday."},
+        {"type": "progress", "node": "conversation", "label": NODE_LABELS["conversation"]},
+    ]
+
+def test_triage_streams_again_after_tools():
+    events = _events(_graph([_answer("Noted.")], ["Checking cardiology.", "Dr. Rao is free."]))
+
+    assert _bubbles(events) == [("conversation", "Noted."), ("triage", "Checking cardiology."),
+                                ("triage", "Dr. Rao is free.")]
+    assert [e["node"] for e in events if e["type"] == "progress"] == ["conversation", "triage", "tools", "triage"]
+
+def test_reask_replaces_the_rejected_reply():
+    events = _events(_graph([_answer("Booked for Monday!", intent="party"), _answer("Which date suits you?")]))
+
+    assert {"type": "replace", "node": "conversation", "text": ""} in events
+    assert _bubbles(events) == [("conversation", "Which date suits you?")]
+
+def test_fallback_reply_replaces_the_stream():
+    events = _events(_graph([_answer("Booked!", intent="party"), _answer("Booked!!", intent="party")]))
+
+    assert events[-2] == {"type": "replace", "node": "conversation", "text": "Sorry, could you rephrase?"}
+    assert _bubbles(events) == [("conversation", "Sorry, could you rephrase?")]